@@ -16,7 +16,13 @@ Focuses on:
 import random
 import time
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from typing import Callable, List, Tuple, Dict, Optional
+
+from lazy_imports import lazy_import
+from precision import policy
+from resonance_formulas import ai_human_resonance
+
+np = lazy_import("numpy")
 
 
 @dataclass
@@ -29,14 +35,19 @@ class HumanAgent:
     transparency_requirement: float  # 0-1, need to understand AI reasoning
     alignment: float  # 0-1, alignment with AI goals
     
-    def make_decision(self, ai_recommendation: str, ai_reasoning: str) -> Tuple[bool, float]:
-        """Human evaluates AI recommendation based on autonomy, trust, and transparency."""
-        understanding = 1.0 if len(ai_reasoning) > 50 else 0.3
+    def acceptance_probability(self, understanding: float, trust_level: Optional[float] = None) -> float:
+        """Probability of accepting a recommendation at a given level of understanding."""
+        trust = self.trust_level if trust_level is None else trust_level
         transparency_satisfaction = understanding * self.transparency_requirement
         autonomy_satisfaction = (1.0 - self.autonomy_need) + (self.autonomy_need * 0.5)  # Retains some autonomy
-        trust_impact = self.trust_level * 0.7
+        trust_impact = trust * 0.7
         
-        acceptance_probability = (transparency_satisfaction + autonomy_satisfaction + trust_impact + self.alignment) / 4.0
+        return (transparency_satisfaction + autonomy_satisfaction + trust_impact + self.alignment) / 4.0
+    
+    def make_decision(self, ai_recommendation: str, ai_reasoning: str) -> Tuple[bool, float]:
+        """Human evaluates AI recommendation based on autonomy, trust, and transparency."""
+        understanding = 1.0 if len(ai_reasoning) > 50 else 0.3
+        acceptance_probability = self.acceptance_probability(understanding)
         accepted = random.random() < acceptance_probability
         
         if accepted:
@@ -69,6 +80,16 @@ class AISystem:
         recommendation = f"Recommendation (confidence: {confidence*100:.0f}%)"
         return recommendation, reasoning[:reasoning_length]
     
+    def explanation_probability(self) -> float:
+        """Probability that a generated explanation is long enough (> 50 chars) to be understood.
+        
+        The reasoning text itself is always longer than 50 characters, so only the
+        truncation length int(100 * transparency) + randint(30, 70) matters.
+        """
+        threshold = 50 - int(100 * self.transparency_level)
+        favourable = 70 - max(threshold + 1, 30) + 1
+        return min(41, max(0, favourable)) / 41.0
+    
     def adapt_to_feedback(self, human_accepted: bool, human_trust: float):
         """AI adapts its approach based on human feedback."""
         if not human_accepted:
@@ -90,13 +111,9 @@ class ResonanceCooperationModel:
         Resonanzformel adapted for AI-Human cooperation:
         Cooperation Resonance = (Human_Autonomy × AI_Transparency × Mutual_Alignment) / Opacity
         """
-        autonomy_factor = self.human.autonomy_need  # 0-1
-        transparency_factor = self.ai.transparency_level  # 0-1
         alignment_factor = (self.human.alignment + self.ai.alignment_focus) / 2.0  # 0-1
-        opacity_factor = max(0.1, 1.0 - (self.human.trust_level + self.ai.transparency_level) / 2.0)
-        
-        resonance = (autonomy_factor * transparency_factor * alignment_factor) / opacity_factor
-        return min(1.0, resonance)  # Normalize to 0-1
+        return ai_human_resonance(self.human.autonomy_need, self.ai.transparency_level,
+                                  alignment_factor, self.human.trust_level)
     
     def interact(self, iteration: int) -> Dict:
         """Single interaction cycle between human and AI."""
@@ -127,13 +144,153 @@ class ResonanceCooperationModel:
         self.cooperation_history.append(result)
         return result
     
-    def run_scenario(self, iterations: int = 20) -> List[Dict]:
-        """Run multiple interaction cycles."""
+    def run_scenario(self, iterations: int = 20, mode: str = "sample") -> List[Dict]:
+        """Run multiple interaction cycles.
+        
+        mode="sample" draws one stochastic trajectory (the default); mode="expected"
+        returns the expected trajectory from TrustDistributionModel in a single
+        deterministic pass, leaving human and AI untouched.
+        """
+        if mode == "expected":
+            return TrustDistributionModel(self.human, self.ai).run(iterations)
+        if mode != "sample":
+            raise ValueError(f"Unknown mode: {mode}")
         for i in range(iterations):
             self.interact(i + 1)
         return self.cooperation_history
 
 
+class TrustDistributionModel:
+    """
+    Analytic expectation mode for the AI-Human interaction loop.
+    
+    Instead of drawing Bernoulli decisions, the probability mass over the joint
+    state (trust level, number of rejections) is propagated directly. Trust moves
+    on a 0.01 grid (+0.05 on acceptance, -0.03 on rejection, clipped to [0, 1]);
+    the number of rejections determines the AI's transparency and alignment focus
+    through adapt_to_feedback. One pass yields the exact expected acceptance rate,
+    trust curve and resonance curve of ResonanceCooperationModel.
+    """
+    
+    GRID = 100  # Trust levels per unit
+    
+    def __init__(self, human: HumanAgent, ai: AISystem):
+        self.human = human
+        self.ai = ai
+        self.trust_distribution: Dict[float, float] = {}
+    
+    def _ai_states(self, iterations: int) -> List[Tuple[float, float]]:
+        """(transparency, alignment_focus) after r rejections, until both saturate."""
+        probe = AISystem(self.ai.name, self.ai.capability, self.ai.transparency_level,
+                         self.ai.learning_rate, self.ai.alignment_focus)
+        states = [(probe.transparency_level, probe.alignment_focus)]
+        for _ in range(iterations):
+            probe.adapt_to_feedback(False, 0.0)
+            state = (probe.transparency_level, probe.alignment_focus)
+            if state == states[-1]:
+                break
+            states.append(state)
+        return states
+    
+    def run(self, iterations: int = 20) -> List[Dict]:
+        """Propagate the state distribution and return the expected trajectory."""
+        ai_states = self._ai_states(iterations)
+        last = len(ai_states) - 1
+        up, down = round(0.05 * self.GRID), round(0.03 * self.GRID)
+        
+        # Precompute per AI state: acceptance probability is linear in understanding
+        expected_understanding = []
+        for transparency, _ in ai_states:
+            probe = AISystem(self.ai.name, self.ai.capability, transparency, 0.0, 0.0)
+            p = probe.explanation_probability()
+            expected_understanding.append(p + (1.0 - p) * 0.3)
+        
+        distribution = {(round(self.human.trust_level * self.GRID), 0): 1.0}
+        history = []
+        
+        for iteration in range(1, iterations + 1):
+            acceptance = 0.0
+            new_distribution: Dict[Tuple[int, int], float] = {}
+            for (level, rejections), mass in distribution.items():
+                p_accept = self.human.acceptance_probability(
+                    expected_understanding[rejections], level / self.GRID)
+                acceptance += mass * p_accept
+                
+                accepted_state = (min(self.GRID, level + up), rejections)
+                rejected_state = (max(0, level - down), min(last, rejections + 1))
+                new_distribution[accepted_state] = new_distribution.get(accepted_state, 0.0) + mass * p_accept
+                new_distribution[rejected_state] = new_distribution.get(rejected_state, 0.0) + mass * (1.0 - p_accept)
+            distribution = new_distribution
+            
+            trust_mean = sum(mass * level for (level, _), mass in distribution.items()) / self.GRID
+            trust_sq = sum(mass * level * level for (level, _), mass in distribution.items()) / self.GRID ** 2
+            transparency_mean = sum(mass * ai_states[r][0] for (_, r), mass in distribution.items())
+            resonance_mean = sum(
+                mass * ai_human_resonance(self.human.autonomy_need, ai_states[r][0],
+                                          (self.human.alignment + ai_states[r][1]) / 2.0, level / self.GRID)
+                for (level, r), mass in distribution.items()
+            )
+            
+            history.append({
+                'iteration': iteration,
+                'acceptance_probability': acceptance,
+                'human_trust': trust_mean,
+                'human_trust_std': max(0.0, trust_sq - trust_mean ** 2) ** 0.5,
+                'ai_transparency': transparency_mean,
+                'resonance_score': resonance_mean,
+            })
+        
+        self.trust_distribution = {}
+        for (level, _), mass in distribution.items():
+            trust = level / self.GRID
+            self.trust_distribution[trust] = self.trust_distribution.get(trust, 0.0) + mass
+        return history
+    
+    def expected_acceptance_rate(self, iterations: int = 20) -> float:
+        """Expected fraction of accepted recommendations over a scenario."""
+        history = self.run(iterations)
+        return sum(h['acceptance_probability'] for h in history) / len(history)
+
+
+def validate_expectation_mode(scenario_func, iterations: int = 15, replicates: int = 2000,
+                              seed: int = 42) -> Dict:
+    """Compare the analytic expectation mode against Monte Carlo replicates."""
+    human, ai = scenario_func()
+    expected = ResonanceCooperationModel(human, ai).run_scenario(iterations, mode="expected")
+    
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        trust_sums = [0.0] * iterations
+        accept_sums = [0.0] * iterations
+        for _ in range(replicates):
+            model = ResonanceCooperationModel(*scenario_func())
+            for i, h in enumerate(model.run_scenario(iterations)):
+                trust_sums[i] += h['human_trust']
+                accept_sums[i] += h['human_accepted']
+    finally:
+        random.setstate(state)
+    
+    mc_trust = [t / replicates for t in trust_sums]
+    mc_acceptance = [a / replicates for a in accept_sums]
+    
+    # Tolerances: 4 standard errors of a Bernoulli mean / of the trust mean
+    acceptance_error = max(abs(m - e['acceptance_probability']) for m, e in zip(mc_acceptance, expected))
+    trust_error = max(abs(m - e['human_trust']) for m, e in zip(mc_trust, expected))
+    acceptance_tolerance = 4 * 0.5 / replicates ** 0.5
+    trust_tolerance = 4 * max(e['human_trust_std'] for e in expected) / replicates ** 0.5 + 1e-9
+    
+    return {
+        'expected_acceptance_rate': sum(e['acceptance_probability'] for e in expected) / iterations,
+        'mc_acceptance_rate': sum(mc_acceptance) / iterations,
+        'expected_final_trust': expected[-1]['human_trust'],
+        'mc_final_trust': mc_trust[-1],
+        'max_acceptance_error': acceptance_error,
+        'max_trust_error': trust_error,
+        'passed': acceptance_error <= acceptance_tolerance and trust_error <= trust_tolerance,
+    }
+
+
 def scenario_1_transparent_aligned_ai():
     """Scenario 1: Transparent AI with strong human value alignment."""
     human = HumanAgent(
@@ -200,6 +357,90 @@ def scenario_3_learning_ai():
     return human, ai
 
 
+SCENARIOS = {
+    "transparent_aligned": scenario_1_transparent_aligned_ai,
+    "opaque_misaligned": scenario_2_opaque_misaligned_ai,
+    "learning": scenario_3_learning_ai,
+}
+
+
+class HumanPopulationModel:
+    """
+    A population of humans facing the same AI, evaluated in expectation mode.
+    
+    Each human's traits are the scenario's traits plus uniform noise of +/- spread,
+    clipped to [0, 1]. Every individual is propagated exactly with
+    TrustDistributionModel; the population summary reports means and quantiles.
+    The per-human curves are stored in precision.policy().state (float32 under
+    the compact policy); the summary sums them as Python floats (float64).
+    """
+    
+    TRAITS = ('expertise', 'autonomy_need', 'trust_level', 'transparency_requirement', 'alignment')
+    
+    def __init__(self, scenario: str = "transparent_aligned", size: int = 1000, spread: float = 0.15,
+                 seed: Optional[int] = None):
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {scenario} (available: {', '.join(SCENARIOS)})")
+        if size < 1:
+            raise ValueError("Population size must be at least 1")
+        self.scenario = scenario
+        self.size = size
+        self.spread = spread
+        self.seed = seed
+    
+    def sample_humans(self) -> List[HumanAgent]:
+        """Draw the population (deterministic for a given seed)."""
+        base, _ = SCENARIOS[self.scenario]()
+        rng = random.Random(self.seed)
+        return [
+            HumanAgent(f"{base.name} #{i}", **{
+                trait: min(1.0, max(0.0, getattr(base, trait) + rng.uniform(-self.spread, self.spread)))
+                for trait in self.TRAITS
+            })
+            for i in range(self.size)
+        ]
+    
+    def run(self, iterations: int = 20, progress: Optional[Callable[[int, int], None]] = None,
+            progress_every: int = 100, workers: int = 1) -> Dict:
+        """Expected acceptance rate and final trust per human, summarised over the population.
+        
+        workers > 1 spreads the humans over processes (parallel_runners.population_curves,
+        shared-memory buffers); the summary is identical, progress is not reported.
+        """
+        if workers > 1:
+            from parallel_runners import population_curves
+            acceptance, trust = population_curves(self, iterations, workers)
+        else:
+            _, ai = SCENARIOS[self.scenario]()
+            acceptance = np.empty((iterations, self.size), dtype=policy().state)
+            trust = np.empty(self.size, dtype=policy().state)
+            for i, human in enumerate(self.sample_humans()):
+                history = TrustDistributionModel(human, ai).run(iterations)
+                acceptance[:, i] = [h['acceptance_probability'] for h in history]
+                trust[i] = history[-1]['human_trust']
+                if progress is not None and (i + 1) % progress_every == 0:
+                    progress(i + 1, self.size)
+        # Summaries straight from the arrays, accumulated in float64 (policy().accumulator)
+        accumulator = policy().accumulator
+        acceptance_rates = acceptance.sum(axis=0, dtype=accumulator) / iterations
+        mean_curve = acceptance.sum(axis=1, dtype=accumulator) / self.size
+        
+        def quantiles(values):
+            ranks = [min(len(values) - 1, int(q / 100 * len(values))) for q in (10, 50, 90)]
+            ordered = np.partition(values, ranks)
+            return {f"p{q}": float(ordered[rank]) for q, rank in zip((10, 50, 90), ranks)}
+        
+        return {
+            'scenario': self.scenario,
+            'population': self.size,
+            'mean_acceptance_rate': float(acceptance_rates.mean()),
+            'acceptance_rate_quantiles': quantiles(acceptance_rates),
+            'mean_final_trust': float(trust.mean(dtype=accumulator)),
+            'final_trust_quantiles': quantiles(trust),
+            'mean_acceptance_curve': mean_curve.tolist(),
+        }
+
+
 def run_test():
     """Run complete AI-Human interaction test suite."""
     print("\n" + "="*80)
@@ -246,6 +487,12 @@ def run_test():
         print(f"  Final AI Transparency: {final_transparency:.2f}")
         print(f"  Status: {'✓ GOOD cooperation' if avg_resonance > 0.6 else '⚠ LOW cooperation'}")
         
+        expected = ResonanceCooperationModel(*scenario_func()).run_scenario(iterations=15, mode="expected")
+        expected_acceptance = sum(h['acceptance_probability'] for h in expected) / len(expected)
+        print(f"  Expected Acceptance Rate (analytic): {expected_acceptance*100:.1f}%")
+        print(f"  Expected Final Trust (analytic): {expected[-1]['human_trust']:.2f} "
+              f"± {expected[-1]['human_trust_std']:.2f}")
+        
         all_results[scenario_name] = {
             'acceptance_rate': acceptance_rate,
             'avg_resonance': avg_resonance,
@@ -281,6 +528,16 @@ def run_test():
     if r3['avg_resonance'] > r1['avg_resonance']:
         print(f"✓ Adaptive Learning AI outperforms even Transparent+Aligned through iteration")
     
+    print(f"\n" + "-"*80)
+    print("EXPECTATION MODE VALIDATION (analytic vs. Monte Carlo, 2000 replicates):")
+    print("-"*80)
+    for scenario_name, scenario_func in scenarios:
+        validation = validate_expectation_mode(scenario_func)
+        status = '✓' if validation['passed'] else '✗'
+        print(f"{status} {scenario_name}: acceptance {validation['expected_acceptance_rate']:.3f} "
+              f"vs {validation['mc_acceptance_rate']:.3f}, final trust "
+              f"{validation['expected_final_trust']:.3f} vs {validation['mc_final_trust']:.3f}")
+    
     print(f"\nRESULT: Transparency + Alignment + Learning = Sustainable AI-Human Cooperation")
     print(f"\nThe framework demonstrates that successful AI-Human cooperation requires:")
     print(f"  1. Human Autonomy - Preserving human decision-making authority")
@@ -13,7 +13,15 @@ Szenarios:
 
 import random
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import instrumentation
+from lazy_imports import lazy_import
+from precision import policy
+from resonance_formulas import REGISTRY, alien_resonance, pattern_complexity
+from sequential_testing import SPRT
+
+np = lazy_import("numpy")
 
 
 @dataclass
@@ -45,7 +53,12 @@ class ResonanceWithAlien4D:
     
     def analyze_alien_signal(self, alien: AlienIntelligence) -> Dict:
         """Analysiere das Alien-Signal MIT 4D Systemischer Intelligenz"""
+        inst = instrumentation.ACTIVE
+        if inst:
+            t = inst.now()
         signal = alien.encode_message()
+        if inst:
+            t = inst.lap("alien.encode", t)
         
         # 4D Systemische Intelligenz: Context + Pattern Recognition
         # Sie erlaubt uns, das Unbekannte zu VERSTEHEN
@@ -56,7 +69,7 @@ class ResonanceWithAlien4D:
         }
         
         # Mit 4D können wir Muster in Chaos finden
-        pattern_complexity = (signal["density"] * signal["x_dimension"]) / (signal["entropy"] + 0.1)
+        complexity = pattern_complexity(signal["density"], signal["x_dimension"], signal["entropy"])
         
         # Versuche, mit dem unbekannten System zu resonieren
         our_transparency = 1.0  # Wir sind völlig transparent
@@ -65,13 +78,11 @@ class ResonanceWithAlien4D:
         our_hierarchy = 0.0  # Keine Hierarchie
         
         # Berechne Resonanz trotz Unbekanntem (das ist 4D magic)
-        adaptation_factor = (
-            (our_transparency * our_feedback * our_openness) / (our_hierarchy + 0.1)
-        ) * pattern_complexity
+        adaptation_factor = alien_resonance(our_transparency, our_feedback, our_openness, our_hierarchy) * complexity
         
         analysis["framework_response"] = {
             "adaptation": adaptation_factor,
-            "can_understand": pattern_complexity > 0.3,
+            "can_understand": complexity > 0.3,
             "resilience": "HIGH - 4D gibt uns Flexibilität",
             "cooperation_potential": max(0, signal["willingness"]) * adaptation_factor
         }
@@ -80,11 +91,18 @@ class ResonanceWithAlien4D:
         if analysis["framework_response"]["can_understand"]:
             self.resonance_matches.append(signal["willingness"])
         
+        if inst:
+            inst.lap("alien.analyse", t)
+            inst.count("alien.signals")
+        
         return analysis
     
-    def test_cooperation(self, alien: AlienIntelligence) -> bool:
-        """Testet, ob Alien-System nach heutigen Parametern kooperieren will"""
-        analysis = self.analyze_alien_signal(alien)
+    def test_cooperation(self, alien: AlienIntelligence, analysis: Optional[Dict] = None) -> bool:
+        """Testet, ob Alien-System nach heutigen Parametern kooperieren will
+        
+        analysis: Ergebnis von analyze_alien_signal für diesen Kontakt (sonst neu analysiert)
+        """
+        analysis = analysis or self.analyze_alien_signal(alien)
         
         # Wenn der Alien-Willingness positiv ist UND unser Framework kann adaptieren
         cooperation_successful = (
@@ -104,7 +122,12 @@ class ResonanceWithoutAlien4D:
     
     def analyze_alien_signal(self, alien: AlienIntelligence) -> Dict:
         """Analysiere das Alien-Signal OHNE 4D - brutale Limitierung"""
+        inst = instrumentation.ACTIVE
+        if inst:
+            t = inst.now()
         signal = alien.encode_message()
+        if inst:
+            t = inst.lap("alien.encode", t)
         
         # OHNE 4D Systemische Intelligenz:
         # Wir haben nur 1D (Instinkte), 2D (Emotion), 3D (Ratio)
@@ -126,9 +149,7 @@ class ResonanceWithoutAlien4D:
         our_hierarchy = 0.6  # Mehr Hierarchie, da wir unsicher sind
         
         # Berechne "Resonanz" ohne 4D - meistens nur Chaos
-        resonance = (
-            (our_transparency * our_feedback * our_openness) / (our_hierarchy + 0.1)
-        )
+        resonance = alien_resonance(our_transparency, our_feedback, our_openness, our_hierarchy)
         
         # SYSTEMISCHER ZERFALL ohne 4D
         degradation = 1.0 - resonance
@@ -144,11 +165,18 @@ class ResonanceWithoutAlien4D:
         self.contact_attempts += 1
         self.system_degradation += degradation
         
+        if inst:
+            inst.lap("alien.analyse", t)
+            inst.count("alien.signals")
+        
         return analysis
     
-    def test_cooperation(self, alien: AlienIntelligence) -> bool:
-        """Testet, ob Cooperation möglich ist - meistens NEIN ohne 4D"""
-        analysis = self.analyze_alien_signal(alien)
+    def test_cooperation(self, alien: AlienIntelligence, analysis: Optional[Dict] = None) -> bool:
+        """Testet, ob Cooperation möglich ist - meistens NEIN ohne 4D
+        
+        analysis: Ergebnis von analyze_alien_signal für diesen Kontakt (sonst neu analysiert)
+        """
+        analysis = analysis or self.analyze_alien_signal(alien)
         
         # Ohne 4D ist Cooperation fast unmöglich
         cooperation_possible = (
@@ -171,57 +199,101 @@ def create_random_alien() -> AlienIntelligence:
     )
 
 
-def run_comprehensive_test():
-    """Führe den vollständigen Außenrirdischen-Intelligenz-Test durch"""
+def analyze_alien_population(n: int, seed: Optional[int] = None) -> Dict:
+    """Vektorisierte Analyse von n zufälligen Aliens (Verteilung wie create_random_alien)
+    
+    Wertet die Kooperationskriterien beider Szenarien (MIT / OHNE 4D) für alle
+    Aliens in einem Durchgang aus und liefert die aggregierten Raten.
+    Die Merkmale liegen in precision.policy().state vor (float32 bei der
+    compact-Policy), Mittelwerte werden in float64 gebildet.
+    """
+    dtype = policy().state
+    rng = np.random.default_rng(seed)
+    x_dimension = rng.uniform(0, 2, n).astype(dtype, copy=False)
+    willingness = rng.uniform(-0.8, 1.0, n).astype(dtype, copy=False)
+    density = rng.uniform(0.1, 1.0, n).astype(dtype, copy=False)
+    entropy = rng.uniform(0, 1, n).astype(dtype, copy=False)
+    
+    # MIT 4D: Anpassung proportional zur erkannten Musterkomplexität
+    complexity = REGISTRY["pattern_complexity"].kernel(density, x_dimension, entropy)
+    adaptation = alien_resonance(1.0, 1.0, 1.0, 0.0) * complexity
+    with_4d = (willingness > 0.3) & (complexity > 0.3)
+    
+    # OHNE 4D: konstante, schwache Resonanz
+    degradation = 1.0 - alien_resonance(0.7, 0.5, 0.3, 0.6)
+    without_4d = (willingness > 0.7) & (degradation < 0.5)
+    
+    return {
+        "aliens": n,
+        "with_4d_cooperation_rate": float(with_4d.mean()) if n else 0.0,
+        "without_4d_cooperation_rate": float(without_4d.mean()) if n else 0.0,
+        "mean_adaptation": float(adaptation.mean(dtype=np.float64)) if n else 0.0,
+        "mean_degradation": degradation,
+        "can_understand_rate": float((complexity > 0.3).mean()) if n else 0.0,
+    }
+
+
+def run_comprehensive_test(shown: int = 5, max_aliens: int = 1000, alpha: float = 0.05, beta: float = 0.05):
+    """Führe den vollständigen Außenrirdischen-Intelligenz-Test durch
+    
+    Statt fester 5 Aliens werden so lange Aliens gezogen, bis ein gepaarter
+    SPRT (Vorzeichentest auf den Aliens, bei denen sich MIT und OHNE 4D
+    unterscheiden) entschieden hat, ob 4D die Kooperation verbessert
+    (H1: >= 90% der diskordanten Paare zugunsten von 4D, H0: <= 50%).
+    Die ersten `shown` Aliens werden ausführlich ausgegeben. Besteht 4D den
+    SPRT nicht, endet der Test mit SystemExit(1) (für run_all_tests.py und die CLI).
+    """
     
     print("\n" + "="*80)
     print("ALIEN INTELLIGENCE CONTACT TEST - Resonanzformel vs. Unknown Systems")
     print("="*80 + "\n")
     
-    # Erstelle mehrere Alien-Intelligenzformen
-    aliens = [create_random_alien() for _ in range(5)]
-    
     with_4d = ResonanceWithAlien4D()
     without_4d = ResonanceWithoutAlien4D()
+    sprt = SPRT(p0=0.5, p1=0.9, alpha=alpha, beta=beta, max_trials=max_aliens)
+    
+    # Erstelle Alien-Intelligenzformen, bis das Urteil statistisch feststeht
+    contacts = []
+    while len(contacts) < shown or (not sprt.done and len(contacts) < max_aliens):
+        alien = create_random_alien()
+        with_result = with_4d.analyze_alien_signal(alien)
+        with_cooperation = with_4d.test_cooperation(alien, with_result)
+        without_result = without_4d.analyze_alien_signal(alien)
+        without_cooperation = without_4d.test_cooperation(alien, without_result)
+        if with_cooperation != without_cooperation:  # Konkordante Paare tragen keine Information
+            sprt.update(with_cooperation)
+        contacts.append((alien, with_result, with_cooperation, without_result, without_cooperation))
+    n = len(contacts)
     
     results = {
-        "with_4d_cooperation": 0,
-        "without_4d_cooperation": 0,
-        "with_4d_adaptations": [],
-        "without_4d_degradations": []
+        "aliens": n,
+        "with_4d_cooperation": sum(contact[2] for contact in contacts),
+        "without_4d_cooperation": sum(contact[4] for contact in contacts),
+        "with_4d_adaptations": [contact[1]['framework_response'].get('adaptation', 0) for contact in contacts],
+        "without_4d_degradations": [contact[3]['framework_response'].get('system_degradation', 0)
+                                    for contact in contacts],
+        "verdict": sprt.verdict(),
     }
     
     print("\n### SCENARIO 1: MIT 4D Systemischer Intelligenz ###\n")
-    for i, alien in enumerate(aliens):
-        result = with_4d.analyze_alien_signal(alien)
-        cooperation = with_4d.test_cooperation(alien)
-        
+    for i, (alien, result, cooperation, _, _) in enumerate(contacts[:shown]):
         print(f"Alien {i+1}:")
         print(f"  Communication Mode: {alien.communication_mode}")
         print(f"  Cooperation Willingness: {alien.cooperation_willingness:.2f}")
         print(f"  Our Adaptation Factor: {result['framework_response'].get('adaptation', 0):.3f}")
         print(f"  Cooperation Possible: {cooperation}")
         print()
-        
-        if cooperation:
-            results["with_4d_cooperation"] += 1
-        results["with_4d_adaptations"].append(result['framework_response'].get('adaptation', 0))
     
     print("\n### SCENARIO 2: OHNE 4D Systemischer Intelligenz ###\n")
-    for i, alien in enumerate(aliens):
-        result = without_4d.analyze_alien_signal(alien)
-        cooperation = without_4d.test_cooperation(alien)
-        
+    for i, (alien, _, _, result, cooperation) in enumerate(contacts[:shown]):
         print(f"Alien {i+1}:")
         print(f"  Communication Mode: {alien.communication_mode}")
         print(f"  Our System Degradation: {result['framework_response'].get('system_degradation', 0):.3f}")
         print(f"  Resilience: {result['framework_response'].get('resilience')}")
         print(f"  Cooperation Possible: {cooperation}")
         print()
-        
-        if cooperation:
-            results["without_4d_cooperation"] += 1
-        results["without_4d_degradations"].append(result['framework_response'].get('system_degradation', 0))
+    if n > shown:
+        print(f"... und {n - shown} weitere Aliens, bis das Urteil feststand\n")
     
     # ANALYSE
     print("\n" + "="*80)
@@ -229,21 +301,27 @@ def run_comprehensive_test():
     print("="*80 + "\n")
     
     print(f"MIT 4D:")
-    print(f"  Erfolgreiche Kooperationen: {results['with_4d_cooperation']}/5")
-    print(f"  Durchschnittliche Adaptation: {sum(results['with_4d_adaptations'])/len(results['with_4d_adaptations']):.3f}")
+    print(f"  Erfolgreiche Kooperationen: {results['with_4d_cooperation']}/{n}")
+    print(f"  Durchschnittliche Adaptation: {sum(results['with_4d_adaptations'])/n:.3f}")
     print(f"  Status: \u2713 Framework kann sich an Unbekanntes anpassen\n")
     
     print(f"OHNE 4D:")
-    print(f"  Erfolgreiche Kooperationen: {results['without_4d_cooperation']}/5")
-    print(f"  Durchschnittliches Degradation: {sum(results['without_4d_degradations'])/len(results['without_4d_degradations']):.3f}")
+    print(f"  Erfolgreiche Kooperationen: {results['without_4d_cooperation']}/{n}")
+    print(f"  Durchschnittliches Degradation: {sum(results['without_4d_degradations'])/n:.3f}")
     print(f"  Status: ⚠  System kollabiert ohne Kontext-Intelligenz\n")
     
-    print("CONCLUSIO:")
+    print(f"SEQUENTIELLER TEST (4D verbessert Kooperation, alpha={alpha}, beta={beta}):")
+    print(f"  {results['verdict']} - diskordante Paare von {n} Aliens")
+    
+    print("\nCONCLUSIO:")
     print("  Die 4D Systemische Intelligenz ist ESSENTIELL für Kooperation mit")
     print("  unbekannten Systemen. Sie ermöglicht Adaptation und Kontext-Verständnis.")
-    print(f"\n  Cooperation Rate MIT 4D: {results['with_4d_cooperation']*20}%")
-    print(f"  Cooperation Rate OHNE 4D: {results['without_4d_cooperation']*20}%")
+    print(f"\n  Cooperation Rate MIT 4D: {results['with_4d_cooperation']/n:.0%}")
+    print(f"  Cooperation Rate OHNE 4D: {results['without_4d_cooperation']/n:.0%}")
     print("\n" + "="*80 + "\n")
+    if not results["verdict"].passed:
+        raise SystemExit(1)
+    return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark Suite - Simulator Hot Paths
+Timing with warm-up, repeats and percentile reporting; JSON baselines; regression compare
+
+Usage:
+    python benchmarks.py run [--filter TEXT] [--repeats N] [--save baseline.json]
+    python benchmarks.py compare baseline.json [current.json] [--threshold 0.10]
+
+compare without a second file runs the suite fresh. A benchmark regresses when
+its median time exceeds the baseline median by more than the threshold; the
+command then exits with status 1. Everything runs offline on a CPU-only box.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class Benchmark:
+    """One timed case: setup() builds fresh state (untimed), func(state) is timed"""
+    name: str
+    func: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+    repeats: int = 20
+    warmup: int = 2
+    number: int = 1  # Calls per timed sample
+
+
+def time_benchmark(bench: Benchmark, repeats: Optional[int] = None) -> Dict[str, float]:
+    """Run warm-up and timed samples; return per-call statistics in seconds"""
+    for _ in range(bench.warmup):
+        bench.func(bench.setup())
+
+    samples = []
+    for _ in range(repeats or bench.repeats):
+        states = [bench.setup() for _ in range(bench.number)]
+        start = time.perf_counter()
+        for state in states:
+            bench.func(state)
+        samples.append((time.perf_counter() - start) / bench.number)
+
+    samples = np.array(samples)
+    return {
+        "repeats": len(samples),
+        "min": float(samples.min()),
+        "mean": float(samples.mean()),
+        "std": float(samples.std()),
+        "p50": float(np.percentile(samples, 50)),
+        "p90": float(np.percentile(samples, 90)),
+        "p99": float(np.percentile(samples, 99)),
+    }
+
+
+def default_benchmarks() -> List[Benchmark]:
+    """The hot paths of every simulator"""
+    from feedback_loop import SimulationRunner
+    from evolutionary_game_theory import OpenSystemEnvironment, PlayerStrategy
+    from alien_intelligence_test import ResonanceWithAlien4D, ResonanceWithoutAlien4D, create_random_alien
+    from ai_human_interaction_test import ResonanceCooperationModel, scenario_1_transparent_aligned_ai
+    from consistency_check import ConsistencyValidator
+    from resonance_formulas import REGISTRY
+
+    def game_env(num_players):
+        def setup():
+            env = OpenSystemEnvironment(num_players=num_players, num_rounds=1)
+            rng = np.random.default_rng(0)
+            # Mixed population so both payoff branches and switching are exercised
+            env.players = [PlayerStrategy.DEFECT if r < 0.5 else PlayerStrategy.COOPERATE
+                           for r in rng.random(num_players)]
+            return env
+        return setup
+
+    benchmarks = [
+        Benchmark("feedback_loop.SimulationRunner.run[100]",
+                  lambda runner: runner.run(), lambda: SimulationRunner(iterations=100)),
+        Benchmark("feedback_loop.SimulationRunner.run[1000]",
+                  lambda runner: runner.run(), lambda: SimulationRunner(iterations=1000), repeats=10),
+    ]
+    for n in (50, 100, 200):
+        benchmarks.append(Benchmark(f"game.step_with_resonance[N={n}]",
+                                    lambda env: env.step_with_resonance(0), game_env(n),
+                                    repeats=10 if n > 100 else 20))
+        benchmarks.append(Benchmark(f"game.step_without_resonance[N={n}]",
+                                    lambda env: env.step_without_resonance(0), game_env(n),
+                                    repeats=10 if n > 100 else 20))
+    def graph_env():
+        from payoff_engine import Graph
+        env = OpenSystemEnvironment(num_players=2000, num_rounds=20, seed=0,
+                                    graph=Graph.erdos_renyi(2000, 8, seed=0))
+        env.players = [PlayerStrategy.DEFECT if r < 0.05 else PlayerStrategy.COOPERATE
+                       for r in np.random.default_rng(0).random(2000)]
+        return env
+
+    benchmarks.append(Benchmark("game.run_without_resonance[graph N=2000, <k>=8, 20 rounds]",
+                                lambda env: env.run(False), graph_env, repeats=5))
+    network_graph = []
+
+    def network():
+        from organisation_network import OrganisationNetwork
+        from payoff_engine import Graph
+        if not network_graph:  # Building the graph takes longer than the step; share it between samples
+            network_graph.append(Graph.erdos_renyi(100_000, 8, seed=0))
+        return OrganisationNetwork(network_graph[0], open_fraction=0.3, seed=0)
+
+    benchmarks.append(Benchmark("organisation_network.step[N=1e5, <k>=8]",
+                                lambda network: network.step(), network, repeats=10))
+    def event_env():
+        # Mixed start: all-GREEN is absorbing and would time a run without a single event
+        env = OpenSystemEnvironment(num_players=50, num_rounds=10_000, seed=0)
+        env.players = [PlayerStrategy.DEFECT if r < 0.2 else PlayerStrategy.COOPERATE
+                       for r in np.random.default_rng(0).random(50)]
+        return env
+
+    for resonance in (True, False):
+        label = "with" if resonance else "without"
+        benchmarks.append(Benchmark(f"game.run_event_driven[{label}, N=50, 10k rounds]",
+                                    lambda env, resonance=resonance: env.run(resonance, event_driven=True),
+                                    event_env))
+    benchmarks += [
+        Benchmark("alien.ResonanceWithAlien4D.analyze_alien_signal",
+                  lambda state: state[0].analyze_alien_signal(state[1]),
+                  lambda: (ResonanceWithAlien4D(), create_random_alien()), number=200),
+        Benchmark("alien.ResonanceWithoutAlien4D.analyze_alien_signal",
+                  lambda state: state[0].analyze_alien_signal(state[1]),
+                  lambda: (ResonanceWithoutAlien4D(), create_random_alien()), number=200),
+        Benchmark("ai_human.ResonanceCooperationModel.interact",
+                  lambda model: model.interact(1),
+                  lambda: ResonanceCooperationModel(*scenario_1_transparent_aligned_ai()), number=200),
+        Benchmark("consistency.ConsistencyValidator.run_all_tests",
+                  lambda validator: validator.run_all_tests(), ConsistencyValidator, repeats=5, warmup=1),
+    ]
+
+    records = [{"iteration": i, "authenticity": a, "participation": p, "effectiveness": e}
+               for i, (a, p, e) in enumerate(np.random.default_rng(0).random((10_000, 3)).tolist())]
+    for suffix in ("ndjson", "npz"):
+        benchmarks.append(Benchmark(f"result_writers.{suffix}[10k records]",
+                                    lambda _, suffix=suffix: write_records(records, suffix), repeats=10))
+
+    points = np.random.default_rng(0).random((4, 1_000_000))
+    for name in ("feedback_loop", "ai_human"):
+        kernel = REGISTRY[name].kernel
+        benchmarks.append(Benchmark(f"resonance_formulas.{name}.kernel[1e6]",
+                                    lambda _, kernel=kernel: kernel(*points)))
+    return benchmarks
+
+
+def write_records(records: List[Dict], suffix: str) -> None:
+    """Stream records through a result writer into a temporary file"""
+    import os
+    import tempfile
+    from result_writers import open_writer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open_writer(os.path.join(tmp, f"records.{suffix}")) as writer:
+            for record in records:
+                writer.write(record)
+
+
+def run_suite(name_filter: Optional[str] = None, repeats: Optional[int] = None,
+              verbose: bool = True) -> Dict:
+    """Time all (matching) benchmarks and return a JSON-serialisable report"""
+    results = {}
+    for bench in default_benchmarks():
+        if name_filter and name_filter not in bench.name:
+            continue
+        stats = time_benchmark(bench, repeats)
+        results[bench.name] = stats
+        if verbose:
+            print(f"  {bench.name:<52} p50 {format_time(stats['p50']):>10}  "
+                  f"p90 {format_time(stats['p90']):>10}  p99 {format_time(stats['p99']):>10}")
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """Median-based comparison; returns one row per benchmark present in both reports"""
+    rows = []
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            continue
+        now = current["results"][name]
+        change = now["p50"] / base["p50"] - 1.0 if base["p50"] > 0 else 0.0
+        rows.append({
+            "name": name,
+            "baseline_p50": base["p50"],
+            "current_p50": now["p50"],
+            "change": change,
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite for the simulator hot paths")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--filter", help="Only benchmarks whose name contains this text")
+    run_parser.add_argument("--repeats", type=int, help="Override the number of timed samples")
+    run_parser.add_argument("--save", help="Write the report as a JSON baseline")
+
+    compare_parser = sub.add_parser("compare", help="Compare against a baseline")
+    compare_parser.add_argument("baseline", help="Baseline JSON")
+    compare_parser.add_argument("current", nargs="?", help="Current JSON (default: run the suite now)")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Allowed relative slowdown of the median (default 0.10)")
+    compare_parser.add_argument("--filter", help="Only benchmarks whose name contains this text")
+    compare_parser.add_argument("--repeats", type=int, help="Override the number of timed samples")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        print("\n⏱  BENCHMARKS\n")
+        report = run_suite(args.filter, args.repeats)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nBaseline saved to {args.save}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        print("\n⏱  BENCHMARKS\n")
+        current = run_suite(args.filter, args.repeats)
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"\nCOMPARISON (threshold +{args.threshold:.0%} on median)\n")
+    for row in rows:
+        mark = "✗ REGRESSION" if row["regression"] else "✓"
+        print(f"  {row['name']:<52} {format_time(row['baseline_p50']):>10} -> "
+              f"{format_time(row['current_p50']):>10}  {row['change']:+7.1%}  {mark}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"\n{regressions} regression(s) in {len(rows)} benchmarks")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
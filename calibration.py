@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parameter Calibration - Fit the Feedback-Loop Constants to Observed Time Series
+Batched gradient-free optimisers (CMA-ES, Nelder-Mead) and rejection ABC
+
+    series = load_series("survey.csv")            # authenticity, participation, transparency,
+                                                  # hierarchy_defensivity, external_pressure
+    with CalibrationProblem("open", series.observed, series.pressures, workers=4) as problem:
+        result = cma_es(problem, seed=0)
+    print(result.parameters, result.loss)
+
+    python calibration.py fit survey.csv --system open --method cma-es --workers 4 [--initial A P T H]
+    python calibration.py demo [--steps 10000]
+
+The loss is the mean squared error between the simulated state and every
+observed value (NaN = not surveyed). All candidate parameter sets of one
+optimiser step are evaluated together by feedback_ensemble.simulate, whose cost
+per step is dominated by a fixed per-operation overhead up to a few hundred
+candidates; the optimisers therefore use large batches (CMA-ES population 32,
+Nelder-Mead evaluates reflection, expansion and both contractions at once).
+With workers > 1 a batch is split across a process pool. `fit` starts the
+simulation from each field's first observed value (see initial_state) unless
+--initial is given; missing external pressures are filled with --pressure or
+rejected.
+
+Optimisers work in the unit cube over the parameter bounds (BOUNDS); CMA-ES
+candidates outside it are clipped and penalised.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from feedback_ensemble import STATE_FIELDS, SYSTEMS, parameter_arrays, parameter_names, simulate
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+BOUNDS = {
+    "open": {"learning_rate": (0.001, 0.5), "pressure_coupling": (0.0, 1.0),
+             "authenticity_coupling": (0.0, 1.0), "transparency_coupling": (0.0, 1.0)},
+    "closed": {"defensive_response": (0.001, 0.5), "authenticity_factor": (0.0, 1.0),
+               "transparency_factor": (0.0, 1.0)},
+}
+
+
+@dataclass
+class ObservedSeries:
+    observed: np.ndarray                 # (T, 4) in STATE_FIELDS order, NaN = missing
+    pressures: Optional[np.ndarray]      # (T,) external pressure, if recorded
+
+
+def load_series(path: str, pressure_column: str = "external_pressure") -> ObservedSeries:
+    """Read an observed series from CSV or NDJSON (.ndjson/.jsonl, optionally .gz)"""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        from result_writers import read_ndjson
+        rows = list(read_ndjson(path))
+
+    def value(row, name):
+        cell = row.get(name)
+        return math.nan if cell is None or cell == "" else float(cell)
+
+    observed = np.array([[value(row, name) for name in STATE_FIELDS] for row in rows])
+    pressures = None
+    if rows and pressure_column in rows[0]:
+        pressures = np.array([value(row, pressure_column) for row in rows])
+    return ObservedSeries(observed, pressures)
+
+
+def initial_state(series: ObservedSeries, system: str) -> Tuple[float, ...]:
+    """Start state for a fit: each field's first observed value (the system default if never observed)"""
+    default = SYSTEMS[system][1]
+    state = []
+    for i, column in enumerate(series.observed.T):
+        seen = np.flatnonzero(~np.isnan(column))
+        state.append(float(column[seen[0]]) if len(seen) else default[i])
+    return tuple(state)
+
+
+_WORKER_PROBLEM = None
+
+
+def _init_worker(system, pressures, initial, observed):
+    global _WORKER_PROBLEM
+    _WORKER_PROBLEM = (system, pressures, initial, observed)
+
+
+def _worker_loss(candidates):
+    system, pressures, initial, observed = _WORKER_PROBLEM
+    return simulate(system, parameter_arrays(system, candidates), pressures, initial, observed)
+
+
+class CalibrationProblem:
+    """Batched loss over (K, d) candidate parameter matrices; optional process pool"""
+
+    def __init__(self, system: str, observed, pressures, initial: Optional[Sequence[float]] = None,
+                 workers: int = 1, chunk_size: int = 2048):
+        if system not in SYSTEMS:
+            raise ValueError(f"Unknown system {system!r} (use {', '.join(SYSTEMS)})")
+        self.system = system
+        self.names = parameter_names(system)
+        self.lower = np.array([BOUNDS[system][name][0] for name in self.names])
+        self.upper = np.array([BOUNDS[system][name][1] for name in self.names])
+        self.observed = np.asarray(observed, dtype=float)
+        self.pressures = np.asarray(pressures, dtype=float)
+        if not np.isfinite(self.pressures).all():
+            raise ValueError("external pressures must be finite (only observed values may be NaN)")
+        self.initial = initial
+        self.chunk_size = chunk_size
+        self.evaluations = 0
+        self._pool = None
+        if workers > 1:
+            self._pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                             initargs=(system, self.pressures, initial, self.observed))
+        self.workers = workers
+
+    @property
+    def dimensions(self) -> int:
+        return len(self.names)
+
+    def to_parameters(self, unit) -> np.ndarray:
+        """Unit-cube coordinates -> parameter values"""
+        return self.lower + np.asarray(unit) * (self.upper - self.lower)
+
+    def to_unit(self, parameters) -> np.ndarray:
+        return (np.asarray(parameters) - self.lower) / (self.upper - self.lower)
+
+    def default_unit(self) -> np.ndarray:
+        defaults = SYSTEMS[self.system][0]()
+        return self.to_unit([getattr(defaults, name) for name in self.names])
+
+    def loss(self, unit) -> np.ndarray:
+        """Mean squared error of each row of a (K, d) unit-cube matrix"""
+        candidates = self.to_parameters(np.atleast_2d(unit))
+        self.evaluations += len(candidates)
+        if self._pool is None or len(candidates) < 2 * self.workers:
+            return simulate(self.system, parameter_arrays(self.system, candidates), self.pressures,
+                            self.initial, self.observed)
+        size = min(self.chunk_size, -(-len(candidates) // self.workers))
+        chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+        return np.concatenate(list(self._pool.map(_worker_loss, chunks)))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+@dataclass
+class CalibrationResult:
+    method: str
+    system: str
+    parameters: Dict[str, float]
+    loss: float
+    evaluations: int
+    seconds: float
+    history: List[float] = field(default_factory=list)   # Best loss per iteration / generation
+    spread: Optional[Dict[str, float]] = None            # ABC: posterior standard deviation
+
+    def as_dataclass(self):
+        """OpenSystemParameters / ClosedSystemParameters for OpenSystem(params=...)"""
+        return SYSTEMS[self.system][0](**self.parameters)
+
+
+def _result(method, problem, best_unit, best_loss, start, history, evaluations, spread=None):
+    values = problem.to_parameters(best_unit)
+    return CalibrationResult(method, problem.system, dict(zip(problem.names, values.tolist())),
+                             float(best_loss), problem.evaluations - evaluations,
+                             time.perf_counter() - start, history, spread)
+
+
+def nelder_mead(problem: CalibrationProblem, x0=None, step: float = 0.1, max_iterations: int = 500,
+                tolerance: float = 1e-10) -> CalibrationResult:
+    """Adaptive Nelder-Mead in the unit cube; the four trial points of an iteration form one batch"""
+    start, evaluations = time.perf_counter(), problem.evaluations
+    n = problem.dimensions
+    alpha, gamma, rho, sigma = 1.0, 1 + 2 / n, 0.75 - 1 / (2 * n), 1 - 1 / n  # Gao & Han (2012)
+    x0 = problem.default_unit() if x0 is None else problem.to_unit(x0)
+    simplex = np.vstack([x0] + [x0 + step * np.eye(n)[i] * (1 if x0[i] + step <= 1 else -1) for i in range(n)])
+    values = problem.loss(simplex)
+    history = []
+    for _ in range(max_iterations):
+        order = np.argsort(values)
+        simplex, values = simplex[order], values[order]
+        history.append(float(values[0]))
+        if values[-1] - values[0] <= tolerance and np.ptp(simplex, axis=0).max() <= 1e-8:
+            break
+        centroid = simplex[:-1].mean(axis=0)
+        worst = simplex[-1]
+        trials = np.clip(np.vstack([
+            centroid + alpha * (centroid - worst),              # Reflection
+            centroid + gamma * alpha * (centroid - worst),      # Expansion
+            centroid + rho * alpha * (centroid - worst),        # Outside contraction
+            centroid - rho * (centroid - worst),                # Inside contraction
+        ]), 0.0, 1.0)
+        reflected, expanded, outside, inside = problem.loss(trials)
+        if reflected < values[0]:
+            chosen = (1, expanded) if expanded < reflected else (0, reflected)
+        elif reflected < values[-2]:
+            chosen = (0, reflected)
+        elif reflected < values[-1]:
+            chosen = (2, outside) if outside <= reflected else None
+        else:
+            chosen = (3, inside) if inside < values[-1] else None
+        if chosen is not None:
+            simplex[-1], values[-1] = trials[chosen[0]], chosen[1]
+        else:  # Shrink towards the best vertex
+            simplex[1:] = simplex[0] + sigma * (simplex[1:] - simplex[0])
+            values[1:] = problem.loss(simplex[1:])
+    best = int(np.argmin(values))
+    return _result("nelder-mead", problem, simplex[best], values[best], start, history, evaluations)
+
+
+def cma_es(problem: CalibrationProblem, x0=None, sigma: float = 0.3, population: int = 32,
+           max_generations: int = 300, tolerance: float = 1e-12, seed: Optional[int] = None) -> CalibrationResult:
+    """(mu/mu_w, lambda)-CMA-ES (Hansen's tutorial update) in the unit cube"""
+    start, evaluations = time.perf_counter(), problem.evaluations
+    rng = np.random.default_rng(seed)
+    n = problem.dimensions
+    lam = max(population, 4 + int(3 * math.log(n)))
+    mu = lam // 2
+    weights = math.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights /= weights.sum()
+    mueff = 1 / np.sum(weights ** 2)
+    cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+    cs = (mueff + 2) / (n + mueff + 5)
+    c1 = 2 / ((n + 1.3) ** 2 + mueff)
+    cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+    damps = 1 + 2 * max(0.0, math.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+    chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+    mean = problem.default_unit() if x0 is None else problem.to_unit(x0)
+    pc, ps = np.zeros(n), np.zeros(n)
+    B, D, C = np.eye(n), np.ones(n), np.eye(n)
+    best_unit, best_loss, history = mean, math.inf, []
+    for generation in range(max_generations):
+        z = rng.standard_normal((lam, n))
+        y = z * D @ B.T
+        x = mean + sigma * y
+        clipped = np.clip(x, 0.0, 1.0)
+        losses = problem.loss(clipped) + np.sum((x - clipped) ** 2, axis=1)
+        order = np.argsort(losses)
+        if losses[order[0]] < best_loss:
+            best_loss, best_unit = losses[order[0]], clipped[order[0]]
+        history.append(float(best_loss))
+
+        y_w = weights @ y[order[:mu]]
+        mean = mean + sigma * y_w
+        ps = (1 - cs) * ps + math.sqrt(cs * (2 - cs) * mueff) * (B @ ((B.T @ y_w) / D))
+        h_sig = (np.linalg.norm(ps) / math.sqrt(1 - (1 - cs) ** (2 * (generation + 1))) / chi_n
+                 < 1.4 + 2 / (n + 1))
+        pc = (1 - cc) * pc + h_sig * math.sqrt(cc * (2 - cc) * mueff) * y_w
+        elite = y[order[:mu]]
+        C = ((1 - c1 - cmu) * C + c1 * (np.outer(pc, pc) + (1 - h_sig) * cc * (2 - cc) * C)
+             + cmu * (elite.T * weights) @ elite)
+        sigma *= math.exp((cs / damps) * (np.linalg.norm(ps) / chi_n - 1))
+        C = (C + C.T) / 2
+        eigenvalues, B = np.linalg.eigh(C)
+        D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+        if sigma * D.max() < 1e-8 or np.ptp(losses) < tolerance:
+            break
+    return _result("cma-es", problem, best_unit, best_loss, start, history, evaluations)
+
+
+def abc(problem: CalibrationProblem, samples: int = 20_000, accept: float = 0.01,
+        batch_size: int = 5_000, seed: Optional[int] = None) -> CalibrationResult:
+    """Rejection ABC: uniform prior over BOUNDS, keep the `accept` fraction closest to the data
+
+    parameters is the posterior mean of the accepted samples, spread their
+    standard deviation; loss is the loss at the posterior mean.
+    """
+    start, evaluations = time.perf_counter(), problem.evaluations
+    rng = np.random.default_rng(seed)
+    draws = rng.random((samples, problem.dimensions))
+    distances = np.concatenate([problem.loss(draws[i:i + batch_size]) for i in range(0, samples, batch_size)])
+    keep = max(1, int(samples * accept))
+    accepted = draws[np.argsort(distances)[:keep]]
+    posterior = problem.to_parameters(accepted)
+    mean_unit = problem.to_unit(posterior.mean(axis=0))
+    loss = float(problem.loss(mean_unit)[0])
+    spread = dict(zip(problem.names, posterior.std(axis=0).tolist()))
+    return _result("abc", problem, mean_unit, loss, start, [float(np.sort(distances)[keep - 1])],
+                   evaluations, spread)
+
+
+METHODS = {"cma-es": cma_es, "nelder-mead": nelder_mead, "abc": abc}
+
+
+def synthetic_series(system: str, steps: int, params, initial=None, survey_every: int = 10,
+                     noise: float = 0.02, seed: int = 0) -> ObservedSeries:
+    """Noisy, sparsely surveyed series of a known parameter set (for checking recovery)"""
+    from feedback_ensemble import simulate_one
+    from feedback_loop import SimulationRunner
+
+    rng = np.random.default_rng(seed)
+    pressures = np.array(SimulationRunner(iterations=steps, seed=seed).generate_external_pressures())
+    observed = simulate_one(system, pressures, params, initial)
+    observed = observed + rng.normal(0, noise, observed.shape)
+    surveyed = np.zeros(steps, dtype=bool)
+    surveyed[::survey_every] = True
+    observed[~surveyed] = np.nan
+    observed[rng.random(observed.shape) < 0.1] = np.nan  # Unanswered items
+    return ObservedSeries(observed, pressures)
+
+
+def _print_result(result: CalibrationResult, truth=None) -> None:
+    print(f"  {result.method:<12} loss {result.loss:.3e}  {result.evaluations:>7,} evaluations  "
+          f"{result.seconds:6.1f}s")
+    for name, value in result.parameters.items():
+        line = f"      {name:<22} {value:8.4f}"
+        if result.spread:
+            line += f" ± {result.spread[name]:.4f}"
+        if truth is not None:
+            line += f"   (true {getattr(truth, name):.4f})"
+        print(line)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fit feedback-loop constants to observed time series")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit", help="Fit a CSV / NDJSON series")
+    fit.add_argument("series", help="Columns: " + ", ".join(STATE_FIELDS) + ", external_pressure")
+    fit.add_argument("--pressure", type=float,
+                     help="External pressure where the series has none (whole column or missing cells)")
+    fit.add_argument("--initial", type=float, nargs=4, metavar=("A", "P", "T", "H"),
+                     help="Start state in " + ", ".join(STATE_FIELDS) + " order "
+                          "(default: each field's first observed value)")
+    demo = sub.add_parser("demo", help="Recover known parameters from a synthetic series")
+    demo.add_argument("--steps", type=int, default=10_000)
+    for command in (fit, demo):
+        command.add_argument("--system", choices=sorted(SYSTEMS), default="open")
+        command.add_argument("--method", choices=sorted(METHODS) + ["all"], default="all" if command is demo
+                             else "cma-es")
+        command.add_argument("--workers", type=int, default=1, help="Processes per batch evaluation")
+        command.add_argument("--seed", type=int, default=0)
+    fit.add_argument("--output", help="Write the result as JSON")
+    args = parser.parse_args(argv)
+
+    truth = initial = None
+    if args.command == "demo":
+        from feedback_loop import ClosedSystemParameters, OpenSystemParameters
+        if args.system == "open":
+            truth, initial = OpenSystemParameters(0.02, 0.15, 0.5, 0.1), (0.5, 0.4, 0.5, 0.3)
+        else:
+            truth, initial = ClosedSystemParameters(0.01, 0.3, 0.6), (0.8, 0.9, 0.7, 0.2)
+        series = synthetic_series(args.system, args.steps, truth, initial, seed=args.seed)
+    else:
+        series = load_series(args.series)
+        if series.pressures is None:
+            if args.pressure is None:
+                parser.error("series has no external_pressure column; pass --pressure")
+            series.pressures = np.full(len(series.observed), args.pressure)
+        missing = np.isnan(series.pressures)
+        if missing.any():
+            if args.pressure is None:
+                parser.error(f"external_pressure is missing in {int(missing.sum()):,} rows "
+                             f"(first: row {int(np.argmax(missing))}); fill them or pass --pressure")
+            series.pressures[missing] = args.pressure
+        initial = tuple(args.initial) if args.initial else initial_state(series, args.system)
+
+    methods = sorted(METHODS) if args.method == "all" else [args.method]
+    print("\n" + "="*70)
+    print(f"CALIBRATION - {args.system} system, {len(series.observed):,} steps, "
+          f"{int((~np.isnan(series.observed)).sum()):,} observed values")
+    print("="*70)
+    with CalibrationProblem(args.system, series.observed, series.pressures, initial, args.workers) as problem:
+        for method in methods:
+            options = {} if method == "nelder-mead" else {"seed": args.seed}
+            result = METHODS[method](problem, **options)
+            _print_result(result, truth)
+    print("="*70 + "\n")
+    if args.command == "fit" and args.output:
+        from dataclasses import asdict
+
+        from result_writers import write_json
+        write_json(args.output, asdict(result))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checkpoint / Restore for Long-Running Simulations
+Periodic binary snapshots of the full simulator state, bit-exact resume
+
+    checkpoint = Checkpointer("run.ckpt.npz", every_steps=100_000, every_seconds=300)
+    runner = SimulationRunner(iterations=10_000_000, seed=42)
+    runner.run(checkpoint=checkpoint)                # Saves periodically
+    ...
+    runner = SimulationRunner(iterations=10_000_000, seed=42)
+    runner.run(checkpoint=checkpoint, resume=True)   # Continues from the last snapshot
+
+A state is a (nested) dict of scalars, strings, NumPy arrays and Series. It is
+stored as a single .npz file with "/"-joined keys, written to a temporary file
+and renamed, so a crash during saving never corrupts the previous checkpoint.
+RNG states (legacy np.random / RandomState and np.random.Generator) are
+converted with rng_state() and restored with set_rng_state().
+
+Histories that only grow (per-step records, pressures) are wrapped in a Series.
+A Checkpointer appends just the rows added since its last save to one raw file
+per column in <path>.series/ and keeps the row counts in the snapshot, so a
+save costs O(new rows) instead of rewriting the whole history. The columns are
+appended before the snapshot is replaced and cut back to the snapshot's row
+counts on the next save, so a crash between the two is harmless. load()
+returns a Series as the column arrays (a dict of them for records).
+"""
+
+import json
+import os
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Sequence, Union
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+_SEPARATOR = "/"
+_SERIES = "_series"  # Snapshot key of the Series row counts and dtypes (JSON)
+
+
+class Series:
+    """An append-only history in a checkpoint state
+
+    rows is the simulator's growing sequence (list, RunLengthLog, ...); rows
+    are never changed once appended. dtypes is one dtype for a sequence of
+    scalars, or {field: dtype} for records (dicts or objects with attributes).
+    """
+
+    def __init__(self, rows: Sequence, dtypes: Union[str, Dict[str, str]]):
+        self.rows = rows
+        self.dtypes = dtypes
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def columns(self, start: int = 0) -> Dict[Optional[str], Any]:
+        """Column arrays of rows[start:] ({None: array} for scalars)"""
+        rows = self.rows[start:]
+        if isinstance(self.dtypes, str):
+            return {None: np.array(rows, dtype=self.dtypes)}
+        return {field: np.array([row[field] if isinstance(row, Mapping) else getattr(row, field) for row in rows],
+                                dtype=dtype)
+                for field, dtype in self.dtypes.items()}
+
+
+def _flatten(state: Dict, prefix: str = "", series: Optional[Dict[str, Series]] = None) -> Dict[str, Any]:
+    """Flat {"a/b": array} dict; Series go to `series` if given, else are stored whole"""
+    flat = {}
+    for key, value in state.items():
+        if _SEPARATOR in key:
+            raise ValueError(f"Checkpoint keys must not contain {_SEPARATOR!r}: {key}")
+        name = prefix + key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + _SEPARATOR, series))
+        elif isinstance(value, Series) and series is not None:
+            series[name] = value
+        elif isinstance(value, Series):
+            columns = value.columns()
+            if None in columns:
+                flat[name] = columns[None]
+            else:
+                flat.update({name + _SEPARATOR + field: column for field, column in columns.items()})
+        else:
+            flat[name] = np.asarray(value)
+    return flat
+
+
+def _unflatten(flat) -> Dict[str, Any]:
+    state: Dict[str, Any] = {}
+    for name in flat.files:
+        value = flat[name]
+        if value.ndim == 0:
+            value = value.item()
+        node = state
+        *parents, key = name.split(_SEPARATOR)
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value
+    return state
+
+
+def _write(path: str, flat: Dict[str, Any], compress: bool) -> None:
+    temporary = path + ".tmp.npz"  # np.savez appends .npz to other suffixes
+    (np.savez_compressed if compress else np.savez)(temporary, **flat)
+    os.replace(temporary, path)
+
+
+def save_checkpoint(path: str, state: Dict[str, Any], compress: bool = False) -> None:
+    """Atomically write a state dict as a binary .npz checkpoint (Series stored whole)"""
+    _write(path, _flatten(state), compress)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Read a checkpoint written by save_checkpoint"""
+    with np.load(path, allow_pickle=False) as flat:
+        return _unflatten(flat)
+
+
+def rng_state(rng) -> Dict[str, Any]:
+    """Serialisable state of np.random (the module), a RandomState or a Generator"""
+    if hasattr(rng, "get_state"):
+        kind, key, pos, has_gauss, cached_gaussian = rng.get_state(legacy=True)
+        return {"kind": kind, "key": key, "pos": pos, "has_gauss": has_gauss,
+                "cached_gaussian": cached_gaussian}
+    # Generator: bit-generator states may hold ints wider than 64 bit
+    return {"kind": "generator", "json": json.dumps(rng.bit_generator.state)}
+
+
+def set_rng_state(rng, state: Dict[str, Any]) -> None:
+    """Restore a state produced by rng_state"""
+    if state["kind"] == "generator":
+        rng.bit_generator.state = json.loads(state["json"])
+    else:
+        rng.set_state((state["kind"], np.asarray(state["key"], dtype=np.uint32), int(state["pos"]),
+                       int(state["has_gauss"]), float(state["cached_gaussian"])))
+
+
+class Checkpointer:
+    """Saves a simulator's state every N steps and/or every T seconds of wall time
+
+    Series in the state are appended to <path>.series/ (see module docstring);
+    compress applies to the snapshot only.
+    """
+
+    def __init__(self, path: str, every_steps: Optional[int] = None,
+                 every_seconds: Optional[float] = None, compress: bool = False):
+        if every_steps is None and every_seconds is None:
+            raise ValueError("Checkpointer needs every_steps and/or every_seconds")
+        self.path = path
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        self.compress = compress
+        self.saves = 0
+        self.last_step = 0
+        self.last_time = time.monotonic()
+        self._saved: Dict[str, int] = {}  # Rows of each Series already in its column files
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def due(self, step: int) -> bool:
+        """Is a checkpoint due after `step` completed steps?"""
+        if self.every_steps is not None and step - self.last_step >= self.every_steps:
+            return True
+        return self.every_seconds is not None and time.monotonic() - self.last_time >= self.every_seconds
+
+    def _column_path(self, name: str, field: Optional[str]) -> str:
+        column = name.replace(_SEPARATOR, ".") + ("" if field is None else "." + field)
+        return os.path.join(self.path + ".series", column + ".bin")
+
+    def save(self, state: Dict[str, Any], step: int) -> None:
+        series: Dict[str, Series] = {}
+        flat = _flatten(state, series=series)
+        if series:
+            os.makedirs(self.path + ".series", exist_ok=True)
+        for name, table in series.items():
+            start = self._saved.get(name, 0)
+            for field, column in table.columns(start).items():
+                with open(self._column_path(name, field), "ab" if start else "wb") as file:
+                    file.truncate(start * column.itemsize)  # Rows appended after the last snapshot
+                    column.tofile(file)
+            self._saved[name] = len(table)
+        flat[_SERIES] = np.asarray(json.dumps({name: {"length": self._saved[name], "dtypes": table.dtypes}
+                                               for name, table in series.items()}))
+        _write(self.path, flat, self.compress)
+        self.saves += 1
+        self.last_step = step
+        self.last_time = time.monotonic()
+
+    def load(self) -> Dict[str, Any]:
+        state = load_checkpoint(self.path)
+        for name, table in json.loads(state.pop(_SERIES, "{}")).items():
+            dtypes = table["dtypes"]
+            columns = {field: np.fromfile(self._column_path(name, field), dtype=dtype, count=table["length"])
+                       for field, dtype in ({None: dtypes} if isinstance(dtypes, str) else dtypes).items()}
+            node = state
+            *parents, key = name.split(_SEPARATOR)
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[key] = columns[None] if isinstance(dtypes, str) else columns
+            self._saved[name] = table["length"]
+        self.last_step = state.get("step", 0)
+        self.last_time = time.monotonic()
+        return state
+
+    def nbytes(self) -> int:
+        """Size on disk: snapshot plus Series column files"""
+        directory = self.path + ".series"
+        files = [os.path.join(directory, name) for name in os.listdir(directory)] if os.path.isdir(directory) else []
+        return os.path.getsize(self.path) + sum(os.path.getsize(file) for file in files)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from checkpointing import Checkpointer  # The simulators build checkpointing.Series, not __main__.Series
+    from feedback_loop import SimulationRunner
+
+    print("\n" + "="*70)
+    print("CHECKPOINT / RESUME - SimulationRunner, 20,000 steps")
+    print("="*70)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.ckpt.npz")
+        reference = SimulationRunner(iterations=20_000, seed=42).run()
+
+        checkpoint = Checkpointer(path, every_steps=5_000)
+        SimulationRunner(iterations=12_000, seed=42).run(checkpoint=checkpoint)  # "Crashes" after 12,000
+        print(f"  Interrupted run: {checkpoint.saves} checkpoints, last at step {checkpoint.last_step:,} "
+              f"({checkpoint.nbytes()/1e3:.0f} kB)")
+
+        start = time.perf_counter()
+        resumed = SimulationRunner(iterations=20_000, seed=42).run(
+            checkpoint=Checkpointer(path, every_steps=5_000), resume=True)
+        print(f"  Resumed run finished in {time.perf_counter() - start:.2f}s")
+        print(f"  Bit-exact with uninterrupted run: {resumed == reference}")
+    print("="*70 + "\n")
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chunked Kernels - Intra-Run Multithreading for Single Huge Populations
+Cache-sized chunks on a thread pool, GIL-releasing NumPy kernels, per-chunk RNG streams
+
+    with ChunkedPool(threads=8, seed=0) as pool:
+        game = LargeGame(10_000_000, defect_fraction=0.3, pool=pool)
+        history = game.run(50, resonance=False)          # [{"round", "green_count", "red_count"}, ...]
+        population = LargePopulation("learning", 1_000_000, pool=pool)
+        curve = population.run(20)                       # population means per iteration
+
+One run of a very large population is split into chunks of chunk_size players
+(default 2^16, so a chunk's handful of float64 / uint8 arrays stays in L2).
+The chunks run on a ThreadPoolExecutor. Every kernel is a NumPy ufunc, a
+fancy-indexing gather or a Generator fill, and all of these release the GIL.
+So threads run truly in parallel, and there is no process start-up and no data
+to copy. Updates are double-buffered: chunks read the old strategy vector and
+write only their own slice of the new one.
+
+Determinism: chunk c at step s draws from its own stream,
+SeedSequence(seed, spawn_key=(s, c)), and per-chunk partial sums are reduced
+in chunk order. Results therefore depend on seed and chunk_size, never on the
+thread count or on scheduling (the __main__ check compares 1 and 4 threads).
+
+LargeGame follows OpenSystemEnvironment.step_with_resonance /
+step_without_resonance (well-mixed, or a payoff_engine.Graph with random-
+neighbour imitation). LargePopulation is ResonanceCooperationModel in sample
+mode, vectorized over humans. Each human has its own copy of the scenario AI,
+and traits follow HumanPopulationModel (scenario +/- spread). The resonance
+kernel comes from resonance_formulas.get_kernel, so RESONANCE_JIT=1 swaps in
+the numba-compiled ufunc where numba is installed. Both use different random
+streams than the scalar classes: the distributions match, the draws do not.
+
+LargePopulation stores traits and AI state in precision.policy().state
+(float32 under the compact policy) and reduces its chunk sums in float64.
+LargeGame keeps its uint8 strategy codes under either policy.
+
+    python chunked_kernels.py [--players 10000000] [--humans 1000000] [--threads 4]
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+from payoff_engine import Graph, payoff_matrix
+from precision import policy
+
+np = lazy_import("numpy")
+
+CHUNK_SIZE = 1 << 16
+
+
+class ChunkedPool:
+    """Thread pool over fixed-size chunks with deterministic per-chunk RNG streams"""
+
+    def __init__(self, threads: Optional[int] = None, chunk_size: int = CHUNK_SIZE, seed: Optional[int] = None):
+        self.threads = threads or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.entropy = np.random.SeedSequence(seed).entropy
+        self._executor = ThreadPoolExecutor(self.threads) if self.threads > 1 else None
+
+    def chunks(self, size: int) -> List[Tuple[int, int]]:
+        return [(start, min(start + self.chunk_size, size)) for start in range(0, size, self.chunk_size)]
+
+    def rng(self, step: int, chunk: int):
+        return np.random.default_rng(np.random.SeedSequence(self.entropy, spawn_key=(step, chunk)))
+
+    def map(self, kernel: Callable, size: int, step: int = 0) -> list:
+        """[kernel(start, stop, rng) for every chunk], in chunk order"""
+        tasks = [(start, stop, self.rng(step, c)) for c, (start, stop) in enumerate(self.chunks(size))]
+        if self._executor is None or len(tasks) == 1:
+            return [kernel(*task) for task in tasks]
+        return list(self._executor.map(lambda task: kernel(*task), tasks))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ChunkedPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class LargeGame:
+    """Two-strategy game of OpenSystemEnvironment on a uint8 strategy vector (0 GREEN, 1 RED)"""
+
+    def __init__(self, num_players: int, defect_fraction: float = 0.0, graph: Optional[Graph] = None,
+                 payoffs=None, pool: Optional[ChunkedPool] = None):
+        from evolutionary_game_theory import GamePayoff
+
+        if graph is not None and graph.size != num_players:
+            raise ValueError(f"Graph has {graph.size} players, population has {num_players}")
+        self.num_players = num_players
+        self.graph = graph
+        self.matrix = payoff_matrix(payoffs or GamePayoff())
+        self.pool = pool or ChunkedPool(threads=1)
+        self.codes = np.zeros(num_players, dtype=np.uint8)
+        self._next = np.empty_like(self.codes)
+        self.scores = None if graph is None else np.zeros(num_players, dtype=np.int64)
+        self.round = 0
+        self.history: List[Dict[str, int]] = []
+        if defect_fraction:
+            def draw(start, stop, rng):
+                self.codes[start:stop] = rng.random(stop - start) < defect_fraction
+            self.pool.map(draw, num_players, step=0)
+
+    def _count_reds(self) -> int:
+        return sum(self.pool.map(lambda start, stop, rng: int(np.count_nonzero(self.codes[start:stop])),
+                                 self.num_players))
+
+    def _play(self, reds: int) -> float:
+        """Fill self.scores (graph: per-player sums over neighbours) and return the average score"""
+        n = self.num_players
+        if self.graph is None:  # Well-mixed: score depends only on own strategy and the counts
+            per_strategy = self.matrix @ np.array([n - reds, reds]) - np.diag(self.matrix)
+            self._per_strategy = per_strategy
+            return float((n - reds) * per_strategy[0] + reds * per_strategy[1]) / n
+        indptr, indices = self.graph.indptr, self.graph.indices
+        flat = self.matrix.ravel()
+
+        def play(start, stop, rng):
+            lo, hi = indptr[start], indptr[stop]
+            owners = np.repeat(self.codes[start:stop].astype(np.int64) * 2, np.diff(indptr[start:stop + 1]))
+            values = flat.take(owners + self.codes[indices[lo:hi]])
+            if hi == lo:
+                sums = np.zeros(stop - start, np.int64)
+            else:
+                sums = np.add.reduceat(values, np.minimum(indptr[start:stop] - lo, hi - lo - 1))
+                sums[indptr[start:stop] == indptr[start + 1:stop + 1]] = 0  # reduceat on empty rows
+            self.scores[start:stop] = sums
+            return int(sums.sum())
+
+        return sum(self.pool.map(play, n, step=2 * self.round + 1)) / n
+
+    def step(self, resonance: bool = True) -> Dict[str, int]:
+        n = self.num_players
+        reds = self._count_reds() if not self.history else self.history[-1]["red_count"]
+        avg_score = self._play(reds)
+        codes, new = self.codes, self._next
+        degrees = None if self.graph is None else self.graph.degrees()
+
+        def update(start, stop, rng):
+            own = codes[start:stop]
+            if resonance:  # Defectors switch to GREEN with probability 0.3 while avg_score < 2
+                switch = (own == 1) & (rng.random(stop - start) < 0.3) if avg_score < 2 else False
+                np.subtract(own, switch, out=new[start:stop], casting="unsafe")
+            else:  # Copy a random other player (random neighbour on a graph) who scored more
+                if degrees is None:
+                    other = rng.integers(0, n, stop - start)
+                    better = self._per_strategy.take(codes.take(other)) > self._per_strategy.take(own)
+                else:
+                    degree = degrees[start:stop]
+                    pick = (rng.random(stop - start) * degree).astype(np.int64)
+                    other = self.graph.indices.take(np.minimum(self.graph.indptr[start:stop] + pick,
+                                                               len(self.graph.indices) - 1))
+                    better = (degree > 0) & (self.scores.take(other) > self.scores[start:stop])
+                np.copyto(new[start:stop], np.where(better, codes.take(other), own))
+            return int(np.count_nonzero(new[start:stop]))
+
+        reds = sum(self.pool.map(update, n, step=2 * self.round + 2))
+        self.codes, self._next = new, codes
+        record = {"round": self.round, "green_count": n - reds, "red_count": reds}
+        self.history.append(record)
+        self.round += 1
+        return record
+
+    def run(self, rounds: int, resonance: bool = True) -> List[Dict[str, int]]:
+        for _ in range(rounds):
+            self.step(resonance)
+        return self.history
+
+
+class LargePopulation:
+    """ResonanceCooperationModel in sample mode for a whole population, one AI copy per human"""
+
+    FIELDS = ("acceptance_rate", "acceptance_probability", "human_trust", "ai_transparency", "resonance_score")
+
+    def __init__(self, scenario: str = "transparent_aligned", size: int = 1_000_000, spread: float = 0.15,
+                 pool: Optional[ChunkedPool] = None, jit: Optional[bool] = None):
+        from ai_human_interaction_test import SCENARIOS, HumanPopulationModel
+        from resonance_formulas import get_kernel
+
+        human, ai = SCENARIOS[scenario]()
+        self.scenario = scenario
+        self.size = size
+        self.pool = pool or ChunkedPool(threads=1)
+        self.resonance = get_kernel("ai_human", jit)
+        dtype = policy().state
+        self.traits = np.empty((len(HumanPopulationModel.TRAITS), size), dtype=dtype)
+
+        def draw(start, stop, rng):
+            for row, trait in enumerate(HumanPopulationModel.TRAITS):
+                values = getattr(human, trait) + rng.uniform(-spread, spread, stop - start)
+                np.clip(values, 0.0, 1.0, out=self.traits[row, start:stop])
+
+        self.pool.map(draw, size, step=0)
+        self.expertise, self.autonomy_need, self.trust, self.transparency_requirement, self.alignment = self.traits
+        self.ai_transparency = np.full(size, ai.transparency_level, dtype=dtype)
+        self.ai_alignment_focus = np.full(size, ai.alignment_focus, dtype=dtype)
+        self.learning_rate = ai.learning_rate
+        self.iteration = 0
+        self.history: List[Dict[str, float]] = []
+
+    def _interact(self, start, stop, rng) -> np.ndarray:
+        """One interaction for humans [start, stop); returns the chunk's sums of FIELDS"""
+        k = stop - start
+        transparency = self.ai_transparency[start:stop]
+        focus = self.ai_alignment_focus[start:stop]
+        trust = self.trust[start:stop]
+        autonomy = self.autonomy_need[start:stop]
+        # AISystem.generate_recommendation: explanation long enough (> 50 chars) to be understood
+        length = (100 * transparency).astype(np.int64) + rng.integers(30, 71, k)
+        understanding = np.where(length > 50, 1.0, 0.3)
+        # HumanAgent.make_decision
+        probability = understanding * self.transparency_requirement[start:stop]
+        probability += (1.0 - autonomy) + autonomy * 0.5
+        probability += trust * 0.7
+        probability += self.alignment[start:stop]
+        probability /= 4.0
+        accepted = rng.random(k) < probability
+        np.copyto(trust, np.where(accepted, np.minimum(1.0, trust + 0.05), np.maximum(0.0, trust - 0.03)))
+        # AISystem.adapt_to_feedback
+        rejected = ~accepted
+        np.copyto(transparency, np.minimum(1.0, transparency + self.learning_rate * 0.1), where=rejected)
+        np.copyto(focus, np.minimum(1.0, focus + self.learning_rate * 0.05), where=rejected)
+        resonance = self.resonance(autonomy, transparency, (self.alignment[start:stop] + focus) / 2.0, trust)
+        return np.array([np.count_nonzero(accepted), probability.sum(dtype=np.float64), trust.sum(dtype=np.float64),
+                         transparency.sum(dtype=np.float64), resonance.sum(dtype=np.float64)])
+
+    def step(self) -> Dict[str, float]:
+        self.iteration += 1
+        sums = np.zeros(len(self.FIELDS))
+        for partial in self.pool.map(self._interact, self.size, step=self.iteration):
+            sums += partial  # Chunk order, independent of the thread count
+        record = {"iteration": self.iteration, **dict(zip(self.FIELDS, (sums / self.size).tolist()))}
+        self.history.append(record)
+        return record
+
+    def run(self, iterations: int = 20) -> List[Dict[str, float]]:
+        for _ in range(iterations):
+            self.step()
+        return self.history
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    from ai_human_interaction_test import SCENARIOS, TrustDistributionModel
+
+    parser = argparse.ArgumentParser(description="Intra-run multithreading for single huge populations")
+    parser.add_argument("--players", type=int, default=10_000_000)
+    parser.add_argument("--humans", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*74)
+    print(f"CHUNKED KERNELS - {os.cpu_count()} CPU(s), chunks of {args.chunk_size:,}")
+    print("="*74)
+    ring = Graph.ring(200_000, 4)
+    runs = {}
+    for threads in sorted({1, args.threads}):
+        with ChunkedPool(threads, args.chunk_size, seed=0) as pool:
+            start = time.perf_counter()
+            game = LargeGame(args.players, defect_fraction=0.3, pool=pool).run(10, resonance=False)
+            game_time = time.perf_counter() - start
+            start = time.perf_counter()
+            graph_game = LargeGame(200_000, 0.3, ring, pool=pool).run(10, resonance=False)
+            graph_time = time.perf_counter() - start
+            start = time.perf_counter()
+            population = LargePopulation("learning", args.humans, spread=0.0, pool=pool).run(20)
+            population_time = time.perf_counter() - start
+        runs[threads] = (game, graph_game, population)
+        print(f"  {threads} thread(s): game {args.players:,} x 10 rounds {game_time:6.2f}s   "
+              f"ring 200,000 x 10 {graph_time:5.2f}s   humans {args.humans:,} x 20 {population_time:6.2f}s")
+    print(f"  identical results for 1 and {args.threads} threads: {runs[1] == runs[args.threads]}")
+
+    game, graph_game, population = runs[args.threads]
+    print(f"\n  well-mixed without Resonanzformel: GREEN {game[0]['green_count']:,} -> {game[-1]['green_count']:,}")
+    print(f"  ring without Resonanzformel:       GREEN {graph_game[0]['green_count']:,} -> "
+          f"{graph_game[-1]['green_count']:,}")
+    human, ai = SCENARIOS["learning"]()
+    expected = TrustDistributionModel(human, ai).run(20)
+    error = max(abs(p["acceptance_probability"] - e["acceptance_probability"]) for p, e in zip(population, expected))
+    print(f"  population acceptance vs. expectation mode (spread 0): max deviation {error:.1e}")
+    print("="*74 + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resonanzformel & 5D-Intelligenz - Unified Command Line
+One entry point for every simulator, check and tool
+
+    python cli.py framework                       # Print the 5D framework
+    python cli.py check [--only dimensions,system] [--axioms FILE] [--samples N]
+    python cli.py simulate [TRAJECTORY] | game | alien | ai-human
+    python cli.py test [run_all_tests options]
+    python cli.py bench [benchmarks options]
+    python cli.py serve [simulation_service options]
+    python cli.py cache [--dir DIR] stats | clear
+    python cli.py calibrate fit SERIES | demo [calibration options]
+    python cli.py rare [rare_events options]
+    python cli.py sde [feedback_sde options]
+    python cli.py network [organisation_network options]
+    python cli.py queue coordinator | worker | demo [work_queue options]
+
+Global options (before the command):
+    --profile / --sample    Run the command under cProfile / the sampling profiler
+    --timings FILE          Write instrumentation phase timings as JSON
+    --trace FILE            Write a Chrome trace of the instrumented phases
+
+Each command imports only the modules it needs, and NumPy is loaded lazily, so
+light commands (framework, check --only dimensions,integration,system) start in
+well under 100 ms. Measure with: python -X importtime cli.py framework
+"""
+
+import argparse
+import sys
+
+
+def cmd_framework(args):
+    from core_dimensions import IntelligenceFramework
+    IntelligenceFramework().print_framework()
+
+
+def cmd_check(args):
+    from consistency_check import ConsistencyValidator
+    validator = ConsistencyValidator(samples=args.samples, axioms_path=args.axioms)
+    results = validator.run_all_tests(args.only.split(",") if args.only else None)
+    validator.print_results()
+    if args.export:
+        validator.export_json(args.export)
+    return 0 if all(result.passed for result in results) else 1
+
+
+def cmd_simulate(args):
+    from feedback_loop import main
+    main([args.trajectory] if args.trajectory else [])
+
+
+def cmd_game(args):
+    from evolutionary_game_theory import EvolutionaryGameTheoryTests
+    EvolutionaryGameTheoryTests().run_all_tests()
+
+
+def cmd_alien(args):
+    from alien_intelligence_test import run_comprehensive_test
+    run_comprehensive_test()
+
+
+def cmd_ai_human(args):
+    from ai_human_interaction_test import run_test
+    run_test()
+
+
+def cmd_test(args):
+    from run_all_tests import main
+    main(args.args)
+
+
+def cmd_bench(args):
+    from benchmarks import main
+    return main(args.args)
+
+
+def cmd_serve(args):
+    from simulation_service import main
+    return main(args.args)
+
+
+def cmd_cache(args):
+    from result_cache import main
+    return main(args.args)
+
+
+def cmd_calibrate(args):
+    from calibration import main
+    return main(args.args)
+
+
+def cmd_rare(args):
+    from rare_events import main
+    return main(args.args)
+
+
+def cmd_sde(args):
+    from feedback_sde import main
+    return main(args.args)
+
+
+def cmd_network(args):
+    from organisation_network import main
+    return main(args.args)
+
+
+def cmd_queue(args):
+    from work_queue import main
+    return main(args.args)
+
+
+PASSTHROUGH_COMMANDS = (
+    # (command, help, handler): handler receives the remaining options as args.args
+    ("test", "Complete test suite (run_all_tests.py)", cmd_test),
+    ("bench", "Benchmark suite (benchmarks.py)", cmd_bench),
+    ("serve", "Simulation service (simulation_service.py)", cmd_serve),
+    ("cache", "Result cache (result_cache.py)", cmd_cache),
+    ("calibrate", "Fit feedback-loop constants (calibration.py)", cmd_calibrate),
+    ("rare", "Rare-event probabilities (rare_events.py)", cmd_rare),
+    ("sde", "Stochastic feedback loop with quantile bands (feedback_sde.py)", cmd_sde),
+    ("network", "Organisations coupled by migration (organisation_network.py)", cmd_network),
+    ("queue", "Sweep coordinator / workers over TCP or a directory (work_queue.py)", cmd_queue),
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Resonanzformel & 5D-Intelligenz")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--profile", action="store_true", help="Run the command under cProfile")
+    mode.add_argument("--sample", action="store_true", help="Run the command under the sampling profiler")
+    parser.add_argument("--profile-output", help="Write the profiler report to this file")
+    parser.add_argument("--timings", help="Write instrumentation phase timings as JSON")
+    parser.add_argument("--trace", help="Write a Chrome trace of the instrumented phases")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("framework", help="Print the 4D + 5D framework").set_defaults(func=cmd_framework)
+
+    check = sub.add_parser("check", help="Logical consistency validation")
+    check.add_argument("--only", help="Comma-separated subset: dimensions,formula,feedback,"
+                                      "integration,system,variants")
+    check.add_argument("--axioms", help="Dimension model as JSON or YAML")
+    check.add_argument("--samples", type=int, default=1_000_000, help="Sample points per formula property")
+    check.add_argument("--export", help="Write the results as JSON")
+    check.set_defaults(func=cmd_check)
+
+    simulate = sub.add_parser("simulate", help="Feedback loop: open vs. closed systems")
+    simulate.add_argument("trajectory", nargs="?", help="Stream the per-iteration records to .ndjson, .ndjson.gz or .npz")
+    simulate.set_defaults(func=cmd_simulate)
+    sub.add_parser("game", help="Evolutionary game theory tests").set_defaults(func=cmd_game)
+    sub.add_parser("alien", help="Alien intelligence test").set_defaults(func=cmd_alien)
+    sub.add_parser("ai-human", help="AI-human interaction test").set_defaults(func=cmd_ai_human)
+
+    # Options after these commands are passed through unchanged
+    for name, help_text, func in PASSTHROUGH_COMMANDS:
+        sub.add_parser(name, help=help_text, add_help=False).set_defaults(func=func, passthrough=True)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if getattr(args, "passthrough", False):
+        args.args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if not (args.profile or args.sample or args.timings or args.trace):
+        return args.func(args) or 0
+
+    import instrumentation
+    with instrumentation.instrumented(record_events=bool(args.trace)) as inst:
+        if args.profile or args.sample:
+            status = instrumentation.profile_call(args.func, args, sampler=args.sample,
+                                                  output=args.profile_output)
+        else:
+            status = args.func(args)
+    if inst.timings or inst.counters:
+        inst.print_summary()
+    if args.timings:
+        inst.export_json(args.timings)
+    if args.trace:
+        inst.export_chrome_trace(args.trace)
+    return status or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,17 +6,22 @@ Dieses Modul prüft die mathematische und logische Kohärenz des Frameworks
 und identifiziert potenzielle Widersprüche, Zirkularitäten oder Unstimmigkeiten.
 
 Validierungsmethoden:
-- Dimensionale Unabhängigkeit
+- Dimensionale Unabhängigkeit (Abhängigkeitsgraph, siehe dimension_graph.py)
 - Resonanzformel-Mathematik
 - Feedback-Schleife-Logik
 - 5D-Integration
 - Systemische Konsistenz
+- Formelvarianten (property-basiert, siehe consistency_engine.py)
 """
 
 import sys
-from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
-import json
+from dataclasses import asdict, dataclass
+from typing import List, Dict, Iterable, Tuple, Optional
+
+from consistency_engine import ConsistencyEngine
+from dimension_graph import DimensionGraph, load_axioms_file
+from resonance_formulas import REGISTRY
+from result_writers import write_json
 
 
 @dataclass
@@ -32,9 +37,33 @@ class ConsistencyResult:
 class ConsistencyValidator:
     """Hauptklasse für die Konsistenz-Validierung"""
     
-    def __init__(self):
+    # Kurzname -> Testmethode, in Ausführungsreihenfolge. Nur die Formeltests
+    # ("formula", "feedback", "variants") laden NumPy.
+    TESTS = {
+        "dimensions": "test_dimensional_independence",
+        "formula": "test_resonance_formula_logic",
+        "feedback": "test_feedback_loop_logic",
+        "integration": "test_5d_integration",
+        "system": "test_system_consistency",
+        "variants": "test_formula_variants",
+    }
+    
+    def __init__(self, samples: int = 1_000_000, seed: Optional[int] = 0,
+                 axioms_path: Optional[str] = None):
         self.results: List[ConsistencyResult] = []
         self.framework_axioms = self._load_axioms()
+        if axioms_path:
+            self.load_axioms(axioms_path)
+        self.engine = ConsistencyEngine(samples=samples, seed=seed)
+    
+    def load_axioms(self, path: str) -> Dict:
+        """Lädt ein nutzerdefiniertes Dimensionsmodell aus JSON oder YAML"""
+        self.framework_axioms = load_axioms_file(path)
+        return self.framework_axioms
+    
+    def dependency_graph(self) -> DimensionGraph:
+        """Abhängigkeitsgraph der aktuell geladenen Axiome"""
+        return DimensionGraph.from_axioms(self.framework_axioms)
     
     def _load_axioms(self) -> Dict:
         """Lädt die Grundannahmen des Frameworks"""
@@ -69,31 +98,22 @@ class ConsistencyValidator:
     def test_dimensional_independence(self) -> ConsistencyResult:
         """Test 1: Sind die Dimensionen logisch unabhängig?"""
         test_name = "Dimensional Independence"
-        passed = True
         details = {}
         
-        dependencies = {}
-        for dim, axiom in self.framework_axioms.items():
-            dependencies[dim] = axiom.get("depends_on", [])
-        
-        for dim, deps in dependencies.items():
-            for dep in deps:
-                if dim in dependencies.get(dep, []):
-                    passed = False
-                    details[f"circular_{dim}_{dep}"] = f"Circular dependency: {dim} <-> {dep}"
+        graph = self.dependency_graph()
+        violations = graph.validate()
+        passed = not violations
         
-        hierarchy_order = ["1D_Urinstinkte", "2D_Emotionale_Intelligenz", 
-                          "3D_Rationale_Intelligenz", "4D_Systemische_Intelligenz", 
-                          "5D_Weisheit"]
-        
-        for i, higher_dim in enumerate(hierarchy_order):
-            for lower_dim in hierarchy_order[i+1:]:
-                if lower_dim in dependencies.get(higher_dim, []):
-                    passed = False
-                    details[f"hierarchy_violation"] = f"Higher dim depends on lower dim"
+        for violation in violations:
+            key = f"{violation.kind}_{'_'.join(violation.path)}"
+            details[key] = violation.description
         
         if passed:
             details["status"] = "All dimensions maintain proper hierarchy"
+            if len(graph.nodes) <= 10:
+                details["order"] = " -> ".join(graph.topological_order())
+            else:
+                details["order"] = f"Topological order over {len(graph.nodes)} nodes"
         
         return ConsistencyResult(
             test_name=test_name,
@@ -106,36 +126,20 @@ class ConsistencyValidator:
     def test_resonance_formula_logic(self) -> ConsistencyResult:
         """Test 2: Ist die Resonanzformel mathematisch konsistent?"""
         test_name = "Resonance Formula Logic"
-        passed = True
         details = {}
         
-        test_params = {
-            "T_Transparenz": 0.5,
-            "F_Feedback": 0.7,
-            "O_Offenheit": 0.6,
-            "H_Hierarchie": 0.2
-        }
-        
-        for param, value in test_params.items():
-            if not (0 <= value <= 1):
-                passed = False
-                details["invalid_range"] = f"Parameter outside [0,1]"
-        
-        baseline_r = (0.5 * 0.7 * 0.6) / (1 + 0.2)
-        new_r_high_t = (0.8 * 0.7 * 0.6) / (1 + 0.2)
+        checks = self.engine.check_formula(REGISTRY["consistency"])
+        passed = all(check.passed for check in checks)
         
-        if new_r_high_t <= baseline_r:
-            passed = False
-            details["monotonicity_T"] = "Formula doesn't increase with T"
-        
-        new_r_high_h = (0.5 * 0.7 * 0.6) / (1 + 0.5)
-        if new_r_high_h >= baseline_r:
-            passed = False
-            details["monotonicity_H"] = "Formula doesn't decrease with H"
+        for check in checks:
+            if not check.passed:
+                key = "invalid_range" if check.property == "bounded" else f"monotonicity_{check.property.split('_')[-1]}"
+                details[key] = f"{check.property} violated, e.g. {check.counterexamples[0]}"
         
         if passed:
             details["formula"] = "R = T·F·O / (1 + H) is sound"
             details["monotonicity"] = "Expected monotonic behavior confirmed"
+        details["points_checked"] = checks[0].points_checked
         
         return ConsistencyResult(
             test_name=test_name,
@@ -148,32 +152,21 @@ class ConsistencyValidator:
     def test_feedback_loop_logic(self) -> ConsistencyResult:
         """Test 3: Ist die Feedback-Schleife logisch konsistent?"""
         test_name = "Feedback Loop Logic"
-        passed = True
         details = {}
         
-        cooperation_level = 0.5
-        transparency = 0.6
-        feedback_quality = 0.7
-        
-        resonance_1 = (transparency * feedback_quality * 0.8) / 1.1
-        cooperation_new = cooperation_level + (resonance_1 * 0.3)
-        
-        if cooperation_new <= cooperation_level:
-            passed = False
-            details["positive_feedback"] = "Loop not amplifying cooperation"
+        amplifying, bounded = self.engine.check_feedback_update(gain=0.3)
+        passed = amplifying.passed and bounded.passed
         
-        cooperation_extreme = 0.99
-        transparency_extreme = 0.95
-        feedback_extreme = 0.95
-        resonance_extreme = (transparency_extreme * feedback_extreme * 0.95) / 1.05
-        cooperation_extreme_new = cooperation_extreme + (resonance_extreme * 0.3)
+        if not amplifying.passed:
+            details["positive_feedback"] = f"Loop not amplifying cooperation, e.g. {amplifying.counterexamples[0]}"
         
-        if cooperation_extreme_new > 1.0:
-            passed = False
-            details["boundary"] = "System diverges beyond boundaries"
+        if not bounded.passed:
+            details["boundary"] = (f"System diverges beyond boundaries at {bounded.violations:,}/"
+                                   f"{bounded.points_checked:,} points, e.g. {bounded.counterexamples[0]}")
         
         if passed:
             details["feedback"] = "Self-reinforcing and stabilizing behavior confirmed"
+        details["points_checked"] = amplifying.points_checked
         
         return ConsistencyResult(
             test_name=test_name,
@@ -183,6 +176,29 @@ class ConsistencyValidator:
             severity="critical"
         )
     
+    def test_formula_variants(self) -> ConsistencyResult:
+        """Test 6: Sind alle Formelvarianten im Code monoton und beschränkt?"""
+        test_name = "Formula Variants"
+        passed = True
+        details = {}
+        
+        for name, checks in self.engine.check_all().items():
+            failed = [check for check in checks if not check.passed]
+            if failed:
+                passed = False
+                for check in failed:
+                    details[f"{name}_{check.property}"] = f"Violated, e.g. {check.counterexamples[0]}"
+            else:
+                details[name] = f"{REGISTRY[name].expression}: {len(checks)} properties hold"
+        
+        return ConsistencyResult(
+            test_name=test_name,
+            passed=passed,
+            description="Property-basierte Prüfung aller Resonanzformel-Varianten",
+            details=details,
+            severity="critical"
+        )
+    
     def test_5d_integration(self) -> ConsistencyResult:
         """Test 4: Ist die 5D-Integration konsistent?"""
         test_name = "5D Integration"
@@ -243,15 +259,14 @@ class ConsistencyValidator:
             severity="critical"
         )
     
-    def run_all_tests(self) -> List[ConsistencyResult]:
-        """Führt alle Konsistenz-Tests durch"""
-        self.results = [
-            self.test_dimensional_independence(),
-            self.test_resonance_formula_logic(),
-            self.test_feedback_loop_logic(),
-            self.test_5d_integration(),
-            self.test_system_consistency()
-        ]
+    def run_all_tests(self, only: Optional[Iterable[str]] = None) -> List[ConsistencyResult]:
+        """Führt alle (oder nur die ausgewählten) Konsistenz-Tests durch"""
+        selected = set(self.TESTS if only is None else only)
+        unknown = selected - set(self.TESTS)
+        if unknown:
+            raise ValueError(f"Unknown consistency tests: {', '.join(sorted(unknown))} "
+                             f"(available: {', '.join(self.TESTS)})")
+        self.results = [getattr(self, method)() for name, method in self.TESTS.items() if name in selected]
         return self.results
     
     def print_results(self):
@@ -283,25 +298,17 @@ class ConsistencyValidator:
     
     def export_json(self, filename: str = "consistency_results.json"):
         """Exportiert Ergebnisse als JSON"""
-        results_dict = []
-        for result in self.results:
-            results_dict.append({
-                "test_name": result.test_name,
-                "passed": result.passed,
-                "description": result.description,
-                "details": result.details,
-                "severity": result.severity
-            })
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results_dict, f, indent=2, ensure_ascii=False)
+        write_json(filename, [asdict(result) for result in self.results])
         
         print(f"Results exported to {filename}")
 
 
 def main():
-    """Führt die Konsistenz-Validierung durch"""
-    validator = ConsistencyValidator()
+    """Führt die Konsistenz-Validierung durch
+    
+    Optional: python consistency_check.py <axioms.json|axioms.yaml>
+    """
+    validator = ConsistencyValidator(axioms_path=sys.argv[1] if len(sys.argv) > 1 else None)
     validator.run_all_tests()
     validator.print_results()
     validator.export_json()
@@ -0,0 +1,207 @@
+"""
+Property-basierte Konsistenz-Engine für die Resonanzformel-Varianten
+=====================================================================
+
+Statt einzelner, handverlesener Punkte prüft diese Engine Monotonie und
+Beschränktheit jeder Formelvariante über dichte Zufalls- oder Gitter-Stichproben
+des Parameterraums [0,1]^n. Die Auswertung ist vollständig mit NumPy
+vektorisiert und läuft blockweise, sodass Millionen Punkte in Bruchteilen
+einer Sekunde geprüft werden. Verletzungen werden mit Gegenbeispielen gemeldet.
+
+Geprüft werden alle Varianten aus der Formel-Registry (resonance_formulas.py),
+also genau die Formeln, die die Simulationen tatsächlich verwenden.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from lazy_imports import lazy_import
+from resonance_formulas import FormulaVariant, REGISTRY
+
+np = lazy_import("numpy")
+
+
+@dataclass
+class PropertyCheckResult:
+    """Ergebnis einer Eigenschaftsprüfung über eine Stichprobe"""
+    formula: str
+    property: str
+    passed: bool
+    points_checked: int
+    violations: int
+    counterexamples: List[Dict] = field(default_factory=list)
+
+
+class ConsistencyEngine:
+    """Vektorisierte, property-basierte Prüfung von Formelvarianten"""
+
+    def __init__(self, samples: int = 1_000_000, seed: Optional[int] = 0,
+                 chunk_size: int = 250_000, max_counterexamples: int = 5,
+                 tolerance: float = 1e-12):
+        self.samples = samples
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_counterexamples = max_counterexamples
+        self.tolerance = tolerance
+
+    def _chunks(self, dims: int, rng: np.random.Generator):
+        """Erzeugt gleichverteilte Stichproben aus [0,1]^dims in Blöcken"""
+        remaining = self.samples
+        while remaining > 0:
+            n = min(self.chunk_size, remaining)
+            remaining -= n
+            yield rng.random((dims, n))
+
+    def _counterexamples(self, spec: FormulaVariant, points: np.ndarray, mask: np.ndarray,
+                         values: np.ndarray, budget: int, **extra: np.ndarray) -> List[Dict]:
+        """Wandelt die ersten verletzenden Punkte in lesbare Gegenbeispiele um"""
+        examples = []
+        for idx in np.flatnonzero(mask)[:budget]:
+            example = {p: float(points[k, idx]) for k, p in enumerate(spec.parameters)}
+            example["value"] = float(values[idx])
+            for key, array in extra.items():
+                example[key] = float(array[idx])
+            examples.append(example)
+        return examples
+
+    def check_random(self, spec: FormulaVariant) -> List[PropertyCheckResult]:
+        """Prüft Schranken und schwache Monotonie in einem Durchlauf über Zufallspunkte
+
+        Für die Monotonie wird pro Punkt x ein Partner x' gezogen, der sich nur im
+        geprüften Parameter unterscheidet; f(x') - f(x) muss dasselbe Vorzeichen
+        wie die Richtung der Änderung haben.
+        """
+        rng = np.random.default_rng(self.seed)
+        low, high = spec.bounds
+        bounded = PropertyCheckResult(spec.name, "bounded", True, 0, 0)
+        monotone = [(spec.parameters.index(p), 1, PropertyCheckResult(spec.name, f"increasing_{p}", True, 0, 0))
+                    for p in spec.increasing]
+        monotone += [(spec.parameters.index(p), -1, PropertyCheckResult(spec.name, f"decreasing_{p}", True, 0, 0))
+                     for p in spec.decreasing]
+
+        for points in self._chunks(len(spec.parameters), rng):
+            values = spec.kernel(*points)
+            mask = ~((values >= low - self.tolerance) & (values <= high + self.tolerance))
+            self._record(bounded, spec, points, mask, values)
+
+            for axis, direction, result in monotone:
+                original = points[axis].copy()
+                moved = rng.random(points.shape[1])
+                points[axis] = moved
+                after = spec.kernel(*points)
+                points[axis] = original
+                delta = (after - values) * np.sign(moved - original) * direction
+                self._record(result, spec, points, delta < -self.tolerance, values,
+                             **{f"{spec.parameters[axis]}_moved": moved, "value_moved": after})
+        return [bounded] + [result for _, _, result in monotone]
+
+    def check_grid(self, spec: FormulaVariant, points_per_axis: int = 32) -> List[PropertyCheckResult]:
+        """Exakte diskrete Prüfung auf einem regulären Gitter über [0,1]^n"""
+        dims = len(spec.parameters)
+        axis_values = np.linspace(0.0, 1.0, points_per_axis)
+        mesh = np.meshgrid(*([axis_values] * dims), indexing="ij")
+        values = spec.kernel(*mesh)
+        points = np.stack([m.ravel() for m in mesh])
+        flat_values = values.ravel()
+        n = flat_values.size
+
+        low, high = spec.bounds
+        bounds_mask = ~((flat_values >= low - self.tolerance) & (flat_values <= high + self.tolerance))
+        results = [self._grid_result(spec, "bounded", points, bounds_mask, flat_values, n)]
+
+        for direction, names in ((1, spec.increasing), (-1, spec.decreasing)):
+            label = "increasing" if direction > 0 else "decreasing"
+            for parameter in names:
+                axis = spec.parameters.index(parameter)
+                step = np.diff(values, axis=axis) * direction
+                mask = np.zeros(values.shape, dtype=bool)
+                index = [slice(None)] * dims
+                index[axis] = slice(0, -1)
+                mask[tuple(index)] = step < -self.tolerance
+                results.append(self._grid_result(spec, f"{label}_{parameter}", points,
+                                                 mask.ravel(), flat_values, n))
+        return results
+
+    def _grid_result(self, spec, name, points, mask, values, n) -> PropertyCheckResult:
+        result = PropertyCheckResult(spec.name, name, True, 0, 0)
+        self._record(result, spec, points, mask, values)
+        result.points_checked = n
+        return result
+
+    def _record(self, result: PropertyCheckResult, spec: FormulaVariant, points: np.ndarray,
+                mask: np.ndarray, values: np.ndarray, **extra: np.ndarray) -> None:
+        result.points_checked += points.shape[1]
+        count = int(np.count_nonzero(mask))
+        if count:
+            result.passed = False
+            result.violations += count
+            budget = self.max_counterexamples - len(result.counterexamples)
+            if budget > 0:
+                result.counterexamples.extend(
+                    self._counterexamples(spec, points, mask, values, budget, **extra))
+
+    def check_formula(self, spec: FormulaVariant, mode: str = "random",
+                      points_per_axis: int = 32) -> List[PropertyCheckResult]:
+        """Prüft alle deklarierten Eigenschaften einer Variante"""
+        if mode == "grid":
+            return self.check_grid(spec, points_per_axis)
+        if mode != "random":
+            raise ValueError(f"Unknown mode: {mode}")
+        return self.check_random(spec)
+
+    def check_all(self, mode: str = "random") -> Dict[str, List[PropertyCheckResult]]:
+        """Prüft alle Varianten der Formel-Registry"""
+        return {name: self.check_formula(spec, mode) for name, spec in REGISTRY.items()}
+
+    def check_feedback_update(self, gain: float = 0.3) -> List[PropertyCheckResult]:
+        """Prüft die Kooperations-Rückkopplung c' = c + gain · T·F·O/(1+H) über [0,1]^5"""
+        rng = np.random.default_rng(self.seed)
+        base = REGISTRY["consistency"]
+        spec = FormulaVariant(
+            name="feedback_update",
+            expression=f"C + {gain}·T·F·O/(1 + H)",
+            parameters=("C",) + base.parameters,
+            kernel=lambda c, t, f, o, h: c + gain * base.kernel(t, f, o, h),
+            scalar=lambda c, t, f, o, h: c + gain * base.scalar(t, f, o, h),
+            bounds=(0.0, 1.0),
+        )
+        amplifying = PropertyCheckResult(spec.name, "amplifying", True, 0, 0)
+        bounded = PropertyCheckResult(spec.name, "bounded", True, 0, 0)
+
+        for points in self._chunks(len(spec.parameters), rng):
+            values = spec.kernel(*points)
+            self._record(amplifying, spec, points, values < points[0] - self.tolerance, values)
+            self._record(bounded, spec, points, values > 1.0 + self.tolerance, values)
+        return [amplifying, bounded]
+
+
+def summarize(results: List[PropertyCheckResult]) -> Dict:
+    """Fasst Prüfergebnisse für ConsistencyResult.details zusammen"""
+    summary = {}
+    for result in results:
+        if result.passed:
+            summary[result.property] = f"OK ({result.points_checked:,} points)"
+        else:
+            summary[result.property] = (
+                f"{result.violations:,}/{result.points_checked:,} violations, "
+                f"e.g. {result.counterexamples[0]}"
+            )
+    return summary
+
+
+if __name__ == "__main__":
+    import time
+
+    engine = ConsistencyEngine()
+    start = time.perf_counter()
+    all_results = engine.check_all()
+    all_results["feedback_update"] = engine.check_feedback_update()
+    duration = time.perf_counter() - start
+
+    for name, results in all_results.items():
+        print(f"\n{name}:")
+        for key, value in summarize(results).items():
+            print(f"  - {key}: {value}")
+    print(f"\nChecked in {duration:.3f} s")
@@ -5,9 +5,12 @@ Core Dimensions of Intelligence - 4D & 5D Framework
 Operationalizing the dimensions of human systemic intelligence
 """
 
+from collections import OrderedDict
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
 
 
 class DimensionID(Enum):
@@ -19,18 +22,33 @@ class DimensionID(Enum):
     D5 = "5D"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Dimension:
-    """Base class for intelligence dimensions"""
+    """Base class for intelligence dimensions (immutable, shared via the catalogue)"""
     id: DimensionID
     name: str
     description: str
-    core_factors: List[str]
-    learning_mechanisms: List[str]
-    risk_factors: List[str]
+    core_factors: Tuple[str, ...]
+    learning_mechanisms: Tuple[str, ...]
+    risk_factors: Tuple[str, ...]
+    
+    def __post_init__(self):
+        for field_name in ("core_factors", "learning_mechanisms", "risk_factors"):
+            object.__setattr__(self, field_name, tuple(getattr(self, field_name)))
     
     def __str__(self) -> str:
         return f"{self.id.value}: {self.name}"
+    
+    def score_system(self, system_description) -> Optional[float]:
+        """Numeric 0-1 score for this dimension from system metrics (None for a bare name)
+        
+        system_description may be a mapping or SystemMetrics-like object with the
+        features listed in dimension_scoring.FEATURES.
+        """
+        if system_description is None or isinstance(system_description, str):
+            return None
+        from dimension_scoring import default_engine, metrics_features
+        return default_engine().score(metrics_features(system_description))[self.id.value]
 
 
 class Dimension1D(Dimension):
@@ -76,6 +94,7 @@ class Dimension1D(Dimension):
         return {
             "dimension": "1D",
             "question": "Does this system make people feel safe, belong, and secure?",
+            "score": self.score_system(system_description),
             "risk": "Ignoring 1D needs creates chronic stress that cascades to all higher dimensions"
         }
 
@@ -125,6 +144,7 @@ class Dimension2D(Dimension):
         return {
             "dimension": "2D",
             "question": "Does this system encourage authenticity and intrinsic motivation?",
+            "score": self.score_system(system_description),
             "risk": "Coercive systems damage 2D capacity and create learned helplessness"
         }
 
@@ -173,6 +193,7 @@ class Dimension3D(Dimension):
         return {
             "dimension": "3D",
             "question": "Is this system transparent, participatory, and genuinely collaborative?",
+            "score": self.score_system(system_description),
             "risk": "Opaque hierarchical systems breed distrust and dysfunction"
         }
 
@@ -222,6 +243,7 @@ class Dimension4D(Dimension):
         return {
             "dimension": "4D",
             "question": "Does this system unleash transdisciplinary creativity and adaptive learning?",
+            "score": self.score_system(system_description),
             "risk": "Closed systems stagnate; emergent systems compound learning"
         }
 
@@ -271,38 +293,104 @@ class Dimension5D(Dimension):
         return {
             "dimension": "5D",
             "question": "Does this system support long-term flourishing and co-evolution with nature?",
+            "score": self.score_system(system_description),
             "risk": "Short-term extractive systems destroy long-term viability"
         }
 
 
+@lru_cache(maxsize=None)
+def dimension_catalogue() -> Mapping[DimensionID, Dimension]:
+    """Frozen catalogue of all dimensions, built once per process"""
+    return MappingProxyType({
+        DimensionID.D1: Dimension1D(),
+        DimensionID.D2: Dimension2D(),
+        DimensionID.D3: Dimension3D(),
+        DimensionID.D4: Dimension4D(),
+        DimensionID.D5: Dimension5D(),
+    })
+
+
+SystemSpec = Union[str, Tuple[str, Optional[Mapping]]]
+
+
+def _freeze(value) -> Hashable:
+    """Hashable, order-independent representation of a context value"""
+    if isinstance(value, Mapping):  # Keys may mix types, so order them by repr
+        return tuple(sorted(((key, _freeze(item)) for key, item in value.items()), key=lambda pair: repr(pair[0])))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
 class IntelligenceFramework:
     """Complete 4D+5D Intelligence Framework"""
     
-    def __init__(self):
-        self.dimensions = {
-            DimensionID.D1: Dimension1D(),
-            DimensionID.D2: Dimension2D(),
-            DimensionID.D3: Dimension3D(),
-            DimensionID.D4: Dimension4D(),
-            DimensionID.D5: Dimension5D(),
-        }
+    def __init__(self, cache_size: int = 4096):
+        self.dimensions = dimension_catalogue()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
     
     def get_dimension(self, dim_id: DimensionID) -> Dimension:
         """Retrieve a dimension by ID"""
         return self.dimensions[dim_id]
     
-    def assess_system_health(self, system_name: str) -> Dict:
-        """Comprehensive assessment of system health across all dimensions"""
+    def assess_system_health(self, system_name: str, context: Optional[Mapping] = None) -> Dict:
+        """Comprehensive assessment of system health across all dimensions
+        
+        context holds the system's metrics (see dimension_scoring.FEATURES); with it,
+        every dimension assessment carries a numeric "score".
+        
+        Results are memoised in a bounded LRU keyed on (system_name, context), so the
+        returned dict is shared between calls and must be treated as read-only.
+        """
+        key = (system_name, _freeze(context))
+        cache = self._cache
+        assessments = cache.get(key)
+        if assessments is not None:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return assessments
+        
+        self.cache_misses += 1
+        assessments = self._assess(system_name, context)
+        cache[key] = assessments
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return assessments
+    
+    def _assess(self, system_name: str, context: Optional[Mapping]) -> Dict:
         assessments = {}
         for dim_id, dimension in self.dimensions.items():
             assessments[dim_id.value] = {
                 "name": dimension.name,
                 "core_factors": dimension.core_factors,
                 "risk_factors": dimension.risk_factors,
-                "assessment": dimension.assess_system_impact(system_name)
+                "assessment": dimension.assess_system_impact(system_name if context is None else context)
             }
         return assessments
     
+    def assess_many(self, systems: Iterable[SystemSpec]) -> List[Dict]:
+        """Assess many systems; each entry is a name or a (name, context) pair"""
+        assess = self.assess_system_health
+        return [assess(system) if isinstance(system, str) else assess(*system) for system in systems]
+    
+    def rank_systems(self, systems: Mapping[str, object], by: str = "overall",
+                     top: Optional[int] = None) -> List[Dict]:
+        """Rank a portfolio {name: metrics} by overall or single-dimension score (vectorized)"""
+        from dimension_scoring import default_engine
+        engine = default_engine()
+        names = list(systems)
+        return engine.rank(names, engine.feature_matrix([systems[name] for name in names]), by=by, top=top)
+    
+    def clear_cache(self) -> None:
+        """Drop all memoised assessments"""
+        self._cache.clear()
+        self.cache_hits = self.cache_misses = 0
+    
     def print_framework(self) -> None:
         """Print human-readable framework"""
         print("\n" + "="*80)
@@ -0,0 +1,290 @@
+"""
+Abhängigkeitsgraph für Dimensionsmodelle
+=========================================
+
+Validiert beliebig große Dimensions- und Faktormodelle (Hunderte bis Tausende
+Knoten) als gerichteten Graphen "X hängt ab von Y":
+
+- Zyklen über Tarjans SCC-Algorithmus in O(V+E) (iterativ, ohne Rekursionslimit)
+- Topologische Ordnung (Abhängigkeiten zuerst)
+- Transitive Hülle als Bitsets über der Kondensation (ein int pro Komponente)
+- Minimale verletzende Pfade: kürzester Zyklus je stark zusammenhängender
+  Komponente, Hierarchieverletzungen als einzelne Kante
+
+Modelle werden als Dict (wie ConsistencyValidator.framework_axioms) oder aus
+JSON-/YAML-Dateien geladen. Format:
+
+    {"dimensions": {"2D_Emotion": {"depends_on": ["1D"], "level": 2}, ...},
+     "factors":    {"Vertrauen": {"depends_on": ["2D_Emotion"]}, ...}}
+
+oder direkt das flache Mapping der Dimensionen. Abhängigkeiten dürfen über das
+Präfix vor dem ersten "_" referenziert werden ("1D" -> "1D_Urinstinkte"). Ohne
+explizites "level" wird die führende Zahl des Namens verwendet.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class GraphViolation:
+    """Eine gefundene Verletzung mit minimalem Pfad"""
+    kind: str  # "cycle", "hierarchy", "unknown_dependency"
+    path: List[str]
+    description: str
+
+
+class DimensionGraph:
+    """Gerichteter Abhängigkeitsgraph über Dimensionen und Faktoren"""
+
+    def __init__(self):
+        self.nodes: List[str] = []
+        self.levels: List[Optional[float]] = []
+        self.edges: List[List[int]] = []  # edges[u] = Knoten, von denen u abhängt
+        self.unknown: List[GraphViolation] = []
+        self._index: Dict[str, int] = {}
+        self._sccs: Optional[List[List[int]]] = None
+        self._component: Optional[List[int]] = None
+        self._closure: Optional[List[int]] = None
+
+    def add_node(self, name: str, level: Optional[float] = None) -> int:
+        """Fügt einen Knoten hinzu (idempotent)"""
+        if name not in self._index:
+            self._index[name] = len(self.nodes)
+            self.nodes.append(name)
+            self.levels.append(level)
+            self.edges.append([])
+        return self._index[name]
+
+    def add_dependency(self, node: str, dependency: str) -> None:
+        """node hängt ab von dependency"""
+        self.edges[self.add_node(node)].append(self.add_node(dependency))
+        self._sccs = self._component = self._closure = None
+
+    @classmethod
+    def from_axioms(cls, axioms: Dict) -> "DimensionGraph":
+        """Baut den Graphen aus einem Axiom-Mapping"""
+        sections = [axioms["dimensions"], axioms.get("factors", {})] if "dimensions" in axioms else [axioms]
+        entries = {}
+        for section in sections:
+            if isinstance(section, list):
+                section = {entry["id"]: entry for entry in section}
+            entries.update(section)
+
+        graph = cls()
+        prefixes: Dict[str, List[str]] = {}
+        for name, entry in entries.items():
+            level = entry.get("level") if isinstance(entry, dict) else None
+            if level is None:
+                match = re.match(r"(\d+)D", name)
+                level = int(match.group(1)) if match else None
+            graph.add_node(name, level)
+            prefixes.setdefault(name.split("_")[0], []).append(name)
+
+        for name, entry in entries.items():
+            for dependency in (entry.get("depends_on", []) if isinstance(entry, dict) else []):
+                if dependency not in entries:
+                    candidates = prefixes.get(dependency, [])
+                    if len(candidates) != 1:
+                        graph.unknown.append(GraphViolation(
+                            "unknown_dependency", [name, dependency],
+                            f"{name} depends on unknown or ambiguous {dependency}"))
+                        continue
+                    dependency = candidates[0]
+                graph.add_dependency(name, dependency)
+        return graph
+
+    @classmethod
+    def from_file(cls, path: str) -> "DimensionGraph":
+        """Lädt ein Modell aus einer JSON- oder YAML-Datei"""
+        return cls.from_axioms(load_axioms_file(path))
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Stark zusammenhängende Komponenten (Tarjan, iterativ, O(V+E))"""
+        return [[self.nodes[v] for v in scc] for scc in self._tarjan()]
+
+    def _tarjan(self) -> List[List[int]]:
+        if self._sccs is not None:
+            return self._sccs
+        n = len(self.nodes)
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        sccs: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = lowlink[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                recurse = False
+                successors = self.edges[v]
+                while i < len(successors):
+                    w = successors[i]
+                    i += 1
+                    if index[w] == -1:
+                        work.append((v, i))
+                        work.append((w, 0))
+                        recurse = True
+                        break
+                    if on_stack[w]:
+                        lowlink[v] = min(lowlink[v], index[w])
+                if recurse:
+                    continue
+                if lowlink[v] == index[v]:
+                    scc = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        scc.append(w)
+                        if w == v:
+                            break
+                    sccs.append(scc)
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[v])
+
+        # Tarjan liefert Komponenten in umgekehrter topologischer Ordnung der
+        # Kondensation: Abhängigkeiten (Senken) zuerst
+        component = [0] * n
+        for c, scc in enumerate(sccs):
+            for v in scc:
+                component[v] = c
+        self._sccs, self._component = sccs, component
+        return sccs
+
+    def topological_order(self) -> Optional[List[str]]:
+        """Abhängigkeiten vor Abhängigen; None, falls der Graph Zyklen enthält"""
+        sccs = self._tarjan()
+        if any(len(scc) > 1 or scc[0] in self.edges[scc[0]] for scc in sccs):
+            return None
+        return [self.nodes[scc[0]] for scc in sccs]
+
+    def _transitive_closure(self) -> List[int]:
+        """Bitset der erreichbaren Knoten je Komponente der Kondensation"""
+        if self._closure is not None:
+            return self._closure
+        sccs = self._tarjan()
+        component = self._component
+        closure = [0] * len(sccs)
+        for c, scc in enumerate(sccs):  # Abhängigkeiten sind bereits berechnet
+            members = 0
+            for v in scc:
+                members |= 1 << v
+            reach = 0
+            for v in scc:
+                for w in self.edges[v]:
+                    d = component[w]
+                    reach |= closure[d] | (1 << w) if d != c else members
+            closure[c] = reach
+        self._closure = closure
+        return closure
+
+    def transitive_dependencies(self, name: str) -> List[str]:
+        """Alle Knoten, von denen name direkt oder indirekt abhängt"""
+        self._tarjan()
+        bits = self._transitive_closure()[self._component[self._index[name]]]
+        return [self.nodes[v] for v in range(len(self.nodes)) if bits >> v & 1]
+
+    def depends_on(self, name: str, dependency: str) -> bool:
+        """Hängt name (transitiv) von dependency ab? O(1) nach einmaliger Hülle"""
+        self._tarjan()
+        bits = self._transitive_closure()[self._component[self._index[name]]]
+        return bool(bits >> self._index[dependency] & 1)
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Kürzester Abhängigkeitspfad source -> ... -> target (BFS)"""
+        start, goal = self._index[source], self._index[target]
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            for w in self.edges[v]:
+                if w == goal:
+                    path = [self.nodes[w], self.nodes[v]]
+                    while parents[v] is not None:
+                        v = parents[v]
+                        path.append(self.nodes[v])
+                    return path[::-1]
+                if w not in parents:
+                    parents[w] = v
+                    queue.append(w)
+        return None
+
+    def find_cycles(self) -> List[GraphViolation]:
+        """Ein minimaler Zyklus je zyklischer Komponente"""
+        violations = []
+        for scc in self._tarjan():
+            if len(scc) == 1 and scc[0] not in self.edges[scc[0]]:
+                continue
+            node = self.nodes[min(scc)]
+            cycle = self.shortest_path(node, node)
+            violations.append(GraphViolation(
+                "cycle", cycle, f"Circular dependency: {' -> '.join(cycle)}"))
+        return violations
+
+    def hierarchy_violations(self) -> List[GraphViolation]:
+        """Kanten, bei denen eine Dimension von einer gleich hohen oder höheren abhängt"""
+        violations = []
+        for u, successors in enumerate(self.edges):
+            if self.levels[u] is None:
+                continue
+            for w in successors:
+                if self.levels[w] is not None and self.levels[w] >= self.levels[u]:
+                    violations.append(GraphViolation(
+                        "hierarchy", [self.nodes[u], self.nodes[w]],
+                        f"{self.nodes[u]} (level {self.levels[u]}) depends on "
+                        f"{self.nodes[w]} (level {self.levels[w]})"))
+        return violations
+
+    def validate(self) -> List[GraphViolation]:
+        """Alle Verletzungen: unbekannte Abhängigkeiten, Zyklen, Hierarchie"""
+        return self.unknown + self.find_cycles() + self.hierarchy_violations()
+
+
+def load_axioms_file(path: str) -> Dict:
+    """Lädt Axiome aus JSON (.json) oder YAML (.yaml/.yml, benötigt PyYAML)"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8") as f:
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as exc:
+                raise ImportError("Loading YAML axioms requires PyYAML (pip install pyyaml)") from exc
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+
+    if len(sys.argv) > 1:
+        graph = DimensionGraph.from_file(sys.argv[1])
+    else:
+        # Synthetisches Modell: 5.000 Dimensionen mit je bis zu 5 Abhängigkeiten
+        rng = random.Random(0)
+        model = {f"{i}D_dim{i}": {"depends_on": [f"{j}D_dim{j}" for j in rng.sample(range(1, i), min(i - 1, 5))]}
+                 for i in range(1, 5001)}
+        graph = DimensionGraph.from_axioms(model)
+
+    start = time.perf_counter()
+    violations = graph.validate()
+    graph.transitive_dependencies(graph.nodes[-1])
+    duration = time.perf_counter() - start
+    print(f"{len(graph.nodes)} nodes, {sum(map(len, graph.edges))} edges validated in {duration*1000:.1f} ms")
+    for violation in violations[:20]:
+        print(f"  [{violation.kind}] {violation.description}")
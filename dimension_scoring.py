@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Quantitative Scoring Engine for the 5 Intelligence Dimensions
+Maps system metrics and game outcomes to a numeric score per dimension
+
+Features (all in [0,1]):
+- authenticity, participation, transparency, hierarchy_defensivity  (feedback_loop.SystemMetrics)
+- cooperation_rate, cooperation_volatility                          (evolutionary game outcomes)
+
+Defensivity and volatility enter as openness = 1 - x and stability = 1 - x.
+Effectiveness (normalised to [0,1]), resilience and innovation potential are
+derived from the Resonance Formula. Each dimension score is a weighted mean of
+the available features, so systems with missing features (NaN / absent keys)
+are scored on what is known.
+
+Batch evaluation takes a systems × features matrix and scores, ranks and
+returns a whole portfolio in one vectorized call.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from resonance_formulas import REGISTRY, feedback_effectiveness
+
+FEATURES = (
+    "authenticity",
+    "participation",
+    "transparency",
+    "hierarchy_defensivity",
+    "cooperation_rate",
+    "cooperation_volatility",
+)
+
+DIMENSIONS = ("1D", "2D", "3D", "4D", "5D")
+
+# Weights over the transformed features; each dimension's weights sum to 1
+DEFAULT_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "1D": {"openness": 0.4, "participation": 0.2, "stability": 0.3, "resilience": 0.1},
+    "2D": {"authenticity": 0.5, "openness": 0.3, "participation": 0.2},
+    "3D": {"transparency": 0.35, "participation": 0.25, "cooperation_rate": 0.25, "effectiveness": 0.15},
+    "4D": {"innovation": 0.5, "authenticity": 0.15, "participation": 0.15, "cooperation_rate": 0.2},
+    "5D": {"resilience": 0.4, "stability": 0.3, "cooperation_rate": 0.3},
+}
+
+TERMS = ("authenticity", "participation", "transparency", "openness", "cooperation_rate",
+         "stability", "effectiveness", "resilience", "innovation")
+
+_EFFECTIVENESS_MAX = REGISTRY["feedback_loop"].bounds[1]
+
+
+def metrics_features(metrics) -> Dict[str, float]:
+    """Feature dict from a SystemMetrics-like object or mapping"""
+    if isinstance(metrics, Mapping):
+        return {name: metrics[name] for name in FEATURES if metrics.get(name) is not None}
+    return {name: getattr(metrics, name) for name in FEATURES if getattr(metrics, name, None) is not None}
+
+
+def game_features(env) -> Dict[str, float]:
+    """Game-outcome features from an evolutionary game environment's history"""
+    greens = [h["green_count"] / env.num_players for h in env.history]
+    second_half = greens[len(greens) // 2:] or greens
+    mean = sum(second_half) / len(second_half)
+    variance = sum((g - mean) ** 2 for g in second_half) / len(second_half)
+    return {"cooperation_rate": greens[-1], "cooperation_volatility": variance ** 0.5}
+
+
+def _terms(features: Mapping[str, float]) -> Dict[str, float]:
+    """Transformed scoring terms for one system (pure Python, NaN/absent = unknown)"""
+    def known(name):
+        value = features.get(name)
+        return value is not None and value == value
+
+    a, p, t, h = (features.get(name) for name in FEATURES[:4])
+    terms = {name: features[name] for name in ("authenticity", "participation", "transparency",
+                                                "cooperation_rate") if known(name)}
+    if known("hierarchy_defensivity"):
+        terms["openness"] = 1.0 - h
+    if known("cooperation_volatility"):
+        terms["stability"] = 1.0 - features["cooperation_volatility"]
+    if all(known(name) for name in FEATURES[:4]):
+        terms["effectiveness"] = min(1.0, feedback_effectiveness(a, p, t, h) / _EFFECTIVENESS_MAX)
+        terms["resilience"] = (a + p + t) / 3 * (1 - h)
+        terms["innovation"] = (a * p) * (1 - h)
+    return terms
+
+
+class DimensionScoringEngine:
+    """Scores systems per dimension from metrics and game outcomes"""
+
+    def __init__(self, weights: Optional[Mapping[str, Mapping[str, float]]] = None):
+        self.weights = {dim: dict(w) for dim, w in (weights or DEFAULT_WEIGHTS).items()}
+        # terms × dimensions weight matrix for batch scoring
+        self.weight_matrix = np.array([[self.weights[dim].get(term, 0.0) for dim in DIMENSIONS]
+                                       for term in TERMS])
+
+    def score(self, features: Mapping[str, float]) -> Dict[str, Optional[float]]:
+        """Scores for a single system; None where no relevant feature is known"""
+        terms = _terms(features)
+        scores = {}
+        for dim in DIMENSIONS:
+            total = weight_sum = 0.0
+            for term, weight in self.weights[dim].items():
+                if term in terms:
+                    total += weight * terms[term]
+                    weight_sum += weight
+            scores[dim] = total / weight_sum if weight_sum else None
+        return scores
+
+    def feature_matrix(self, systems: Sequence) -> np.ndarray:
+        """systems × FEATURES matrix from mappings or SystemMetrics objects (NaN = missing)"""
+        matrix = np.full((len(systems), len(FEATURES)), np.nan)
+        for i, system in enumerate(systems):
+            for name, value in metrics_features(system).items():
+                matrix[i, FEATURES.index(name)] = value
+        return matrix
+
+    def term_matrix(self, features: np.ndarray) -> np.ndarray:
+        """Vectorized transform of a systems × FEATURES matrix into systems × TERMS"""
+        a, p, t, h, cooperation, volatility = np.asarray(features, dtype=float).T
+        effectiveness = np.minimum(1.0, REGISTRY["feedback_loop"].kernel(a, p, t, h) / _EFFECTIVENESS_MAX)
+        openness = 1.0 - h
+        return np.column_stack([
+            a, p, t, openness, cooperation, 1.0 - volatility,
+            effectiveness, (a + p + t) / 3 * openness, (a * p) * openness,
+        ])
+
+    def score_matrix(self, features: np.ndarray) -> np.ndarray:
+        """systems × DIMENSIONS scores in one vectorized call (NaN where nothing is known)"""
+        terms = self.term_matrix(features)
+        known = ~np.isnan(terms)
+        numerator = np.where(known, terms, 0.0) @ self.weight_matrix
+        denominator = known @ self.weight_matrix
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(denominator > 0, numerator / denominator, np.nan)
+
+    def rank(self, names: Sequence[str], features: np.ndarray, by: str = "overall",
+             top: Optional[int] = None) -> List[Dict]:
+        """Rank a portfolio by overall (mean) score or by a single dimension"""
+        scores = self.score_matrix(features)
+        overall = np.nanmean(np.where(np.isnan(scores).all(axis=1, keepdims=True), 0.0, scores), axis=1)
+        key = overall if by == "overall" else scores[:, DIMENSIONS.index(by)]
+        order = np.argsort(-np.nan_to_num(key, nan=-np.inf), kind="stable")
+        if top is not None:
+            order = order[:top]
+        return [
+            {"rank": rank + 1, "system": names[i], "overall": float(overall[i]),
+             **{dim: float(scores[i, k]) for k, dim in enumerate(DIMENSIONS)}}
+            for rank, i in enumerate(order)
+        ]
+
+
+_default_engine: Optional[DimensionScoringEngine] = None
+
+
+def default_engine() -> DimensionScoringEngine:
+    """Process-wide engine with the default weights"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = DimensionScoringEngine()
+    return _default_engine
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    n = 100_000
+    portfolio = rng.random((n, len(FEATURES)))
+    names = [f"org-{i}" for i in range(n)]
+
+    engine = default_engine()
+    start = time.perf_counter()
+    ranking = engine.rank(names, portfolio, top=5)
+    duration = time.perf_counter() - start
+
+    print(f"Ranked {n:,} organisations in {duration*1000:.1f} ms. Top 5:")
+    for row in ranking:
+        print(f"  {row['rank']}. {row['system']}: overall {row['overall']:.3f} "
+              + " ".join(f"{dim}={row[dim]:.2f}" for dim in DIMENSIONS))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Feedback Ensemble - Vectorized Open/Closed System Dynamics
+K parameter sets advance in lockstep, one NumPy operation per update rule
+
+    params = parameter_arrays("open", candidates)            # candidates: (K, 4) array
+    trajectory = simulate("open", params, pressures)          # (T, 4, K)
+    scores = simulate_paths("open", pressure_matrix)          # (T, K): one path per pressure column
+    loss = simulate("open", params, pressures, observed=obs)  # (K,) mean squared error
+
+The update rules are exactly those of OpenSystem.iterate / ClosedSystem.iterate
+(same operation order, so a single default parameter set reproduces the scalar
+classes bit for bit). With observed=... the squared error against the observed
+series is accumulated while stepping, so no (T, 4, K) trajectory is stored;
+NaN entries in observed (missing survey waves or items) are ignored.
+
+State and trajectories are stored in precision.policy().state (float32 under
+the compact policy); the squared error is accumulated in float64.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from feedback_loop import ClosedSystemParameters, OpenSystemParameters
+from lazy_imports import lazy_import
+from precision import policy
+
+np = lazy_import("numpy")
+
+STATE_FIELDS = ("authenticity", "participation", "transparency", "hierarchy_defensivity")
+
+SYSTEMS = {
+    # system: (parameter dataclass, default initial state in STATE_FIELDS order)
+    "open": (OpenSystemParameters, (0.9, 0.85, 0.9, 0.1)),
+    "closed": (ClosedSystemParameters, (0.3, 0.2, 0.15, 0.85)),
+}
+
+
+def parameter_names(system: str) -> Tuple[str, ...]:
+    return tuple(field.name for field in fields(SYSTEMS[system][0]))
+
+
+def parameter_arrays(system: str, candidates) -> Dict[str, np.ndarray]:
+    """(K, d) candidate matrix -> {parameter name: (K,) array}"""
+    candidates = np.atleast_2d(np.asarray(candidates, dtype=float))
+    names = parameter_names(system)
+    if candidates.shape[1] != len(names):
+        raise ValueError(f"{system} system has {len(names)} parameters {names}, got {candidates.shape[1]}")
+    return {name: np.ascontiguousarray(candidates[:, i]) for i, name in enumerate(names)}
+
+
+def _open_step(state, p, pressure) -> None:
+    authenticity, participation, transparency, defensivity = state
+    learning_rate = p["learning_rate"]
+    defensivity += pressure * p["pressure_coupling"]
+    defensivity *= 1 - learning_rate * authenticity
+    np.minimum(participation + learning_rate * transparency, 1.0, out=participation)
+    np.minimum(authenticity + learning_rate * participation * p["authenticity_coupling"], 1.0, out=authenticity)
+    np.minimum(transparency + learning_rate * authenticity * p["transparency_coupling"], 1.0, out=transparency)
+
+
+def _closed_step(state, p, pressure) -> None:
+    authenticity, participation, transparency, defensivity = state
+    response = p["defensive_response"]
+    np.minimum(defensivity + pressure * response, 1.0, out=defensivity)
+    np.maximum(participation - response * defensivity, 0.0, out=participation)
+    np.maximum(authenticity - response * defensivity * p["authenticity_factor"], 0.0, out=authenticity)
+    np.maximum(transparency - response * defensivity * p["transparency_factor"], 0.0, out=transparency)
+
+
+_STEPS = {"open": _open_step, "closed": _closed_step}
+
+
+def simulate(system: str, params: Dict[str, np.ndarray], pressures: Sequence[float],
+             initial: Optional[Sequence[float]] = None, observed: Optional[np.ndarray] = None):
+    """Run K parameter sets over the pressure series
+
+    Returns the (T, 4, K) trajectory, or with observed (T, 4; NaN = missing)
+    the (K,) mean squared error over all observed entries.
+    """
+    step = _STEPS[system]
+    dtype = policy().state
+    params = {name: np.asarray(values, dtype=dtype) for name, values in params.items()}
+    k = len(next(iter(params.values())))
+    initial = SYSTEMS[system][1] if initial is None else initial
+    state = np.empty((4, k), dtype=dtype)
+    state[:] = np.asarray(initial, dtype=float)[:, None]
+    state = list(state)  # Row views, updated in place
+    pressures = np.asarray(pressures, dtype=float).tolist()
+
+    if observed is None:
+        trajectory = np.empty((len(pressures), 4, k), dtype=dtype)
+        for t, pressure in enumerate(pressures):
+            step(state, params, pressure)
+            for i in range(4):
+                trajectory[t, i] = state[i]
+        return trajectory
+
+    observed = np.asarray(observed, dtype=float)
+    if observed.shape != (len(pressures), 4):
+        raise ValueError(f"observed must have shape ({len(pressures)}, 4), got {observed.shape}")
+    seen = ~np.isnan(observed)
+    columns = [np.flatnonzero(row).tolist() for row in seen]
+    targets = observed.tolist()
+    error = np.zeros(k)
+    scratch = np.empty(k)
+    for t, pressure in enumerate(pressures):
+        step(state, params, pressure)
+        row = targets[t]
+        for i in columns[t]:
+            np.subtract(state[i], row[i], out=scratch)
+            scratch *= scratch
+            error += scratch
+    return error / max(1, int(seen.sum()))
+
+
+def simulate_paths(system: str, pressures, params=None, initial: Optional[Sequence[float]] = None,
+                   score: Optional[Callable[[list], np.ndarray]] = None) -> np.ndarray:
+    """Independent paths, one per column of a (T, K) pressure matrix, one shared parameter set
+
+    Returns the (T, K) series of score(state) (state = list of the four (K,)
+    rows in STATE_FIELDS order; default: hierarchy_defensivity).
+    """
+    params = params if params is not None else SYSTEMS[system][0]()
+    params = {name: getattr(params, name) for name in parameter_names(system)}
+    step = _STEPS[system]
+    dtype = policy().state
+    pressures = np.asarray(pressures, dtype=dtype)
+    steps, k = pressures.shape
+    initial = SYSTEMS[system][1] if initial is None else initial
+    state = np.empty((4, k), dtype=dtype)
+    state[:] = np.asarray(initial, dtype=float)[:, None]
+    state = list(state)
+    scores = np.empty((steps, k), dtype=dtype)
+    for t in range(steps):
+        step(state, params, pressures[t])
+        scores[t] = state[3] if score is None else score(state)
+    return scores
+
+
+def simulate_one(system: str, pressures: Sequence[float], params=None,
+                 initial: Optional[Sequence[float]] = None) -> np.ndarray:
+    """(T, 4) trajectory of a single parameter set (dataclass instance or None = defaults)"""
+    params = params if params is not None else SYSTEMS[system][0]()
+    candidate = [[getattr(params, name) for name in parameter_names(system)]]
+    return simulate(system, parameter_arrays(system, candidate), pressures, initial)[:, :, 0]
+
+
+if __name__ == "__main__":
+    import time
+
+    from feedback_loop import SimulationRunner
+
+    runner = SimulationRunner(iterations=10_000, seed=1)
+    pressures = runner.generate_external_pressures()
+    print("\n" + "="*70)
+    print(f"FEEDBACK ENSEMBLE - {len(pressures):,} steps")
+    print("="*70)
+    for system in SYSTEMS:
+        scalar = SimulationRunner(iterations=len(pressures))
+        model = scalar.open_system if system == "open" else scalar.closed_system
+        for i, pressure in enumerate(pressures):
+            model.iterate(i, pressure)
+        reference = np.array([[getattr(m, name) for name in STATE_FIELDS] for m in model.history])
+        print(f"  {system:<6} bit-exact with {type(model).__name__}: "
+              f"{np.array_equal(simulate_one(system, pressures), reference)}")
+    for k in (1, 100, 1_000, 10_000):
+        rng = np.random.default_rng(0)
+        candidates = rng.uniform(0.01, 0.5, (k, 4))
+        observed = simulate_one("open", pressures)
+        start = time.perf_counter()
+        simulate("open", parameter_arrays("open", candidates), pressures, observed=observed)
+        elapsed = time.perf_counter() - start
+        print(f"  open, K={k:>6,}: {elapsed:6.2f}s  ({elapsed / k * 1e3:8.3f} ms per parameter set)")
+    print("="*70 + "\n")
@@ -8,8 +8,12 @@ Operationalizing the Resonance Formula for Human Systems
 import numpy as np
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple
-import json
+from typing import Callable, List, Optional, Tuple
+
+import instrumentation
+from checkpointing import Checkpointer, Series, rng_state, set_rng_state
+from result_writers import ResultWriter, open_writer, write_json
+from resonance_formulas import feedback_effectiveness
 
 
 class SystemType(Enum):
@@ -38,9 +42,8 @@ class ResonanceFormula:
     @staticmethod
     def calculate_effectiveness(metrics: SystemMetrics) -> float:
         """Calculate system effectiveness using Resonance Formula"""
-        numerator = metrics.authenticity * metrics.participation * metrics.transparency
-        denominator = max(metrics.hierarchy_defensivity, 0.1)  # Avoid division by zero
-        return numerator / denominator
+        return feedback_effectiveness(metrics.authenticity, metrics.participation,
+                                      metrics.transparency, metrics.hierarchy_defensivity)
     
     @staticmethod
     def calculate_resilience(metrics: SystemMetrics) -> float:
@@ -56,34 +59,53 @@ class ResonanceFormula:
         return (metrics.authenticity * metrics.participation) * (1 - metrics.hierarchy_defensivity)
 
 
+@dataclass
+class OpenSystemParameters:
+    """Constants of the open-system dynamics (fit them with calibration.py)"""
+    learning_rate: float = 0.05          # Speed of feedback learning
+    pressure_coupling: float = 0.1       # External pressure -> defensivity
+    authenticity_coupling: float = 0.3   # Participation -> authenticity
+    transparency_coupling: float = 0.2   # Authenticity -> transparency
+
+
+@dataclass
+class ClosedSystemParameters:
+    """Constants of the closed-system dynamics (fit them with calibration.py)"""
+    defensive_response: float = 0.08     # Pressure -> defensivity, defensivity -> participation
+    authenticity_factor: float = 0.5     # Share of the response that erodes authenticity
+    transparency_factor: float = 0.3     # Share of the response that erodes transparency
+
+
 class OpenSystem:
     """Open system: Transparent, participatory, authentic feedback loops"""
     
     def __init__(self, initial_authenticity=0.9, initial_participation=0.85, 
-                 initial_transparency=0.9):
+                 initial_transparency=0.9, params: Optional[OpenSystemParameters] = None):
         self.authenticity = initial_authenticity
         self.participation = initial_participation
         self.transparency = initial_transparency
         self.hierarchy_defensivity = 0.1
+        self.params = params or OpenSystemParameters()
         self.history = []
         
     def iterate(self, iteration: int, external_pressure: float = 0.0) -> SystemMetrics:
         """Execute one timestep with learning and adaptation"""
         # Open systems learn and improve over time through feedback
-        learning_rate = 0.05
+        params = self.params
+        learning_rate = params.learning_rate
         
         # External pressure slightly increases defensivity but authentic dialogue recovers
-        self.hierarchy_defensivity += external_pressure * 0.1
+        self.hierarchy_defensivity += external_pressure * params.pressure_coupling
         self.hierarchy_defensivity *= (1 - learning_rate * self.authenticity)
         
         # Participation increases through consistent transparency
         self.participation = min(1.0, self.participation + learning_rate * self.transparency)
         
         # Authenticity slightly improves through iterative feedback
-        self.authenticity = min(1.0, self.authenticity + learning_rate * self.participation * 0.3)
+        self.authenticity = min(1.0, self.authenticity + learning_rate * self.participation * params.authenticity_coupling)
         
         # Transparency maintained through commitment to radikale transparenz
-        self.transparency = min(1.0, self.transparency + learning_rate * self.authenticity * 0.2)
+        self.transparency = min(1.0, self.transparency + learning_rate * self.authenticity * params.transparency_coupling)
         
         metrics = SystemMetrics(
             authenticity=self.authenticity,
@@ -100,17 +122,19 @@ class ClosedSystem:
     """Closed system: Defensive, hierarchical, opaque command-and-control"""
     
     def __init__(self, initial_authenticity=0.3, initial_participation=0.2, 
-                 initial_transparency=0.15):
+                 initial_transparency=0.15, params: Optional[ClosedSystemParameters] = None):
         self.authenticity = initial_authenticity
         self.participation = initial_participation
         self.transparency = initial_transparency
         self.hierarchy_defensivity = 0.85
+        self.params = params or ClosedSystemParameters()
         self.history = []
         
     def iterate(self, iteration: int, external_pressure: float = 0.0) -> SystemMetrics:
         """Execute one timestep with rigidity and decline"""
         # Closed systems respond to pressure with more defensivity
-        defensive_response = 0.08
+        params = self.params
+        defensive_response = params.defensive_response
         
         # External pressure increases defensivity significantly
         self.hierarchy_defensivity = min(1.0, self.hierarchy_defensivity + external_pressure * defensive_response)
@@ -119,10 +143,10 @@ class ClosedSystem:
         self.participation = max(0.0, self.participation - defensive_response * self.hierarchy_defensivity)
         
         # Low participation reduces authenticity (groupthink emerges)
-        self.authenticity = max(0.0, self.authenticity - defensive_response * self.hierarchy_defensivity * 0.5)
+        self.authenticity = max(0.0, self.authenticity - defensive_response * self.hierarchy_defensivity * params.authenticity_factor)
         
         # Defensivity increases opacity
-        self.transparency = max(0.0, self.transparency - defensive_response * self.hierarchy_defensivity * 0.3)
+        self.transparency = max(0.0, self.transparency - defensive_response * self.hierarchy_defensivity * params.transparency_factor)
         
         metrics = SystemMetrics(
             authenticity=self.authenticity,
@@ -136,65 +160,115 @@ class ClosedSystem:
 
 
 class SimulationRunner:
-    """Run comparative simulation: Open vs Closed systems"""
+    """Run comparative simulation: Open vs Closed systems
     
-    def __init__(self, iterations: int = 100):
+    seed=None draws from the global np.random state (as before); an integer seed
+    gives the runner its own RandomState, so runs are reproducible and resumable.
+    """
+    
+    def __init__(self, iterations: int = 100, seed: Optional[int] = None):
         self.iterations = iterations
+        self.rng = np.random if seed is None else np.random.RandomState(seed)
         self.formula = ResonanceFormula()
         self.open_system = OpenSystem()
         self.closed_system = ClosedSystem()
         self.external_pressures = []
+        self.open_records = []
+        self.closed_records = []
         
+    def _next_pressure(self) -> float:
+        """Draw the external pressure for the next timestep"""
+        # Base pressure + occasional shocks
+        base = 0.1
+        shock_probability = 0.1
+        shock = self.rng.choice([0, 0.3], p=[1-shock_probability, shock_probability])
+        pressure = base + shock + self.rng.normal(0, 0.05)
+        return max(0, min(pressure, 1.0))
+    
     def generate_external_pressures(self) -> List[float]:
         """Generate realistic external pressure scenarios"""
         # Stochastic shocks simulating crisis events
-        pressures = []
-        for i in range(self.iterations):
-            # Base pressure + occasional shocks
-            base = 0.1
-            shock_probability = 0.1
-            shock = np.random.choice([0, 0.3], p=[1-shock_probability, shock_probability])
-            pressure = base + shock + np.random.normal(0, 0.05)
-            pressures.append(max(0, min(pressure, 1.0)))
-        return pressures
-    
-    def run(self) -> dict:
-        """Execute full simulation"""
-        self.external_pressures = self.generate_external_pressures()
+        return [self._next_pressure() for _ in range(self.iterations)]
+    
+    def _record(self, metrics: SystemMetrics) -> dict:
+        return {
+            'iteration': metrics.iteration,
+            'authenticity': metrics.authenticity,
+            'participation': metrics.participation,
+            'transparency': metrics.transparency,
+            'hierarchy_defensivity': metrics.hierarchy_defensivity,
+            'effectiveness': self.formula.calculate_effectiveness(metrics),
+            'resilience': self.formula.calculate_resilience(metrics),
+            'innovation': self.formula.calculate_innovation_potential(metrics)
+        }
+    
+    def state(self) -> dict:
+        """Full simulator state for checkpointing (records are recomputed on restore)
+        
+        Pressures and metrics histories are Series, so a Checkpointer only
+        appends the steps since its last save.
+        """
+        return {
+            'step': len(self.external_pressures),
+            'rng': rng_state(self.rng),
+            'external_pressures': Series(self.external_pressures, 'float64'),
+            'open_system': _system_state(self.open_system),
+            'closed_system': _system_state(self.closed_system),
+        }
+    
+    def load_state(self, state: dict) -> None:
+        set_rng_state(self.rng, state['rng'])
+        self.external_pressures = state['external_pressures'].tolist()
+        _load_system_state(self.open_system, state['open_system'])
+        _load_system_state(self.closed_system, state['closed_system'])
+        self.open_records = [self._record(m) for m in self.open_system.history]
+        self.closed_records = [self._record(m) for m in self.closed_system.history]
+    
+    def run(self, writer: Optional[ResultWriter] = None, checkpoint: Optional[Checkpointer] = None,
+            resume: bool = False, progress: Optional[Callable[[int, int], None]] = None,
+            progress_every: int = 1000) -> dict:
+        """Execute full simulation
         
-        open_metrics_list = []
-        closed_metrics_list = []
+        If a writer is given, every per-iteration record is also streamed to it
+        with an additional 'system' field ("open" / "closed"). With a checkpoint,
+        the state is saved whenever checkpoint.due(); resume=True continues from
+        an existing checkpoint file bit-exactly (a resumed run streams only the
+        records after the checkpoint, whose 'step' is the number already done).
+        progress(done, total) is called every progress_every steps.
+        """
+        if resume and checkpoint is not None and checkpoint.exists():
+            self.load_state(checkpoint.load())
+        else:
+            self.external_pressures = []
+            self.open_records = []
+            self.closed_records = []
+        open_metrics_list = self.open_records
+        closed_metrics_list = self.closed_records
         
-        for i in range(self.iterations):
+        inst = instrumentation.ACTIVE
+        for i in range(len(self.external_pressures), self.iterations):
+            if inst:
+                t = inst.now()
+            pressure = self._next_pressure()
+            self.external_pressures.append(pressure)
             # Iterate both systems
-            open_metrics = self.open_system.iterate(i, self.external_pressures[i])
-            closed_metrics = self.closed_system.iterate(i, self.external_pressures[i])
+            open_metrics = self.open_system.iterate(i, pressure)
+            closed_metrics = self.closed_system.iterate(i, pressure)
+            if inst:
+                t = inst.lap("feedback.iterate", t)
             
-            # Calculate effectiveness
-            open_effectiveness = self.formula.calculate_effectiveness(open_metrics)
-            closed_effectiveness = self.formula.calculate_effectiveness(closed_metrics)
-            
-            open_metrics_list.append({
-                'iteration': i,
-                'authenticity': open_metrics.authenticity,
-                'participation': open_metrics.participation,
-                'transparency': open_metrics.transparency,
-                'hierarchy_defensivity': open_metrics.hierarchy_defensivity,
-                'effectiveness': open_effectiveness,
-                'resilience': self.formula.calculate_resilience(open_metrics),
-                'innovation': self.formula.calculate_innovation_potential(open_metrics)
-            })
-            
-            closed_metrics_list.append({
-                'iteration': i,
-                'authenticity': closed_metrics.authenticity,
-                'participation': closed_metrics.participation,
-                'transparency': closed_metrics.transparency,
-                'hierarchy_defensivity': closed_metrics.hierarchy_defensivity,
-                'effectiveness': closed_effectiveness,
-                'resilience': self.formula.calculate_resilience(closed_metrics),
-                'innovation': self.formula.calculate_innovation_potential(closed_metrics)
-            })
+            # Calculate effectiveness, resilience, innovation
+            open_metrics_list.append(self._record(open_metrics))
+            closed_metrics_list.append(self._record(closed_metrics))
+            if writer:
+                writer.write({'system': 'open', **open_metrics_list[-1]})
+                writer.write({'system': 'closed', **closed_metrics_list[-1]})
+            if checkpoint is not None and checkpoint.due(i + 1):
+                checkpoint.save(self.state(), i + 1)
+            if progress is not None and (i + 1) % progress_every == 0:
+                progress(i + 1, self.iterations)
+            if inst:
+                inst.lap("feedback.score", t)
         
         return {
             'open_system': open_metrics_list,
@@ -203,6 +277,24 @@ class SimulationRunner:
         }
 
 
+_SYSTEM_FIELDS = ('authenticity', 'participation', 'transparency', 'hierarchy_defensivity')
+
+
+def _system_state(system) -> dict:
+    """Scalar variables plus the metrics history as columns"""
+    return {
+        **{name: getattr(system, name) for name in _SYSTEM_FIELDS},
+        'history': Series(system.history, {name: 'float64' for name in _SYSTEM_FIELDS}),
+    }
+
+
+def _load_system_state(system, state: dict) -> None:
+    for name in _SYSTEM_FIELDS:
+        setattr(system, name, state[name])
+    columns = [state['history'][name].tolist() for name in _SYSTEM_FIELDS]
+    system.history = [SystemMetrics(a, p, t, h, i) for i, (a, p, t, h) in enumerate(zip(*columns))]
+
+
 def analyze_results(results: dict) -> dict:
     """Analyze and compare simulation results"""
     open_data = results['open_system']
@@ -290,10 +382,27 @@ def print_results(analysis: dict) -> None:
     print("="*70 + "\n")
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    """Run the open vs. closed comparison and save the analysis
+    
+    Optional: python feedback_loop.py <trajectory.ndjson|.ndjson.gz|.npz>
+    streams the per-iteration records of both systems to that file.
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Feedback loop: open vs. closed systems")
+    parser.add_argument("trajectory", nargs="?",
+                        help="Stream the per-iteration records to .ndjson, .ndjson.gz or .npz")
+    args = parser.parse_args(argv)
+    
     # Run simulation
     runner = SimulationRunner(iterations=100)
-    results = runner.run()
+    if args.trajectory:
+        with open_writer(args.trajectory, background=True) as writer:
+            results = runner.run(writer)
+        print(f"Trajectory ({writer.records_written} records) saved to {args.trajectory}")
+    else:
+        results = runner.run()
     
     # Analyze results
     analysis = analyze_results(results)
@@ -302,7 +411,10 @@ if __name__ == "__main__":
     print_results(analysis)
     
     # Save results to JSON
-    with open('simulation_results.json', 'w') as f:
-        json.dump(analysis, f, indent=2)
+    write_json('simulation_results.json', analysis)
     
     print("✅ Simulation complete. Results saved to simulation_results.json")
+
+
+if __name__ == "__main__":
+    main()
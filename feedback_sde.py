@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Feedback-Loop SDE - Continuous-Time Stochastic Variant of Open/Closed Systems
+Vectorized Euler-Maruyama / Milstein paths with reflecting boundaries and quantile bands
+
+    bands = simulate_sde("open", paths=100_000, t_end=100, sigma=0.03, seed=0)
+    bands.bands[k, 3]     # quantiles of hierarchy_defensivity at bands.times[k]
+
+State x = (authenticity, participation, transparency, hierarchy_defensivity) in
+[0, 1]^4. The drift is the one-step increment of OpenSystem.iterate /
+ClosedSystem.iterate (one iteration = one time unit), evaluated simultaneously
+for all four variables; the min/max clamps of the maps become reflecting
+boundaries at 0 and 1. Each variable gets its own Brownian noise:
+
+    dx_i = f_i(x, P(t)) dt + sigma_i g(x_i) dW_i
+    g = 1 (noise="additive") or g = sqrt(x (1 - x)) (noise="jacobi", vanishes at the boundaries)
+
+P(t) is a constant pressure (default: the mean of generate_external_pressures,
+0.13) or a per-time-unit series, e.g. SimulationRunner.generate_external_pressures().
+
+Step control: before each step the drift error is estimated by step doubling
+(one Euler step vs. two half steps) on the current ensemble, and dt is shrunk
+or grown to keep it below tol. The step is also capped so that sigma sqrt(dt)
+stays small against the unit interval. Since dt is chosen before the Brownian
+increment is drawn, the scheme stays non-anticipating and rejected steps need
+no Brownian bridge. Steps never cross output times or, for pressure series,
+integer times.
+
+Quantile bands: at every output time each variable's cross-section is binned
+into a fixed histogram over [0, 1] (bins=2000, resolution 5e-4). Histograms of
+successive chunks of paths are summed, so memory is independent of the path
+count and no path is ever stored; quantiles are read from the cumulative
+histogram with linear interpolation inside a bin.
+
+Paths are stored in precision.policy().state (float32 under the compact
+policy; the Brownian increments are drawn in float64 and rounded into it);
+the mean / std sums are accumulated in float64.
+
+    python feedback_sde.py [--system open] [--paths 100000] [--t-end 100] [--sigma 0.03]
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Union
+
+from feedback_ensemble import STATE_FIELDS, SYSTEMS
+from lazy_imports import lazy_import
+from precision import policy
+
+np = lazy_import("numpy")
+
+MEAN_PRESSURE = 0.1 + 0.1 * 0.3  # Base + shock probability x shock of SimulationRunner._next_pressure
+
+
+def _open_drift(x, params, pressure):
+    authenticity, participation, transparency, defensivity = x
+    rate = params.learning_rate
+    return np.stack([
+        rate * participation * params.authenticity_coupling,
+        rate * transparency,
+        rate * authenticity * params.transparency_coupling,
+        (defensivity + pressure * params.pressure_coupling) * (1 - rate * authenticity) - defensivity,
+    ])
+
+
+def _closed_drift(x, params, pressure):
+    defensivity = x[3]
+    response = params.defensive_response
+    erosion = response * defensivity
+    return np.stack([
+        -erosion * params.authenticity_factor,
+        -erosion,
+        -erosion * params.transparency_factor,
+        np.broadcast_to(np.asarray(pressure * response, dtype=defensivity.dtype), defensivity.shape),
+    ])
+
+
+DRIFTS = {"open": _open_drift, "closed": _closed_drift}
+
+
+def reflect(x):
+    """Reflect values at 0 and 1 (in place); overshoots beyond a full interval are clipped"""
+    np.abs(x, out=x)
+    np.minimum(x, 2.0 - x, out=x)
+    np.maximum(x, 0.0, out=x)
+    return x
+
+
+@dataclass
+class SDEBands:
+    """Quantile bands (and mean / std) of the path ensemble at the output times"""
+    system: str
+    times: np.ndarray        # (M,)
+    quantiles: np.ndarray    # (Q,)
+    bands: np.ndarray        # (M, 4, Q) in STATE_FIELDS order
+    mean: np.ndarray         # (M, 4)
+    std: np.ndarray          # (M, 4)
+    paths: int
+    steps: int               # Accepted steps (summed over chunks)
+    rejected: int            # Rejected step-size proposals
+    seconds: float
+
+    def band(self, field: str):
+        """(M, Q) quantiles of one state variable"""
+        return self.bands[:, STATE_FIELDS.index(field)]
+
+
+def _histogram_quantiles(histogram, quantiles):
+    """(..., bins) counts -> (..., Q) quantiles over [0, 1], linear inside a bin"""
+    bins = histogram.shape[-1]
+    cumulative = np.cumsum(histogram, axis=-1)
+    total = cumulative[..., -1:]
+    targets = np.asarray(quantiles) * total
+    flat_cumulative = cumulative.reshape(-1, bins)
+    flat_targets = targets.reshape(-1, len(quantiles))
+    result = np.empty_like(flat_targets, dtype=float)
+    for row, (counts, wanted) in enumerate(zip(flat_cumulative, flat_targets)):
+        index = np.minimum(np.searchsorted(counts, wanted, side="left"), bins - 1)
+        below = np.where(index > 0, counts[index - 1], 0)
+        inside = np.maximum(counts[index] - below, 1)
+        result[row] = (index + np.clip((wanted - below) / inside, 0, 1)) / bins
+    return result.reshape(targets.shape)
+
+
+def simulate_sde(system: str = "open", paths: int = 100_000, t_end: float = 100.0, params=None,
+                 sigma: Union[float, Sequence[float]] = 0.03, pressure: Union[float, Sequence[float],
+                 Callable[[float], float]] = MEAN_PRESSURE, initial: Optional[Sequence[float]] = None,
+                 scheme: str = "milstein", noise: str = "jacobi", tol: float = 1e-3, dt_max: float = 1.0,
+                 dt_min: float = 1e-4, output_every: float = 1.0,
+                 quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95), chunk_size: int = 100_000,
+                 bins: int = 2000, seed: Optional[int] = None) -> SDEBands:
+    """Integrate `paths` SDE paths in chunks and return their quantile bands"""
+    if scheme not in ("euler", "milstein"):
+        raise ValueError(f"Unknown scheme {scheme!r} (use euler or milstein)")
+    if noise not in ("additive", "jacobi"):
+        raise ValueError(f"Unknown noise {noise!r} (use additive or jacobi)")
+    start = time.perf_counter()
+    drift = DRIFTS[system]
+    params = params if params is not None else SYSTEMS[system][0]()
+    initial = np.asarray(SYSTEMS[system][1] if initial is None else initial, dtype=float)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float), (4,)).reshape(4, 1)
+    dtype = policy().state
+    if callable(pressure):
+        pressure_at, integer_steps = pressure, False
+    elif np.ndim(pressure) == 0:
+        pressure_at, integer_steps = (lambda t, value=float(pressure): value), False
+    else:
+        series = np.asarray(pressure, dtype=float)
+        pressure_at, integer_steps = (lambda t: float(series[min(int(t), len(series) - 1)])), True
+    # Keep the noise of one step well inside the unit interval
+    dt_noise = (0.25 / sigma.max()) ** 2 if sigma.max() > 0 else dt_max
+    sigma = sigma.astype(dtype)
+    times = np.arange(0.0, t_end + 1e-12, output_every)
+    histograms = np.zeros((len(times), 4, bins), dtype=np.int64)
+    sums = np.zeros((len(times), 4))
+    squares = np.zeros((len(times), 4))
+    rng = np.random.default_rng(seed)
+    steps = rejected = 0
+
+    def record(k, x):
+        index = np.minimum((x * bins).astype(np.int64), bins - 1)
+        offsets = np.arange(4)[:, None] * bins
+        histograms[k] += np.bincount((index + offsets).ravel(), minlength=4 * bins).reshape(4, bins)
+        sums[k] += x.sum(axis=1, dtype=np.float64)
+        squares[k] += np.einsum("ij,ij->i", x, x, dtype=np.float64)
+
+    for offset in range(0, paths, chunk_size):
+        n = min(chunk_size, paths - offset)
+        x = np.repeat(initial.astype(dtype)[:, None], n, axis=1)
+        record(0, x)
+        t, dt, k = 0.0, min(dt_max, output_every), 1
+        while k < len(times):
+            # Step-size control on the drift (before the noise is drawn)
+            p = pressure_at(t)
+            f = drift(x, params, p)
+            while True:
+                limit = times[k] - t
+                if integer_steps:
+                    limit = min(limit, math.floor(t + 1e-12) + 1 - t)
+                h = float(min(dt, limit, dt_noise))
+                # Two half steps minus one full step = h/2 (f(x + h/2 f) - f(x))
+                half = x + 0.5 * h * f
+                difference = drift(half, params, pressure_at(t + 0.5 * h)) - f
+                error = 0.5 * h * float(max(difference.max(), -difference.min())) if n else 0.0
+                factor = 0.9 * math.sqrt(tol / error) if error > 0 else 2.0
+                if error <= tol or h <= dt_min:
+                    break
+                rejected += 1
+                dt = max(dt_min, h * max(0.2, factor))
+            dW = rng.standard_normal((4, n)).astype(dtype, copy=False)
+            dW *= math.sqrt(h)
+            f *= h
+            if noise == "additive":
+                dW *= sigma
+            else:
+                if scheme == "milstein":  # 0.5 sigma^2 g g' (dW^2 - dt) with g g' = (1 - 2x) / 2
+                    f += 0.25 * sigma * sigma * (1 - 2 * x) * (dW * dW - h)
+                dW *= sigma * np.sqrt(np.maximum(x * (1 - x), 0.0))
+            x += f
+            x += dW
+            reflect(x)
+            t += h
+            steps += 1
+            if abs(t - times[k]) < 1e-9:
+                t = times[k]
+                record(k, x)
+                k += 1
+            if h == dt:  # Only a step the controller chose itself may grow the proposal
+                dt = min(dt_max, h * min(2.0, factor))
+
+    mean = sums / paths
+    std = np.sqrt(np.maximum(squares / paths - mean ** 2, 0.0))
+    return SDEBands(system, times, np.asarray(quantiles, dtype=float),
+                    _histogram_quantiles(histograms, quantiles), mean, std, paths, steps, rejected,
+                    time.perf_counter() - start)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stochastic feedback-loop paths with quantile bands")
+    parser.add_argument("--system", choices=sorted(SYSTEMS), default="open")
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--t-end", type=float, default=100.0)
+    parser.add_argument("--sigma", type=float, default=0.03, help="Noise amplitude of every variable")
+    parser.add_argument("--scheme", choices=("euler", "milstein"), default="milstein")
+    parser.add_argument("--noise", choices=("additive", "jacobi"), default="jacobi")
+    parser.add_argument("--tol", type=float, default=1e-3, help="Local drift error per step")
+    parser.add_argument("--dt-max", type=float, default=1.0)
+    parser.add_argument("--output-every", type=float, default=1.0, help="Spacing of the band time grid")
+    parser.add_argument("--pressure-series", action="store_true",
+                        help="Drive with one generate_external_pressures() series instead of the mean")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pressure = MEAN_PRESSURE
+    if args.pressure_series:
+        from feedback_loop import SimulationRunner
+        pressure = SimulationRunner(iterations=int(math.ceil(args.t_end)), seed=args.seed).generate_external_pressures()
+    result = simulate_sde(args.system, args.paths, args.t_end, sigma=args.sigma, pressure=pressure,
+                          scheme=args.scheme, noise=args.noise, tol=args.tol, dt_max=args.dt_max,
+                          output_every=args.output_every, seed=args.seed)
+
+    print("\n" + "="*78)
+    print(f"FEEDBACK SDE - {args.system} system, {result.paths:,} paths, t = 0..{args.t_end:g}, "
+          f"{args.scheme}/{args.noise}, sigma {args.sigma}")
+    print(f"  {result.steps:,} steps ({result.rejected} rejected), {result.seconds:.2f}s")
+    print("="*78)
+    levels = "  ".join(f"q{q*100:02.0f}" for q in result.quantiles)
+    for field in STATE_FIELDS:
+        print(f"\n  {field:<22} {'t':>6}   {levels}    mean")
+        band = result.band(field)
+        for k in np.unique(np.linspace(0, len(result.times) - 1, 6).astype(int)):
+            values = "  ".join(f"{v:.3f}" for v in band[k])
+            print(f"  {'':<22} {result.times[k]:6.1f}   {values}   {result.mean[k, STATE_FIELDS.index(field)]:.3f}")
+    print("\n" + "="*78 + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hot-Path Instrumentation & Profiling Hooks
+Opt-in phase timers and counters with near-zero overhead when disabled
+
+Hot paths mark phase boundaries with laps on the active collector:
+
+    inst = instrumentation.ACTIVE
+    if inst:
+        t = inst.now()
+    ...                                   # phase 1
+    if inst:
+        t = inst.lap("game.play", t)
+    ...                                   # phase 2
+    if inst:
+        inst.lap("game.update", t)
+
+While instrumentation is disabled (the default) ACTIVE is None and each probe
+costs one truth test. Coarser code can use the timer("name") context manager
+and count("name"). Enable it around a run:
+
+    with instrumentation.instrumented() as inst:
+        SimulationRunner(iterations=100).run()
+    inst.export_json("timings.json")
+    inst.export_chrome_trace("trace.json")   # open in chrome://tracing or Perfetto
+
+Command line - wrap any entry point ("module" runs it as __main__, or "module:function"):
+
+    python instrumentation.py [--profile | --sample] [--trace trace.json]
+                              [--timings timings.json] [--output report.txt] TARGET
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class _NullTimer:
+    """Shared no-op context manager used while instrumentation is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("inst", "name", "start")
+
+    def __init__(self, inst: "Instrumentation", name: str):
+        self.inst = inst
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.inst.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Instrumentation:
+    """Collects phase timings, counters and (optionally) trace events"""
+
+    def __init__(self, record_events: bool = True, max_events: int = 1_000_000):
+        self.record_events = record_events
+        self.max_events = max_events
+        self.timings: Dict[str, List[int]] = {}  # name -> [calls, total_ns, min_ns, max_ns]
+        self.counters: Counter = Counter()
+        self.events: List[tuple] = []
+        self.dropped_events = 0
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    now = staticmethod(time.perf_counter_ns)
+
+    def timer(self, name: str) -> _Timer:
+        return _Timer(self, name)
+
+    def lap(self, name: str, start_ns: int) -> int:
+        """Record the phase that started at start_ns; return the end time for the next lap"""
+        end_ns = time.perf_counter_ns()
+        self.record(name, start_ns, end_ns)
+        return end_ns
+
+    def record(self, name: str, start_ns: int, end_ns: int) -> None:
+        duration = end_ns - start_ns
+        with self._lock:
+            stats = self.timings.get(name)
+            if stats is None:
+                self.timings[name] = [1, duration, duration, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                if duration < stats[2]:
+                    stats[2] = duration
+                if duration > stats[3]:
+                    stats[3] = duration
+            if self.record_events:
+                if len(self.events) < self.max_events:
+                    self.events.append((name, start_ns, duration, threading.get_ident()))
+                else:
+                    self.dropped_events += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def summary(self) -> Dict:
+        """Per-phase statistics in milliseconds plus counters"""
+        phases = {}
+        for name, (calls, total, low, high) in sorted(self.timings.items()):
+            phases[name] = {
+                "calls": calls,
+                "total_ms": total / 1e6,
+                "mean_ms": total / calls / 1e6,
+                "min_ms": low / 1e6,
+                "max_ms": high / 1e6,
+            }
+        return {"phases": phases, "counters": dict(self.counters), "dropped_events": self.dropped_events}
+
+    def export_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def chrome_trace(self) -> Dict:
+        """Trace-event format (complete events + final counter values)"""
+        pid = os.getpid()
+        events = [
+            {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+             "ts": (start - self.origin_ns) / 1e3, "dur": duration / 1e3}
+            for name, start, duration, tid in self.events
+        ]
+        end_ts = max((e["ts"] + e["dur"] for e in events), default=0.0)
+        events += [
+            {"name": name, "ph": "C", "pid": pid, "tid": 0, "ts": end_ts, "args": {"value": value}}
+            for name, value in self.counters.items()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        print("\n" + "="*70)
+        print("INSTRUMENTATION SUMMARY")
+        print("="*70)
+        for name, stats in summary["phases"].items():
+            print(f"  {name:<28} {stats['calls']:>9} calls  {stats['total_ms']:>10.2f} ms total  "
+                  f"{stats['mean_ms']*1e3:>9.2f} µs mean")
+        for name, value in summary["counters"].items():
+            print(f"  {name:<28} {value:>9}")
+        print("="*70 + "\n")
+
+
+ACTIVE: Optional[Instrumentation] = None  # Hot paths test this directly
+
+
+def timer(name: str):
+    """Phase timer; a shared no-op while instrumentation is disabled"""
+    if ACTIVE is None:
+        return _NULL_TIMER
+    return ACTIVE.timer(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a counter if instrumentation is enabled"""
+    if ACTIVE is not None:
+        ACTIVE.count(name, n)
+
+
+def enable(record_events: bool = True, max_events: int = 1_000_000) -> Instrumentation:
+    global ACTIVE
+    ACTIVE = Instrumentation(record_events, max_events)
+    return ACTIVE
+
+
+def disable() -> Optional[Instrumentation]:
+    global ACTIVE
+    inst, ACTIVE = ACTIVE, None
+    return inst
+
+
+@contextmanager
+def instrumented(record_events: bool = True, max_events: int = 1_000_000):
+    """Enable instrumentation for the duration of a with-block"""
+    global ACTIVE
+    previous = ACTIVE
+    inst = enable(record_events, max_events)
+    try:
+        yield inst
+    finally:
+        ACTIVE = previous
+
+
+class SamplingProfiler:
+    """Low-overhead statistical profiler: samples the target thread's stack periodically"""
+
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.self_samples: Counter = Counter()
+        self.total_samples: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            seen = set()
+            top = True
+            while frame is not None:
+                code = frame.f_code
+                key = f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+                if top:
+                    self.self_samples[key] += 1
+                    top = False
+                if key not in seen:
+                    self.total_samples[key] += 1
+                    seen.add(key)
+                frame = frame.f_back
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def report(self, limit: int = 30) -> str:
+        lines = [f"Sampling profile: {self.samples} samples every {self.interval*1e3:.1f} ms",
+                 f"{'self %':>8} {'total %':>8}  function"]
+        for key, hits in self.total_samples.most_common(limit):
+            share = 100.0 / max(self.samples, 1)
+            lines.append(f"{self.self_samples[key]*share:8.1f} {hits*share:8.1f}  {key}")
+        return "\n".join(lines)
+
+
+def profile_call(func: Callable, *args, sampler: bool = False, output: Optional[str] = None,
+                 interval: float = 0.001, **kwargs):
+    """Run func under cProfile (default) or the sampling profiler and write a report"""
+    if sampler:
+        profiler = SamplingProfiler(interval).start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.stop()
+        report = profiler.report()
+    else:
+        profiler = cProfile.Profile()
+        try:
+            result = profiler.runcall(func, *args, **kwargs)
+        finally:
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(30)
+            report = stream.getvalue()
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(report)
+    else:
+        print(report)
+    return result
+
+
+def resolve_target(target: str) -> Callable[[], object]:
+    """'module' -> run as __main__, 'module:function' -> call function()"""
+    module_name, _, function_name = target.partition(":")
+    if not function_name:
+        return lambda: runpy.run_module(module_name, run_name="__main__", alter_sys=True)
+    import importlib
+    obj = importlib.import_module(module_name)
+    for attribute in function_name.split("."):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Instrument and profile any entry point")
+    parser.add_argument("target", help="'module' (run as __main__) or 'module:function'")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--profile", action="store_true", help="Wrap the run in cProfile")
+    mode.add_argument("--sample", action="store_true", help="Wrap the run in the sampling profiler")
+    parser.add_argument("--output", help="Write the profiler report to this file")
+    parser.add_argument("--trace", help="Write phase timings as a Chrome trace-event JSON")
+    parser.add_argument("--timings", help="Write the phase timing summary as JSON")
+    args = parser.parse_args(argv)
+
+    func = resolve_target(args.target)
+    sys.argv = [args.target]
+    with instrumented(record_events=bool(args.trace)) as inst:
+        try:
+            if args.profile or args.sample:
+                profile_call(func, sampler=args.sample, output=args.output)
+            else:
+                func()
+        except SystemExit:
+            pass
+    inst.print_summary()
+    if args.trace:
+        inst.export_chrome_trace(args.trace)
+        print(f"Chrome trace written to {args.trace}")
+    if args.timings:
+        inst.export_json(args.timings)
+        print(f"Timings written to {args.timings}")
+
+
+if __name__ == "__main__":
+    # Simulators import "instrumentation", not "__main__": enable that module's state
+    import instrumentation
+    instrumentation.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lazy Imports
+Defer heavy dependencies (NumPy) until first use, so light commands start fast
+
+    np = lazy_import("numpy")   # proxy; numpy is imported on first np.<attr>
+
+Modules that only need NumPy inside functions bind it this way at the top. Type
+annotations that mention np.* must not be evaluated at import time, so those
+modules also use `from __future__ import annotations`.
+
+The proxy is local to the modules that hold it: sys.modules is left alone, so
+every plain `import numpy` elsewhere is a normal import. The first attribute
+access imports the module through importlib (whose per-module import lock
+makes this safe from several threads, e.g. the chunked_kernels pool) and copies
+its namespace into the proxy, so later lookups are ordinary attribute reads.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+
+class _LazyModule(ModuleType):
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __getattr__(self, attribute: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return module `name`, or a proxy that imports it on first attribute access"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
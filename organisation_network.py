@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Organisation Network - Many Open/Closed Organisations Coupled on a Sparse Graph
+Members migrate towards more effective neighbours; shocks are shared across nodes
+
+    network = OrganisationNetwork(Graph.erdos_renyi(100_000, 8, seed=0), open_fraction=0.3, seed=0)
+    history = network.run(200)        # one summary dict per step
+    network.members, network.state    # (N,) member mass, (4, N) state in STATE_FIELDS order
+
+Every node is an organisation with the state of an OpenSystem or ClosedSystem
+(authenticity, participation, transparency, hierarchy_defensivity) and a member
+mass. Its type is fixed. One step:
+
+1. Pressures: node i gets base + shock_i * shock + noise_i, clipped to [0, 1]
+   (the marginal distribution of SimulationRunner._next_pressure). Shocks come
+   from a common crisis hitting every node plus independent local shocks. The
+   noise is a mix of one common and one local Gaussian. `correlation` moves
+   both from independent (0) to fully shared (1).
+2. Dynamics: the open and closed nodes advance with the update rules of
+   feedback_ensemble (OpenSystem.iterate / ClosedSystem.iterate), vectorized
+   over all nodes of a type.
+3. Migration: effectiveness E = A·P·T / max(H, 0.1) (ResonanceFormula.
+   calculate_effectiveness, via the registry's vectorized kernel). Along every
+   edge i -> j a share
+       rate / deg_i * max(E_j - E_i, 0) / (E_j + E_i)
+   of i's members moves to j. At most `rate` of a node's members leave per step,
+   and the total member mass is conserved. Migrants bring their authenticity,
+   participation and transparency along: the receiving node's values become the
+   member-weighted mean. Defensivity belongs to the organisation and stays.
+
+All per-step work is O(N + edges). Migration is a handful of scatter-adds
+(np.bincount) over the CSR edge list of payoff_engine.Graph, i.e. sparse
+matrix-vector products, so 10^5 organisations take a few tens of milliseconds
+per step.
+
+The (4, N) state follows precision.policy().state (float32 under the compact
+policy); member mass and migration flows stay float64, so the total member
+mass is conserved to float64 rounding under either policy.
+
+    python organisation_network.py [--nodes 100000] [--degree 8] [--steps 100] [--correlation 0.5]
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from feedback_ensemble import STATE_FIELDS, SYSTEMS, _STEPS, parameter_names
+from lazy_imports import lazy_import
+from payoff_engine import Graph
+from precision import policy
+from resonance_formulas import REGISTRY
+
+np = lazy_import("numpy")
+
+
+@dataclass
+class CorrelatedPressure:
+    """Per-node external pressures with the marginals of SimulationRunner._next_pressure"""
+    base: float = 0.1
+    shock: float = 0.3
+    shock_probability: float = 0.1
+    noise: float = 0.05
+    correlation: float = 0.5   # 0: independent nodes, 1: every node sees the same pressure
+
+    def sample(self, rng, nodes: int) -> np.ndarray:
+        # Common crisis with probability c*q; local shocks fill up to the marginal q
+        common_probability = self.correlation * self.shock_probability
+        local_probability = 1 - (1 - self.shock_probability) / (1 - common_probability)
+        shocks = rng.random(nodes) < local_probability
+        if rng.random() < common_probability:
+            shocks[:] = True
+        noise = math.sqrt(self.correlation) * rng.normal() + math.sqrt(1 - self.correlation) * rng.normal(size=nodes)
+        pressures = self.base + self.shock * shocks + self.noise * noise
+        return np.clip(pressures, 0.0, 1.0, out=pressures)
+
+
+def _mean(values) -> float:
+    return float(values.mean(dtype=np.float64)) if len(values) else 0.0
+
+
+class OrganisationNetwork:
+    """Open and closed organisations on a graph, coupled by member migration"""
+
+    def __init__(self, graph: Graph, open_fraction: float = 0.5, open_mask=None, members=None,
+                 migration_rate: float = 0.05, pressure: Optional[CorrelatedPressure] = None,
+                 open_params=None, closed_params=None, seed: Optional[int] = None):
+        self.graph = graph
+        self.rng = np.random.default_rng(seed)
+        n = graph.size
+        if open_mask is None:
+            open_mask = self.rng.random(n) < open_fraction
+        self.open_mask = np.asarray(open_mask, dtype=bool)
+        self.open_nodes = np.flatnonzero(self.open_mask)
+        self.closed_nodes = np.flatnonzero(~self.open_mask)
+        self.members = np.ones(n) if members is None else np.array(members, dtype=float)
+        self.migration_rate = migration_rate
+        self.pressure = pressure if pressure is not None else CorrelatedPressure()
+        self.params = {}
+        for system, params in (("open", open_params), ("closed", closed_params)):
+            params = params if params is not None else SYSTEMS[system][0]()
+            self.params[system] = {name: getattr(params, name) for name in parameter_names(system)}
+        self.state = np.empty((4, n), dtype=policy().state)
+        self.state[:, self.open_mask] = np.asarray(SYSTEMS["open"][1])[:, None]
+        self.state[:, ~self.open_mask] = np.asarray(SYSTEMS["closed"][1])[:, None]
+        # Directed edge list i -> j of the CSR graph, reused every step
+        degrees = graph.degrees()
+        self.sources = np.repeat(np.arange(n), degrees)
+        self.targets = graph.indices
+        self.source_share = migration_rate / degrees[self.sources]
+        self.iteration = 0
+        self.history: List[Dict[str, float]] = []
+        self._effectiveness = REGISTRY["feedback_loop"].kernel
+
+    def effectiveness(self) -> np.ndarray:
+        return self._effectiveness(*self.state)
+
+    def _advance(self, pressures) -> None:
+        for system, nodes in (("open", self.open_nodes), ("closed", self.closed_nodes)):
+            if len(nodes):
+                block = self.state[:, nodes]
+                _STEPS[system](list(block), self.params[system], pressures[nodes].astype(block.dtype, copy=False))
+                self.state[:, nodes] = block
+
+    def _migrate(self, effectiveness) -> float:
+        n = self.graph.size
+        gain = effectiveness[self.targets]
+        gain -= effectiveness[self.sources]
+        # Members only move uphill: at most half of the directed edges carry flow
+        uphill = np.flatnonzero(gain > 0)
+        sources, targets, gain = self.sources[uphill], self.targets[uphill], gain[uphill]
+        flow = np.divide(gain, effectiveness[targets] + effectiveness[sources], dtype=np.float64)
+        flow *= self.source_share[uphill]
+        flow *= self.members[sources]
+        outflow = np.bincount(sources, weights=flow, minlength=n)
+        inflow = np.bincount(targets, weights=flow, minlength=n)
+        staying = self.members - outflow
+        members = staying + inflow
+        for row in range(3):  # Migrants carry their dispositions; defensivity stays with the node
+            carried = np.bincount(targets, weights=flow * self.state[row, sources], minlength=n)
+            mixed = self.state[row] * staying
+            mixed += carried
+            np.divide(mixed, members, out=self.state[row], where=members > 0)
+        self.members = members
+        return float(flow[self.open_mask[targets] & ~self.open_mask[sources]].sum())
+
+    def step(self) -> Dict[str, float]:
+        self._advance(self.pressure.sample(self.rng, self.graph.size))
+        effectiveness = self.effectiveness()
+        to_open = self._migrate(effectiveness)
+        total = self.members.sum()
+        open_members = self.members[self.open_nodes].sum()
+        summary = {
+            "iteration": self.iteration,
+            "open_member_share": float(open_members / total),
+            "closed_to_open_flow": to_open / total,
+            "effectiveness_open": _mean(effectiveness[self.open_nodes]),
+            "effectiveness_closed": _mean(effectiveness[self.closed_nodes]),
+            "defensivity_closed": _mean(self.state[3, self.closed_nodes]),
+            "authenticity_closed": _mean(self.state[0, self.closed_nodes]),
+        }
+        self.history.append(summary)
+        self.iteration += 1
+        return summary
+
+    def run(self, steps: int) -> List[Dict[str, float]]:
+        for _ in range(steps):
+            self.step()
+        return self.history
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Open/closed organisations coupled by member migration")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--degree", type=float, default=8, help="Mean degree of the Erdős-Rényi graph")
+    parser.add_argument("--ring", action="store_true", help="Ring lattice instead of a random graph")
+    parser.add_argument("--open-fraction", type=float, default=0.3)
+    parser.add_argument("--migration-rate", type=float, default=0.05)
+    parser.add_argument("--correlation", type=float, default=0.5, help="Shock correlation across nodes")
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    graph = (Graph.ring(args.nodes, int(args.degree)) if args.ring
+             else Graph.erdos_renyi(args.nodes, args.degree, seed=args.seed))
+    network = OrganisationNetwork(graph, args.open_fraction, migration_rate=args.migration_rate,
+                                  pressure=CorrelatedPressure(correlation=args.correlation), seed=args.seed)
+    built = time.perf_counter() - start
+    members = network.members.sum()
+    start = time.perf_counter()
+    history = network.run(args.steps)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "="*70)
+    print(f"ORGANISATION NETWORK - {args.nodes:,} organisations, {len(network.targets) // 2:,} links, "
+          f"{len(network.open_nodes) / args.nodes:.0%} open")
+    print(f"  graph built in {built:.2f}s, {args.steps} steps in {elapsed:.2f}s "
+          f"({elapsed / args.steps * 1e3:.1f} ms per step)")
+    print("="*70)
+    print(f"  {'step':>5}  {'open share':>10}  {'closed->open':>12}  {'E open':>7}  {'E closed':>8}  "
+          f"{'H closed':>8}  {'A closed':>8}")
+    for record in history[::max(1, args.steps // 10)] + history[-1:]:
+        print(f"  {record['iteration']:5d}  {record['open_member_share']:10.3f}  "
+              f"{record['closed_to_open_flow']:12.5f}  {record['effectiveness_open']:7.3f}  "
+              f"{record['effectiveness_closed']:8.3f}  {record['defensivity_closed']:8.3f}  "
+              f"{record['authenticity_closed']:8.3f}")
+    print(f"\n  member mass conserved: {math.isclose(network.members.sum(), members, rel_tol=1e-9)}")
+    print(f"  state within [0, 1]:   {bool(((network.state >= 0) & (network.state <= 1)).all())}")
+    print("="*70 + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
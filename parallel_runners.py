@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parallel Runners - Multi-Process Replicates on Shared-Memory Buffers
+SimulationRunner, OpenSystemEnvironment and HumanPopulationModel across worker processes
+
+    results = feedback_replicates(range(64), iterations=1000, workers=4)
+    greens = game_replicates(range(256), num_rounds=200, defectors=0.2, workers=4)   # (rounds, R) green counts
+    curves, final_trust = population_curves(HumanPopulationModel(size=10_000), 20, workers=4)
+
+Each runner puts its inputs (pressure series, seeds, trait matrices) into a
+SharedArrays set once and allocates the history buffers there. Workers fill
+disjoint column slices (one column per replicate or human) in place. Only
+specs, slice bounds and the odd scalar cross the process boundary; the
+returned arrays are copies taken before the shared blocks are unlinked.
+
+Results do not depend on the worker count:
+- Feedback replicates equal SimulationRunner(iterations, seed=s).run() bit
+  for bit. Pressures are drawn in the parent with the runner's own RandomState,
+  and the columns advance with the vectorized feedback_ensemble rules.
+- Game replicates equal OpenSystemEnvironment(seed=s).run() bit for bit,
+  started (like simulation_service's game job) with the first
+  round(defectors * num_players) players RED.
+- The population equals the serial HumanPopulationModel.run().
+
+The feedback state and history buffers and the population's acceptance and
+trust buffers follow precision.policy().state (float32 under the compact
+policy; bit-exactness with the serial runs holds for the reference one).
+
+    python parallel_runners.py [--workers 4]
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, Tuple
+
+from feedback_ensemble import STATE_FIELDS, SYSTEMS, _STEPS, parameter_names
+from lazy_imports import lazy_import
+from precision import policy
+from resonance_formulas import REGISTRY
+from shared_arrays import SharedArrays
+
+np = lazy_import("numpy")
+
+FEEDBACK_FIELDS = STATE_FIELDS + ("effectiveness",)
+
+
+# --- SimulationRunner ---
+
+def _feedback_columns(arrays, start, stop):
+    pressures = arrays["pressures"][:, start:stop]
+    history = arrays["history"]
+    pressures = pressures.astype(history.dtype, copy=False)
+    effectiveness = REGISTRY["feedback_loop"].kernel
+    for s, system in enumerate(SYSTEMS):
+        defaults = SYSTEMS[system][0]()
+        params = {name: getattr(defaults, name) for name in parameter_names(system)}
+        state = np.empty((4, stop - start), dtype=history.dtype)
+        state[:] = np.asarray(SYSTEMS[system][1], dtype=float)[:, None]
+        rows = list(state)
+        step = _STEPS[system]
+        for t in range(len(pressures)):
+            step(rows, params, pressures[t])
+            history[t, s, :4, start:stop] = state
+            history[t, s, 4, start:stop] = effectiveness(*rows)
+
+
+def feedback_replicates(seeds: Iterable[int], iterations: int = 100, workers: int = 1) -> Dict[str, np.ndarray]:
+    """Open and closed trajectories of one SimulationRunner per seed
+
+    Returns {'open_system': (T, 5, R), 'closed_system': (T, 5, R),
+    'external_pressures': (T, R)} with the fields in FEEDBACK_FIELDS order.
+    """
+    from feedback_loop import SimulationRunner
+
+    seeds = list(seeds)
+    with SharedArrays() as shared:
+        pressures = shared.create("pressures", (iterations, len(seeds)))
+        for r, seed in enumerate(seeds):
+            pressures[:, r] = SimulationRunner(iterations, seed=seed).generate_external_pressures()
+        history = shared.create("history", (iterations, len(SYSTEMS), len(FEEDBACK_FIELDS), len(seeds)),
+                                policy().state)
+        shared.map(_feedback_columns, len(seeds), workers)
+        results = {f"{system}_system": history[:, s].copy() for s, system in enumerate(SYSTEMS)}
+        results["external_pressures"] = pressures.copy()
+        return results
+
+
+# --- OpenSystemEnvironment ---
+
+def _game_columns(arrays, start, stop, num_players, num_rounds, resonance, event_driven, defectors):
+    from evolutionary_game_theory import OpenSystemEnvironment, PlayerStrategy
+
+    greens = arrays["greens"]
+    reds = round(defectors * num_players)
+    for r in range(start, stop):
+        env = OpenSystemEnvironment(num_players, num_rounds, seed=int(arrays["seeds"][r]))
+        env.players = [PlayerStrategy.DEFECT] * reds + [PlayerStrategy.COOPERATE] * (num_players - reds)
+        history = env.run(resonance, event_driven=event_driven)
+        greens[:len(history), r] = [record["green_count"] for record in history]
+
+
+def game_replicates(seeds: Iterable[int], num_players: int = 50, num_rounds: int = 100, resonance: bool = True,
+                    event_driven: bool = True, defectors: float = 0.0, workers: int = 1) -> np.ndarray:
+    """(rounds, R) green counts of one seeded OpenSystemEnvironment per seed
+
+    defectors: initial RED share (all-GREEN is absorbing, so 0.0 gives constant columns)
+    """
+    seeds = np.asarray(list(seeds), dtype=np.int64)
+    with SharedArrays() as shared:
+        shared.put("seeds", seeds)
+        greens = shared.create("greens", (num_rounds, len(seeds)), np.int64)
+        shared.map(_game_columns, len(seeds), workers,
+                   args=(num_players, num_rounds, resonance, event_driven, defectors))
+        return greens.copy()
+
+
+# --- HumanPopulationModel ---
+
+def _population_columns(arrays, start, stop, scenario, iterations):
+    from ai_human_interaction_test import SCENARIOS, HumanAgent, HumanPopulationModel, TrustDistributionModel
+
+    _, ai = SCENARIOS[scenario]()
+    traits, acceptance, final_trust = arrays["traits"], arrays["acceptance"], arrays["final_trust"]
+    for i in range(start, stop):
+        human = HumanAgent(f"#{i}", **dict(zip(HumanPopulationModel.TRAITS, traits[:, i].tolist())))
+        history = TrustDistributionModel(human, ai).run(iterations)
+        acceptance[:, i] = [record["acceptance_probability"] for record in history]
+        final_trust[i] = history[-1]["human_trust"]
+
+
+def population_curves(model, iterations: int = 20, workers: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """(iterations, size) expected acceptance curves and (size,) final trust of every human"""
+    humans = model.sample_humans()
+    with SharedArrays() as shared:
+        shared.put("traits", [[getattr(human, trait) for human in humans] for trait in model.TRAITS])
+        acceptance = shared.create("acceptance", (iterations, model.size), policy().state)
+        final_trust = shared.create("final_trust", model.size, policy().state)
+        shared.map(_population_columns, model.size, workers, args=(model.scenario, iterations))
+        return acceptance.copy(), final_trust.copy()
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    from ai_human_interaction_test import HumanPopulationModel
+    from evolutionary_game_theory import OpenSystemEnvironment, PlayerStrategy
+    from feedback_loop import SimulationRunner
+
+    parser = argparse.ArgumentParser(description="Multi-process replicates on shared-memory buffers")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*70)
+    print(f"PARALLEL RUNNERS - shared-memory buffers, {args.workers} workers")
+    print("="*70)
+
+    start = time.perf_counter()
+    results = feedback_replicates(range(64), iterations=1_000, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    reference = SimulationRunner(1_000, seed=5).run()
+    exact = all(np.array_equal(results[f"{system}_system"][:, :, 5],
+                               [[record[field] for field in FEEDBACK_FIELDS] for record in reference[f"{system}_system"]])
+                for system in SYSTEMS)
+    print(f"  SimulationRunner       64 x 1,000 steps  {elapsed:5.2f}s  bit-exact with serial run: {exact}")
+
+    start = time.perf_counter()
+    # Imitation from a 20% RED start, so the columns actually evolve (and differ between seeds)
+    greens = game_replicates(range(128), num_rounds=200, resonance=False, defectors=0.2, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    env = OpenSystemEnvironment(50, 200, seed=7)
+    env.players = [PlayerStrategy.DEFECT] * 10 + [PlayerStrategy.COOPERATE] * 40
+    history = env.run(False, event_driven=True)
+    exact = np.array_equal(greens[:, 7], [record["green_count"] for record in history])
+    print(f"  OpenSystemEnvironment 128 x 200 rounds  {elapsed:5.2f}s  bit-exact with serial run: {exact} "
+          f"({len(np.unique(greens))} distinct green counts)")
+
+    model = HumanPopulationModel(size=2_000, seed=0)
+    start = time.perf_counter()
+    parallel = model.run(20, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"  HumanPopulationModel  2,000 humans      {elapsed:5.2f}s  equal to serial run: {parallel == model.run(20)}")
+    print("="*70 + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
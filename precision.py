@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precision - Global Dtype Policy for the Vectorized Engines
+float64 reference storage or compact float32 state / uint8 strategies
+
+    from precision import policy, use_policy
+    with use_policy("compact"):                 # or RESONANCE_DTYPE=compact in the environment
+        trajectory = simulate("open", params, pressures)   # float32 (T, 4, K)
+    policy().state, policy().strategy, policy().accumulator
+
+Policies:
+- reference: float64 state and histories, int64 strategy codes (the default;
+  results are bit for bit those of the code before the policy existed)
+- compact:   float32 state and histories, uint8 strategy codes
+
+Accumulations (losses, sums, means, histogram counts, member mass) always use
+policy().accumulator = float64. Engines read the policy when they allocate
+their arrays: feedback_ensemble (simulate, simulate_paths and hence
+calibration and rare_events), feedback_sde, organisation_network,
+payoff_engine (and so OpenSystemEnvironment), chunked_kernels.LargePopulation
+(LargeGame already stores uint8 codes), the AI-human population
+(HumanPopulationModel), parallel_runners and the alien batch
+(analyze_alien_population). Random draws stay float64 and are rounded into
+the state, so both policies see the same random stream, and the accuracy
+check below compares them path by path. Worker processes started with fork
+inherit the policy; spawned ones read RESONANCE_DTYPE.
+
+    python precision.py      # accuracy of compact vs. reference for every engine (also in run_all_tests)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Union
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+@dataclass(frozen=True)
+class DtypePolicy:
+    """Storage dtypes of the vectorized engines"""
+    name: str
+    state: str                  # Continuous state, trajectories, history buffers
+    strategy: str               # Discrete strategy codes (0 GREEN / 1 RED)
+    accumulator: str = "float64"  # Sums, means and losses
+
+
+POLICIES = {
+    "reference": DtypePolicy("reference", "float64", "int64"),
+    "compact": DtypePolicy("compact", "float32", "uint8"),
+}
+
+
+def _lookup(name: Union[str, DtypePolicy]) -> DtypePolicy:
+    if isinstance(name, DtypePolicy):
+        return name
+    if name not in POLICIES:
+        raise ValueError(f"Unknown dtype policy {name!r} (available: {', '.join(POLICIES)})")
+    return POLICIES[name]
+
+
+_active = _lookup(os.environ.get("RESONANCE_DTYPE", "reference"))
+
+
+def policy() -> DtypePolicy:
+    return _active
+
+
+def set_policy(name: Union[str, DtypePolicy]) -> DtypePolicy:
+    """Activate a policy globally; returns the previous one"""
+    global _active
+    previous, _active = _active, _lookup(name)
+    return previous
+
+
+@contextmanager
+def use_policy(name: Union[str, DtypePolicy]) -> Iterator[DtypePolicy]:
+    previous = set_policy(name)
+    try:
+        yield _active
+    finally:
+        set_policy(previous)
+
+
+# --- Accuracy of compact vs. reference ---
+# The checks switch the policy of the imported precision module, which is the
+# one the engines read (under `python precision.py` this file is __main__).
+
+def _state_itemsize() -> int:
+    import precision
+    return np.dtype(precision.policy().state).itemsize
+
+
+def _compare(run, tolerance, exact=False):
+    """Run under both policies; returns (deviation, tolerance, passed, timings, nbytes)"""
+    import precision
+
+    results, timings, sizes = {}, {}, {}
+    run()  # Warm-up (imports, first-touch allocations), so the timings compare like with like
+    for name in ("reference", "compact"):
+        with precision.use_policy(name):
+            start = time.perf_counter()
+            results[name], sizes[name] = run()
+            timings[name] = time.perf_counter() - start
+    reference, compact = results["reference"], results["compact"]
+    if exact:
+        deviation = 0.0 if all(np.array_equal(a, b) for a, b in zip(reference, compact)) else float("inf")
+    else:
+        deviation = max(float(np.max(np.abs(np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64))))
+                        for a, b in zip(reference, compact))
+    return deviation, tolerance, deviation <= tolerance, timings, sizes
+
+
+def _feedback_ensemble():
+    from feedback_ensemble import parameter_arrays, simulate, simulate_one
+    from feedback_loop import SimulationRunner
+
+    pressures = SimulationRunner(iterations=1_000, seed=1).generate_external_pressures()
+    candidates = np.random.default_rng(0).uniform(0.01, 0.3, (2_000, 4))
+    params = parameter_arrays("open", candidates)
+    trajectory = simulate("open", params, pressures)
+    closed = simulate("closed", parameter_arrays("closed", candidates[:, :3]), pressures)
+    loss = simulate("open", params, pressures, observed=simulate_one("open", pressures))
+    return (trajectory, closed, loss), trajectory.nbytes + closed.nbytes
+
+
+def _feedback_sde():
+    from feedback_sde import simulate_sde
+
+    bands = simulate_sde("open", paths=20_000, t_end=30, seed=0)
+    return (bands.bands, bands.mean), 4 * 20_000 * _state_itemsize()
+
+
+def _organisation_network():
+    from organisation_network import OrganisationNetwork
+    from payoff_engine import Graph
+
+    network = OrganisationNetwork(Graph.erdos_renyi(20_000, 8, seed=0), open_fraction=0.3, seed=0)
+    history = network.run(50)
+    return ([list(record.values()) for record in history], network.state), network.state.nbytes
+
+
+def _game():
+    from evolutionary_game_theory import OpenSystemEnvironment, PlayerStrategy
+    from payoff_engine import Graph
+
+    histories, size = [], 0
+    for graph in (None, Graph.ring(500, 4)):
+        env = OpenSystemEnvironment(500, 30, seed=3, graph=graph)
+        env.players = [PlayerStrategy.DEFECT if r < 0.4 else PlayerStrategy.COOPERATE
+                       for r in np.random.default_rng(1).random(500)]
+        env.run(False)
+        histories.append([record["green_count"] for record in env.history])
+        size += env._engine.codes.nbytes
+    return histories, size
+
+
+def _large_population():
+    from chunked_kernels import ChunkedPool, LargePopulation
+
+    with ChunkedPool(2, seed=0) as pool:
+        population = LargePopulation("learning", 200_000, pool=pool)
+        history = population.run(20)
+    return ([list(record.values()) for record in history],), population.traits.nbytes * 7 // 5
+
+
+def _human_population():
+    from ai_human_interaction_test import HumanPopulationModel
+
+    model = HumanPopulationModel("learning", 2_000, seed=0)
+    result = model.run(20)
+    quantiles = [*result["acceptance_rate_quantiles"].values(), *result["final_trust_quantiles"].values()]
+    summary = [result["mean_acceptance_rate"], result["mean_final_trust"], *result["mean_acceptance_curve"]]
+    return (summary, quantiles), (20 + 1) * model.size * _state_itemsize()  # Curves + final trust
+
+
+def _alien_batch():
+    from alien_intelligence_test import analyze_alien_population
+
+    result = analyze_alien_population(1_000_000, seed=0)
+    return ([value for value in result.values()],), 4 * 1_000_000 * _state_itemsize()
+
+
+CHECKS = (
+    # (engine, run, tolerance on the max abs deviation, exact)
+    ("feedback_ensemble (state, loss)", _feedback_ensemble, 1e-4, False),
+    ("feedback_sde (quantile bands)", _feedback_sde, 2e-3, False),
+    ("organisation_network", _organisation_network, 1e-4, False),
+    ("OpenSystemEnvironment (payoff_engine)", _game, 0.0, True),
+    ("chunked_kernels.LargePopulation", _large_population, 1e-4, False),
+    ("HumanPopulationModel (curves, trust)", _human_population, 1e-6, False),
+    ("alien batch (analyze_alien_population)", _alien_batch, 1e-4, False),
+)
+
+
+def main() -> int:
+    print("\n" + "="*86)
+    print("REDUCED PRECISION - compact (float32 / uint8) vs. reference (float64 / int64)")
+    print("="*86)
+    print(f"  {'engine':<40} {'max |dev|':>10} {'tolerance':>10} {'memory':>8} {'time':>7}")
+    passed = True
+    for name, run, tolerance, exact in CHECKS:
+        deviation, tolerance, ok, timings, sizes = _compare(run, tolerance, exact)
+        passed &= ok
+        label = "exact" if exact and ok else f"{deviation:.1e}"
+        print(f"  {name:<40} {label:>10} {tolerance:>10.0e} {sizes['compact'] / sizes['reference']:>7.0%} "
+              f"{timings['compact'] / timings['reference']:>6.0%}  {'✓' if ok else '✗'}")
+    print("\n  memory / time: compact relative to reference (state arrays; wall time of the whole run)")
+    print("="*86 + "\n")
+    return 0 if passed else 1
+
+
+def run_test() -> None:
+    """Entry point for run_all_tests, which only fails on exceptions / SystemExit"""
+    code = main()
+    if code:
+        raise SystemExit(code)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
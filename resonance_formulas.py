@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resonance Formula Registry
+Single definition of every resonance-formula variant used in this repository
+
+Each variant is defined once, as a vectorized NumPy kernel plus a scalar wrapper
+for per-step simulation code. The scalar wrappers evaluate in exactly the same
+operation order as the original inline code, so simulation results are unchanged.
+
+Variants:
+- consistency:        R = T·F·O / (1 + H)                          (consistency_check)
+- feedback_loop:      E = A·P·T / max(H, 0.1)                      (feedback_loop.ResonanceFormula)
+- alien:              R = T·F·O / (H + 0.1)                        (alien_intelligence_test)
+- pattern_complexity: C = D·X / (E + 0.1)                          (alien_intelligence_test)
+- ai_human:           R = min(1, A·T·M / max(0.1, 1 - (V + T)/2))  (ai_human_interaction_test)
+
+NumPy is imported lazily: the scalar wrappers never load it.
+
+Run this module to microbenchmark the kernels against their scalar wrappers.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+@dataclass(frozen=True)
+class FormulaVariant:
+    """A resonance-formula variant with its kernels and expected properties"""
+    name: str
+    expression: str
+    parameters: Tuple[str, ...]
+    kernel: Callable[..., np.ndarray]  # Vectorized: one array per parameter
+    scalar: Callable[..., float]       # Plain floats, for per-step code
+    bounds: Tuple[float, float]        # Range on the unit cube [0,1]^n
+    increasing: Tuple[str, ...] = ()
+    decreasing: Tuple[str, ...] = ()
+
+
+# --- consistency_check: R = T·F·O / (1 + H) ---
+
+def _consistency_kernel(t, f, o, h):
+    r = t * f
+    r *= o
+    r /= 1.0 + h
+    return r
+
+
+def _consistency_scalar(t: float, f: float, o: float, h: float) -> float:
+    return (t * f * o) / (1 + h)
+
+
+# --- feedback_loop: E = A·P·T / max(H, 0.1) ---
+
+def _feedback_loop_kernel(a, p, t, h):
+    r = a * p
+    r *= t
+    r /= np.maximum(h, 0.1)
+    return r
+
+
+def _feedback_loop_scalar(a: float, p: float, t: float, h: float) -> float:
+    numerator = a * p * t
+    denominator = max(h, 0.1)  # Avoid division by zero
+    return numerator / denominator
+
+
+# --- alien_intelligence_test: R = T·F·O / (H + 0.1) ---
+
+def _alien_kernel(t, f, o, h):
+    r = t * f
+    r *= o
+    r /= h + 0.1
+    return r
+
+
+def _alien_scalar(t: float, f: float, o: float, h: float) -> float:
+    return (t * f * o) / (h + 0.1)
+
+
+def _pattern_complexity_kernel(density, x_dimension, entropy):
+    r = density * x_dimension
+    r /= entropy + 0.1
+    return r
+
+
+def _pattern_complexity_scalar(density: float, x_dimension: float, entropy: float) -> float:
+    return (density * x_dimension) / (entropy + 0.1)
+
+
+# --- ai_human_interaction_test: R = min(1, A·T·M / max(0.1, 1 - (V + T)/2)) ---
+
+def _ai_human_kernel(a, t, m, v):
+    opacity = np.maximum(0.1, 1.0 - (v + t) / 2.0)
+    r = a * t
+    r *= m
+    r /= opacity
+    return np.minimum(1.0, r)
+
+
+def _ai_human_scalar(a: float, t: float, m: float, v: float) -> float:
+    opacity_factor = max(0.1, 1.0 - (v + t) / 2.0)
+    resonance = (a * t * m) / opacity_factor
+    return min(1.0, resonance)  # Normalize to 0-1
+
+
+REGISTRY: Dict[str, FormulaVariant] = {
+    variant.name: variant for variant in (
+        FormulaVariant(
+            name="consistency",
+            expression="T·F·O / (1 + H)",
+            parameters=("T", "F", "O", "H"),
+            kernel=_consistency_kernel,
+            scalar=_consistency_scalar,
+            bounds=(0.0, 1.0),
+            increasing=("T", "F", "O"),
+            decreasing=("H",),
+        ),
+        FormulaVariant(
+            name="feedback_loop",
+            expression="A·P·T / max(H, 0.1)",
+            parameters=("A", "P", "T", "H"),
+            kernel=_feedback_loop_kernel,
+            scalar=_feedback_loop_scalar,
+            bounds=(0.0, 10.0),
+            increasing=("A", "P", "T"),
+            decreasing=("H",),
+        ),
+        FormulaVariant(
+            name="alien",
+            expression="T·F·O / (H + 0.1)",
+            parameters=("T", "F", "O", "H"),
+            kernel=_alien_kernel,
+            scalar=_alien_scalar,
+            bounds=(0.0, 10.0),
+            increasing=("T", "F", "O"),
+            decreasing=("H",),
+        ),
+        FormulaVariant(
+            name="pattern_complexity",
+            expression="D·X / (E + 0.1)",
+            parameters=("D", "X", "E"),
+            kernel=_pattern_complexity_kernel,
+            scalar=_pattern_complexity_scalar,
+            bounds=(0.0, 10.0),
+            increasing=("D", "X"),
+            decreasing=("E",),
+        ),
+        FormulaVariant(
+            name="ai_human",
+            expression="min(1, A·T·M / max(0.1, 1 - (V + T)/2))",
+            parameters=("A", "T", "M", "V"),
+            kernel=_ai_human_kernel,
+            scalar=_ai_human_scalar,
+            bounds=(0.0, 1.0),
+            increasing=("A", "T", "M", "V"),
+        ),
+    )
+}
+
+# Scalar entry points used by the simulators
+consistency_resonance = _consistency_scalar
+feedback_effectiveness = _feedback_loop_scalar
+alien_resonance = _alien_scalar
+pattern_complexity = _pattern_complexity_scalar
+ai_human_resonance = _ai_human_scalar
+
+_jit_cache: Dict[str, Callable[..., np.ndarray]] = {}
+
+
+def get_kernel(name: str, jit: Optional[bool] = None) -> Callable[..., np.ndarray]:
+    """Return the vectorized kernel for a variant.
+
+    With jit=True (or RESONANCE_JIT=1 in the environment) and numba installed, the
+    scalar wrapper is compiled into a fused ufunc; otherwise the NumPy kernel is used.
+    """
+    variant = REGISTRY[name]
+    if jit is None:
+        jit = os.environ.get("RESONANCE_JIT") == "1"
+    if not jit:
+        return variant.kernel
+    if name not in _jit_cache:
+        try:
+            import numba
+        except ImportError:
+            _jit_cache[name] = variant.kernel
+        else:
+            signature = "float64(" + ", ".join(["float64"] * len(variant.parameters)) + ")"
+            _jit_cache[name] = numba.vectorize([signature], nopython=True)(variant.scalar)
+    return _jit_cache[name]
+
+
+def benchmark(n: int = 1_000_000, repeats: int = 5, scalar_n: int = 100_000, seed: int = 0) -> Dict:
+    """Microbenchmark every variant: vectorized kernel vs. scalar wrapper (ns per point)"""
+    import time
+
+    rng = np.random.default_rng(seed)
+    results = {}
+    for name, variant in REGISTRY.items():
+        args = rng.random((len(variant.parameters), n))
+        kernel = get_kernel(name)
+        kernel(*args)  # Warm-up
+
+        kernel_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            kernel(*args)
+            kernel_times.append(time.perf_counter() - start)
+
+        scalar_args = args[:, :scalar_n].T.tolist()
+        scalar = variant.scalar
+        start = time.perf_counter()
+        for point in scalar_args:
+            scalar(*point)
+        scalar_time = time.perf_counter() - start
+
+        results[name] = {
+            "kernel_ns_per_point": min(kernel_times) / n * 1e9,
+            "scalar_ns_per_point": scalar_time / scalar_n * 1e9,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("RESONANCE FORMULA REGISTRY - MICROBENCHMARK")
+    print("="*70)
+    for name, timing in benchmark().items():
+        print(f"  {name:<20} kernel: {timing['kernel_ns_per_point']:7.2f} ns/point   "
+              f"scalar: {timing['scalar_ns_per_point']:7.1f} ns/point   "
+              f"({REGISTRY[name].expression})")
+    print("="*70 + "\n")
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Result Cache - Content-Addressed Storage for Simulation Results
+Key = SHA-256 of (model, code version, parameters, seed); memory LRU + size-bounded disk LRU
+
+    cache = ResultCache()                                  # ~/.cache/resonance or $RESONANCE_CACHE_DIR
+    key = cache.key("feedback", {"iterations": 100}, seed=42, modules=("feedback_loop",))
+    result = cache.get_or_compute(key, lambda: run_feedback(100, seed=42))
+
+The code version is a hash of the source files of the given modules and of
+every module of the same source tree they import (transitively, including
+imports inside functions), so editing a simulator or one of its helpers
+invalidates its entries automatically. The active dtype policy
+(precision.policy(), float64 reference or float32 compact) is folded into the
+version as well, since it changes the results. Only seeded runs are
+deterministic; results of unseeded runs must not be cached.
+
+Storage: objects/<2 hex>/<62 hex>.json. Writers create a temporary file in the
+same directory and rename it into place, so concurrent writers from a process
+pool never expose partial files (identical keys carry identical content).
+Recency is the file mtime (touched on every hit); when the tracked size exceeds
+max_bytes the oldest objects are evicted under an exclusive lock file.
+
+    python result_cache.py [--dir DIR] stats | clear
+"""
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from precision import policy
+from result_writers import to_builtin
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction without a cross-process lock
+    fcntl = None
+
+_MISSING = object()
+
+
+def default_cache_dir() -> str:
+    return os.environ.get("RESONANCE_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "resonance")
+
+
+def _source(name: str) -> str:
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        raise ImportError(f"No source for module {name!r}")
+    return spec.origin
+
+
+def _is_main_block(node: ast.stmt) -> bool:
+    test = node.test if isinstance(node, ast.If) else None
+    return (isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "__name__"
+            and any(isinstance(c, ast.Constant) and c.value == "__main__" for c in test.comparators))
+
+
+def _imported_names(path: str) -> Iterable[str]:
+    """Top-level names of the absolute imports in a source file (also inside functions;
+    the script-only `if __name__ == "__main__":` block is skipped)"""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    statements = [node for node in tree.body if not _is_main_block(node)]
+    for node in (child for statement in statements for child in ast.walk(statement)):
+        if isinstance(node, ast.Import):
+            yield from (alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            yield node.module.split(".")[0]
+
+
+def local_dependencies(*modules: str) -> Tuple[str, ...]:
+    """The given modules plus the modules of their source tree they import, transitively
+
+    Imported modules count when their source lives in a directory of one of the
+    given modules, so the standard library and installed packages are skipped.
+    """
+    sources = {name: _source(name) for name in modules}
+    roots = {os.path.dirname(path) for path in sources.values()}
+    pending = list(modules)
+    while pending:
+        for imported in _imported_names(sources[pending.pop()]):
+            if imported in sources:
+                continue
+            spec = importlib.util.find_spec(imported)
+            if spec is not None and spec.origin and os.path.dirname(spec.origin) in roots:
+                sources[imported] = spec.origin
+                pending.append(imported)
+    return tuple(sorted(sources))
+
+
+@lru_cache(maxsize=None)
+def code_version(*modules: str) -> str:
+    """Hash of the source files of the given modules and their local dependencies (without importing them)"""
+    digest = hashlib.sha256()
+    for name in local_dependencies(*modules):
+        with open(_source(name), "rb") as f:
+            digest.update(name.encode() + b"\0" + f.read() + b"\0")
+    return digest.hexdigest()[:16]
+
+
+def cache_key(model: str, params: Dict, seed: Optional[int], version: str = "") -> str:
+    """Stable content address of one simulation configuration"""
+    canonical = json.dumps({"model": model, "version": version, "params": params, "seed": seed},
+                           sort_keys=True, separators=(",", ":"), default=to_builtin)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory + disk) LRU cache of JSON-serialisable results"""
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = 256 << 20, memory_items: int = 256):
+        self.root = root or default_cache_dir()
+        self.objects = os.path.join(self.root, "objects")
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.stats: Counter = Counter()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size: Optional[int] = None  # Tracked disk usage, refreshed by evict()
+        os.makedirs(self.objects, exist_ok=True)
+
+    def key(self, model: str, params: Dict, seed: Optional[int], modules: Iterable[str] = ()) -> str:
+        version = code_version(*modules) if modules else ""
+        return cache_key(model, params, seed, f"{version}:{policy().name}")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.objects, key[:2], key[2:] + ".json")
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return json.loads(data)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU recency
+        except FileNotFoundError:  # Also: evicted by another process meanwhile
+            self.stats["misses"] += 1
+            return default
+        self.stats["disk_hits"] += 1
+        self._remember(key, data)
+        return json.loads(data)
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value, default=to_builtin, separators=(",", ":")).encode()
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced = os.path.getsize(path)  # Overwriting an entry must not count it twice
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except FileNotFoundError:
+                pass
+            raise
+        self._remember(key, data)
+        self.stats["writes"] += 1
+        if self._size is None:
+            self._size = self.disk_usage()
+        else:
+            self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+            value = self.get(key)  # Same (JSON) representation as a later hit
+        return value
+
+    def _entries(self):
+        for directory in os.scandir(self.objects):
+            if directory.is_dir():
+                for entry in os.scandir(directory.path):
+                    if entry.name.endswith(".json"):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        yield entry.path, stat.st_size, stat.st_mtime
+
+    def disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target: Optional[int] = None) -> int:
+        """Delete least recently used objects until the disk tier is below target bytes"""
+        target = int(self.max_bytes * 0.9) if target is None else target
+        with open(os.path.join(self.root, ".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            size = sum(entry[1] for entry in entries)
+            removed = 0
+            for path, entry_size, _ in entries:
+                if size <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self._memory.pop(os.path.basename(os.path.dirname(path)) + os.path.basename(path)[:-5], None)
+                size -= entry_size
+                removed += 1
+        self._size = size
+        self.stats["evictions"] += removed
+        return removed
+
+    def clear(self) -> int:
+        self._memory.clear()
+        return self.evict(target=0)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the simulation result cache")
+    parser.add_argument("--dir", help=f"Cache directory (default: {default_cache_dir()})")
+    parser.add_argument("command", choices=("stats", "clear"))
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.dir)
+    if args.command == "clear":
+        print(f"Removed {cache.clear()} cached results from {cache.root}")
+    else:
+        entries = list(cache._entries())
+        print(f"{cache.root}: {len(entries)} results, {sum(size for _, size, _ in entries)/1e6:.2f} MB "
+              f"(limit {cache.max_bytes/1e6:.0f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
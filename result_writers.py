@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Result Writers - Buffered Streaming Output for Simulation Records
+NDJSON (optionally gzip-compressed) and columnar NumPy .npz
+
+    with open_writer("trajectory.ndjson.gz", background=True) as writer:
+        for record in records:
+            writer.write(record)
+
+Records are buffered and handed to the sink in batches of batch_size. With
+background=True a worker thread serialises and writes the batches, so the
+compute loop only appends to a list; at most max_pending batches are queued
+before write() blocks. Records must not be mutated after they are written.
+The thread overlaps file I/O and gzip compression with the compute loop; JSON
+encoding itself still holds the GIL, so for millions of numeric records the
+columnar .npz format is the fast path.
+
+Formats (chosen by file extension in open_writer):
+- .ndjson / .jsonl  one JSON object per line; .gz suffix compresses with gzip
+- .npz              one array per field (columnar); all records share the same keys
+
+write_json() replaces ad-hoc json.dump calls for single documents and handles
+NumPy scalars/arrays, enums and dataclasses.
+"""
+
+import dataclasses
+import gzip
+import json
+import queue
+import threading
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+def to_builtin(obj: Any) -> Any:
+    """json default hook: NumPy values, enums and dataclasses to plain Python"""
+    if hasattr(obj, "tolist"):  # NumPy scalars and arrays
+        return obj.tolist()
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(path: str, obj: Any, indent: Optional[int] = 2) -> None:
+    """Write a single JSON document"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=indent, ensure_ascii=False, default=to_builtin)
+
+
+class ResultWriter(ABC):
+    """Buffered record writer; subclasses implement _write_batch and _finish"""
+
+    def __init__(self, path: str, batch_size: int = 10_000, background: bool = False,
+                 max_pending: int = 4):
+        self.path = path
+        self.batch_size = batch_size
+        self.records_written = 0
+        self.closed = False
+        self._buffer: List[Dict] = []
+        self._error: Optional[BaseException] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue(max_pending)
+            self._thread = threading.Thread(target=self._worker, name=f"ResultWriter({path})", daemon=True)
+            self._thread.start()
+
+    def write(self, record: Dict) -> None:
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self._submit()
+
+    def write_many(self, records: Iterable[Dict]) -> None:
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.batch_size:
+            self._submit()
+
+    def flush(self) -> None:
+        """Write everything buffered so far (waits for the background thread)"""
+        self._submit()
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_pending()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+            self.closed = True
+            self._finish()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _submit(self) -> None:
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        self.records_written += len(batch)
+        if self._queue is None:
+            self._write_batch(batch)
+        else:
+            self._raise_pending()
+            self._queue.put(batch)
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                if self._error is None:
+                    self._write_batch(batch)
+            except BaseException as exc:  # Re-raised in the producer thread
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Dict]) -> None:
+        """Serialise and write one batch of records"""
+
+    @abstractmethod
+    def _finish(self) -> None:
+        """Flush and close the sink"""
+
+
+class NDJSONWriter(ResultWriter):
+    """Newline-delimited JSON; gzip-compressed if compress=True or the path ends in .gz"""
+
+    def __init__(self, path: str, compress: Optional[bool] = None, compresslevel: int = 6, **options):
+        if compress is None:
+            compress = path.endswith(".gz")
+        if compress:
+            self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=compresslevel)
+        else:
+            self._file = open(path, "w", encoding="utf-8", buffering=1 << 20)
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"),
+                                        default=to_builtin).encode
+        super().__init__(path, **options)
+
+    def _write_batch(self, batch: List[Dict]) -> None:
+        encode = self._encode
+        self._file.write("\n".join([encode(record) for record in batch]) + "\n")
+
+    def _finish(self) -> None:
+        self._file.close()
+
+
+class NpzWriter(ResultWriter):
+    """Columnar .npz: each batch is converted to one array per field, concatenated on close"""
+
+    def __init__(self, path: str, compress: bool = True, **options):
+        self.compress = compress
+        self.columns: Optional[List[str]] = None
+        self._chunks: Dict[str, List] = {}
+        super().__init__(path, **options)
+
+    def _write_batch(self, batch: List[Dict]) -> None:
+        if self.columns is None:
+            self.columns = list(batch[0])
+            self._chunks = {column: [] for column in self.columns}
+        columns = set(self.columns)
+        for record in batch:
+            if record.keys() != columns:
+                raise ValueError(f"Record fields {sorted(record)} differ from columns {self.columns}")
+        for column in self.columns:
+            self._chunks[column].append(np.asarray([record[column] for record in batch]))
+
+    def _finish(self) -> None:
+        # No chunks if the first batch was rejected; keeps that error from being masked here
+        arrays = {column: np.concatenate(chunks) for column, chunks in self._chunks.items() if chunks}
+        (np.savez_compressed if self.compress else np.savez)(self.path, **arrays)
+
+
+def open_writer(path: str, **options) -> ResultWriter:
+    """Writer for the format implied by the file extension"""
+    base = path[:-3] if path.endswith(".gz") else path
+    if base.endswith((".ndjson", ".jsonl")):
+        return NDJSONWriter(path, **options)
+    if path.endswith(".npz"):
+        return NpzWriter(path, **options)
+    raise ValueError(f"Unsupported result format: {path} (use .ndjson, .jsonl, .ndjson.gz or .npz)")
+
+
+def read_ndjson(path: str) -> Iterator[Dict]:
+    """Stream records back from an NDJSON file (gzip-aware)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    n = 200_000
+    rng = np.random.default_rng(0)
+    values = rng.random((n, 4)).tolist()
+    records = [{"iteration": i, "authenticity": a, "participation": p, "transparency": t, "effectiveness": e}
+               for i, (a, p, t, e) in enumerate(values)]
+
+    print("\n" + "="*70)
+    print(f"RESULT WRITERS - {n:,} records")
+    print("="*70)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, options in (("records.ndjson", {}), ("records.ndjson", {"background": True}),
+                              ("records.ndjson.gz", {"background": True}), ("records.npz", {})):
+            path = os.path.join(tmp, name)
+            start = time.perf_counter()
+            with open_writer(path, **options) as writer:
+                produce_start = time.perf_counter()
+                for record in records:
+                    writer.write(record)
+                produce = time.perf_counter() - produce_start
+            total = time.perf_counter() - start
+            print(f"  {name:<20} {'background' if options else 'inline':<10} "
+                  f"loop {produce:6.2f}s  total {total:6.2f}s  {os.path.getsize(path)/1e6:7.1f} MB")
+            if path.endswith(".npz"):
+                assert np.load(path)["effectiveness"].tolist() == [r["effectiveness"] for r in records]
+            else:
+                assert sum(1 for _ in read_ndjson(path)) == n
+    print("="*70 + "\n")
@@ -4,97 +4,196 @@
 RUN ALL TESTS - Complete Test Suite
 ====================================
 
-Führt alle Tests nacheinander aus:
+Führt alle Tests parallel aus:
 1. Logische Konsistenz-Validierung
 2. Feedback-Loop Simulation
 3. Evolutionäre Spieltheorie
 4. Außerirdische Intelligenz Test
 5. KI-Mensch-Interaktionstest
+6. Genauigkeit der reduzierten Präzision (float32 / uint8 gegen float64)
 
 Komplette Validierung des Resonanzformel & 5D-Intelligenz Frameworks.
+
+Die Test-Module werden einmal im Hauptprozess importiert (NumPy wird also nur
+einmal geladen); jeder Test läuft in einem geforkten Worker mit eigenem Timeout.
+Die Ausgabe wird pro Test eingefangen, Wall- und CPU-Zeit werden gemessen.
+
+    python run_all_tests.py [--jobs N] [--timeout SEKUNDEN] [--quiet]
 """
 
+import argparse
+import importlib
+import io
+import multiprocessing
+import os
+import random
 import sys
-import subprocess
 import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
 from datetime import datetime
+from multiprocessing.connection import wait
 
+TESTS = [
+    # (Name, Modul, Einstiegspunkt)
+    ('1. Consistency Validation', 'consistency_check', 'main'),
+    ('2. Feedback Loop Simulation', 'feedback_loop', 'main'),
+    ('3. Evolutionary Game Theory', 'evolutionary_game_theory', 'EvolutionaryGameTheoryTests.run_all_tests'),
+    ('4. Alien Intelligence Test', 'alien_intelligence_test', 'run_comprehensive_test'),
+    ('5. AI-Human Interaction Test', 'ai_human_interaction_test', 'run_test'),
+    ('6. Reduced Precision Accuracy', 'precision', 'run_test'),
+]
 
-def run_test(test_name, script_name):
-    """Führe einen Test-Script aus und handle Fehler"""
-    print(f"\n{'='*80}")
-    print(f"TEST {test_name}: {script_name}")
-    print(f"{'='*80}")
-    print(f"{'_'*80}")
-    print(f"Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, script_name],
-            capture_output=False,
-            timeout=300  # 5 Minuten timeout pro Test
-        )
-        
-        if result.returncode == 0:
-            print(f"\n{'✓'*3} {test_name} PASSED")
-            return True
+
+def resolve_entry_point(module_name, entry_point):
+    """Importiert das Modul und liefert den aufrufbaren Einstiegspunkt"""
+    target = importlib.import_module(module_name)
+    for attribute in entry_point.split('.'):
+        target = getattr(target, attribute)
+        if isinstance(target, type):
+            target = target()  # Test-Klassen werden instanziiert
+    return target
+
+
+def _worker(module_name, entry_point, conn):
+    """Führt einen Einstiegspunkt im Worker aus und schickt das Ergebnis zurück"""
+    # Geforkte Worker erben den RNG-Zustand des Hauptprozesses
+    random.seed()
+    if 'numpy' in sys.modules:
+        sys.modules['numpy'].random.seed()
+    sys.argv = [module_name + '.py']
+
+    output = io.StringIO()
+    passed = True
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with redirect_stdout(output), redirect_stderr(output):
+        try:
+            resolve_entry_point(module_name, entry_point)()
+        except SystemExit as exc:
+            passed = exc.code in (None, 0)
+        except BaseException:
+            traceback.print_exc()
+            passed = False
+    conn.send({
+        'passed': passed,
+        'status': 'PASSED' if passed else 'FAILED',
+        'output': output.getvalue(),
+        'wall_time': time.perf_counter() - wall_start,
+        'cpu_time': time.process_time() - cpu_start,
+    })
+    conn.close()
+
+
+def run_tests(tests=TESTS, jobs=None, timeout=300, on_result=None):
+    """Führt die Tests parallel in einem Worker-Pool aus
+
+    Liefert {Testname: Ergebnis-Dict} in der Reihenfolge von tests.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+
+    pending = []
+    running = {}  # conn -> (test_name, process, start, deadline)
+    results = {}
+
+    # Einmal im Hauptprozess importieren, damit alle Worker die Module erben;
+    # ein Modul, das sich nicht importieren lässt, gilt als fehlgeschlagener Test
+    for test in tests:
+        test_name, module_name, _ = test
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            results[test_name] = {'passed': False, 'status': 'FAILED', 'output': traceback.format_exc(),
+                                  'wall_time': 0.0, 'cpu_time': 0.0}
+            if on_result:
+                on_result(test_name, results[test_name])
         else:
-            print(f"\n{'✗'*3} {test_name} FAILED (Exit Code: {result.returncode})")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        print(f"\n{'✗'*3} {test_name} TIMEOUT (> 300s)")
-        return False
-        
-    except Exception as e:
-        print(f"\n{'✗'*3} {test_name} ERROR: {str(e)}")
-        return False
-
-
-def main():
+            pending.append(test)
+
+    def finish(conn, result):
+        test_name, process, start, _ = running.pop(conn)
+        process.join(timeout=5)
+        result.setdefault('wall_time', time.perf_counter() - start)
+        results[test_name] = result
+        if on_result:
+            on_result(test_name, result)
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            test_name, module_name, entry_point = pending.pop(0)
+            parent_conn, child_conn = context.Pipe(duplex=False)
+            process = context.Process(target=_worker, args=(module_name, entry_point, child_conn), daemon=True)
+            start = time.perf_counter()
+            process.start()
+            child_conn.close()
+            running[parent_conn] = (test_name, process, start, start + timeout)
+
+        next_deadline = min(deadline for _, _, _, deadline in running.values())
+        ready = wait(list(running), timeout=max(0.0, next_deadline - time.perf_counter()))
+
+        for conn in ready:
+            try:
+                result = conn.recv()
+            except EOFError:
+                exitcode = running[conn][1].exitcode
+                result = {'passed': False, 'status': 'CRASHED', 'cpu_time': 0.0,
+                          'output': f'Worker died without result (Exit Code: {exitcode})\n'}
+            finish(conn, result)
+
+        now = time.perf_counter()
+        for conn in [c for c, (_, _, _, deadline) in running.items() if deadline <= now]:
+            running[conn][1].terminate()
+            finish(conn, {'passed': False, 'status': f'TIMEOUT (> {timeout}s)', 'cpu_time': 0.0, 'output': ''})
+
+    return {test_name: results[test_name] for test_name, _, _ in tests}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resonanzformel & 5D-Intelligenz - Complete Test Suite")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Parallele Worker (Standard: CPU-Anzahl)")
+    parser.add_argument('--timeout', type=float, default=300, help="Timeout pro Test in Sekunden")
+    parser.add_argument('--quiet', '-q', action='store_true', help="Testausgaben nicht anzeigen")
+    args = parser.parse_args(argv)
+
     print("\n" + "="*80)
     print("RESONANZFORMEL & 5D-INTELLIGENZ - COMPLETE TEST SUITE")
     print("="*80)
     print("="*80)
-    print(f"Starzeit: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"\nRunning all tests sequentially...\n")
-    
-    tests = [
-        ('1. Consistency Validation', 'consistency_check.py'),
-        ('2. Feedback Loop Simulation', 'feedback_loop.py'),
-        ('3. Evolutionary Game Theory', 'evolutionary_game_theory.py'),
-        ('4. Alien Intelligence Test', 'alien_intelligence_test.py'),
-        ('5. AI-Human Interaction Test', 'ai_human_interaction_test.py'),
-    ]
-    
-    results = {}
-    start_time = time.time()
-    
-    for test_name, script_name in tests:
-        results[test_name] = run_test(test_name, script_name)
-        time.sleep(1)  # Kurze Pause zwischen Tests
-    
-    # Summary
-    end_time = time.time()
-    duration = end_time - start_time
-    
+    print(f"Startzeit: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\nRunning all tests in parallel...\n")
+
+    def report(test_name, result):
+        if not args.quiet:
+            print(f"\n{'='*80}")
+            print(f"TEST {test_name}")
+            print(f"{'='*80}")
+            print(result['output'], end='')
+        mark = '✓' if result['passed'] else '✗'
+        print(f"\n{mark*3} {test_name} {result['status']} "
+              f"(wall {result['wall_time']:.2f}s, cpu {result['cpu_time']:.2f}s)")
+
+    start_time = time.perf_counter()
+    results = run_tests(jobs=args.jobs, timeout=args.timeout, on_result=report)
+    duration = time.perf_counter() - start_time
+
     print("\n" + "="*80)
     print("TEST SUITE SUMMARY")
     print("="*80)
-    
-    passed = sum(1 for r in results.values() if r)
+
+    passed = sum(1 for r in results.values() if r['passed'])
     total = len(results)
-    
+
     for test_name, result in results.items():
-        status = "✓ PASSED" if result else "✗ FAILED"
-        print(f"{status}: {test_name}")
-    
+        status = f"✓ {result['status']}" if result['passed'] else f"✗ {result['status']}"
+        print(f"{status}: {test_name:<32} wall {result['wall_time']:6.2f}s  cpu {result['cpu_time']:6.2f}s")
+
     print(f"\n{'='*80}")
     print(f"Total: {passed}/{total} tests passed")
     print(f"Duration: {duration:.2f} seconds")
     print(f"Endzeit: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*80}\n")
-    
+
     # Exit with error code if any test failed
     if passed < total:
         sys.exit(1)
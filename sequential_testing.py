@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sequential Hypothesis Testing - Adaptive Replicates Instead of Single-Run Verdicts
+Wald's SPRT on the pass rate of a stochastic criterion
+
+Each replicate of a simulation either meets a criterion (e.g. "green ratio > 80%")
+or not. Instead of judging from one run, the SPRT compares
+
+    H0: P(pass) <= p0   (hypothesis not supported)
+    H1: P(pass) >= p1   (hypothesis supported)
+
+and draws replicates only until the log-likelihood ratio crosses one of Wald's
+boundaries log((1-beta)/alpha) / log(beta/(1-alpha)). alpha and beta bound the
+probabilities of a false "pass" and a false "fail". With the defaults
+(p0=0.5, p1=0.9, alpha=beta=0.05) a criterion that always holds passes after
+6 replicates and one that never holds fails after 2; borderline criteria get
+more replicates, up to max_trials (then the verdict is "undecided").
+
+    verdicts = run_sequential({"converged": lambda rep: rep.ratio > 0.8},
+                              replicate=lambda i: simulate(seed=i))
+
+run_sequential evaluates several criteria on shared replicates, so one
+simulation run serves every criterion that is still undecided. A criterion may
+return None for an uninformative replicate (e.g. a tie in a paired comparison).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+PASS, FAIL, UNDECIDED = "pass", "fail", "undecided"
+
+
+@dataclass
+class SequentialVerdict:
+    """Outcome of one sequential test"""
+    decision: str
+    trials: int
+    successes: int
+    log_likelihood_ratio: float
+
+    @property
+    def passed(self) -> bool:
+        return self.decision == PASS
+
+    @property
+    def rate(self) -> float:
+        return self.successes / self.trials if self.trials else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.decision.upper()} after {self.trials} replicates "
+                f"({self.successes}/{self.trials} passed, LLR {self.log_likelihood_ratio:+.2f})")
+
+
+class SPRT:
+    """Wald's sequential probability ratio test for a Bernoulli pass rate"""
+
+    def __init__(self, p0: float = 0.5, p1: float = 0.9, alpha: float = 0.05, beta: float = 0.05,
+                 max_trials: int = 200):
+        if not 0 < p0 < p1 < 1:
+            raise ValueError(f"SPRT needs 0 < p0 < p1 < 1, got p0={p0}, p1={p1}")
+        if not (0 < alpha < 1 and 0 < beta < 1):
+            raise ValueError("alpha and beta must be in (0, 1)")
+        self.upper = math.log((1 - beta) / alpha)   # Accept H1
+        self.lower = math.log(beta / (1 - alpha))   # Accept H0
+        self.success_step = math.log(p1 / p0)
+        self.failure_step = math.log((1 - p1) / (1 - p0))
+        self.max_trials = max_trials
+        self.trials = 0
+        self.successes = 0
+        self.llr = 0.0
+        self.decision = UNDECIDED
+
+    @property
+    def done(self) -> bool:
+        return self.decision != UNDECIDED or self.trials >= self.max_trials
+
+    def update(self, outcome: bool) -> str:
+        """Add one replicate outcome; returns the current decision"""
+        if self.decision != UNDECIDED:
+            return self.decision
+        self.trials += 1
+        if outcome:
+            self.successes += 1
+            self.llr += self.success_step
+        else:
+            self.llr += self.failure_step
+        if self.llr >= self.upper:
+            self.decision = PASS
+        elif self.llr <= self.lower:
+            self.decision = FAIL
+        return self.decision
+
+    def verdict(self) -> SequentialVerdict:
+        return SequentialVerdict(self.decision, self.trials, self.successes, self.llr)
+
+
+def run_sequential(criteria: Dict[str, Callable[[Any], Optional[bool]]], replicate: Callable[[int], Any],
+                   max_replicates: int = 1000, **sprt_options) -> Dict[str, SequentialVerdict]:
+    """Draw replicate(0), replicate(1), ... until every criterion is settled
+
+    criteria maps names to predicates on a replicate (None = uninformative);
+    sprt_options (p0, p1, alpha, beta, max_trials) configure each criterion's SPRT.
+    """
+    tests = {name: SPRT(**sprt_options) for name in criteria}
+    for index in range(max_replicates):
+        pending = [name for name, test in tests.items() if not test.done]
+        if not pending:
+            break
+        sample = replicate(index)
+        for name in pending:
+            outcome = criteria[name](sample)
+            if outcome is not None:
+                tests[name].update(bool(outcome))
+    return {name: test.verdict() for name, test in tests.items()}
+
+
+if __name__ == "__main__":
+    import random
+
+    print("\n" + "="*70)
+    print("SEQUENTIAL TESTING - replicates needed per true pass rate (alpha=beta=0.05)")
+    print("="*70)
+    rng = random.Random(0)
+    for rate in (1.0, 0.95, 0.8, 0.7, 0.5, 0.0):
+        runs = [run_sequential({"criterion": lambda passed: passed}, lambda i: rng.random() < rate)["criterion"]
+                for _ in range(500)]
+        mean_trials = sum(v.trials for v in runs) / len(runs)
+        share = {d: sum(v.decision == d for v in runs) / len(runs) for d in (PASS, FAIL, UNDECIDED)}
+        print(f"  P(pass)={rate:4.2f}: {mean_trials:5.1f} replicates on average, "
+              f"pass {share[PASS]:5.1%}  fail {share[FAIL]:5.1%}  undecided {share[UNDECIDED]:5.1%}")
+    print("="*70 + "\n")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared Arrays - Zero-Copy NumPy Buffers for Multi-Process Simulation
+State arrays, pressure series and history buffers live once in shared memory
+
+    with SharedArrays() as shared:
+        shared.put("pressures", pressures)                 # (T, R), copied in once
+        shared.create("history", (T, 4, R))                # filled by the workers
+        shared.map(fill_columns, columns=R, workers=4)     # fill_columns(arrays, start, stop)
+        result = shared["history"].copy()
+
+Each array is its own multiprocessing.shared_memory block. Workers receive only
+the small, picklable SharedSpec descriptions and attach to the blocks as NumPy
+views, so no array is ever pickled. map() splits range(columns) into disjoint
+contiguous [start, stop) slices, one task each. A task writes only its own
+columns (by convention the last axis), so the workers never need locks.
+Attached blocks are cached per worker process and dropped when a task brings
+new specs.
+
+Cleanup: the owner unlinks every block in close() (also called by the context
+manager, by a weakref finalizer at garbage collection and at interpreter exit).
+If a worker dies mid-task, the pool raises BrokenProcessPool. The exception
+propagates out of the with block, which still unlinks the blocks, and the
+crashed process's own mappings go away with it. If the owner itself is killed,
+the multiprocessing resource tracker unlinks the registered blocks when it
+notices the owner is gone. Copy out whatever you want to keep before close().
+
+    python shared_arrays.py      # zero-copy, crash and leak checks
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+@dataclass(frozen=True)
+class SharedSpec:
+    """Picklable description of one shared array"""
+    block: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def view(self, buffer) -> np.ndarray:
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=buffer)
+
+
+def _nbytes(shape, dtype) -> int:
+    return max(1, int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize)
+
+
+def _release(blocks: List[shared_memory.SharedMemory]) -> None:
+    for block in blocks:
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            block.close()
+        except BufferError:  # A view is still alive; the mapping goes away with it
+            pass
+    blocks.clear()
+
+
+def partition(count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split range(count) into at most `parts` disjoint contiguous (start, stop) slices"""
+    parts = max(1, min(parts, count))
+    bounds = [count * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i] < bounds[i + 1]]
+
+
+def pool_context():
+    """fork where available (workers start warm), else the platform default"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else None)
+
+
+class SharedArrays:
+    """Owner of a set of named shared-memory arrays"""
+
+    def __init__(self):
+        self.specs: Dict[str, SharedSpec] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _release, self._blocks)
+
+    def create(self, key: str, shape, dtype=float, fill=None) -> np.ndarray:
+        if key in self.specs:
+            raise KeyError(f"Shared array {key!r} already exists")
+        shape = tuple(int(n) for n in np.atleast_1d(shape))
+        block = shared_memory.SharedMemory(create=True, size=_nbytes(shape, dtype))
+        self._blocks.append(block)
+        spec = SharedSpec(block.name, shape, np.dtype(dtype).str)
+        self.specs[key] = spec
+        self._arrays[key] = array = spec.view(block.buf)
+        if fill is not None:
+            array.fill(fill)
+        return array
+
+    def put(self, key: str, values) -> np.ndarray:
+        """Copy an existing array into shared memory (once)"""
+        values = np.asarray(values)
+        array = self.create(key, values.shape, values.dtype)
+        array[...] = values
+        return array
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._arrays[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._arrays
+
+    def map(self, task: Callable, columns: int, workers: int = 1, args: tuple = (),
+            pool: Optional[ProcessPoolExecutor] = None) -> list:
+        """Run task(arrays, start, stop, *args) over disjoint column slices
+
+        task must be a module-level function (it is pickled by reference).
+        workers=1 runs in this process on the owner's arrays; otherwise a pool
+        is created for the call unless one is passed in.
+        """
+        slices = partition(columns, workers)
+        if workers <= 1 or len(slices) <= 1:
+            return [task(dict(self._arrays), start, stop, *args) for start, stop in slices]
+        own_pool = pool is None
+        pool = pool or ProcessPoolExecutor(len(slices), mp_context=pool_context())
+        try:
+            futures = [pool.submit(_run_slice, task, self.specs, start, stop, args) for start, stop in slices]
+            return [future.result() for future in futures]
+        finally:
+            if own_pool:
+                pool.shutdown(cancel_futures=True)
+
+    def close(self) -> None:
+        self._arrays.clear()
+        self._finalizer()
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# --- Worker side ---
+
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def attach(specs: Dict[str, SharedSpec]) -> Dict[str, np.ndarray]:
+    """Zero-copy views of the owner's arrays in a worker process (cached per block)"""
+    wanted = {spec.block for spec in specs.values()}
+    for block in [name for name in _ATTACHED if name not in wanted]:
+        memory = _ATTACHED.pop(block)[0]  # Drops the cached view, so the mapping can close
+        try:
+            memory.close()
+        except BufferError:
+            pass
+    arrays = {}
+    for key, spec in specs.items():
+        if spec.block not in _ATTACHED:
+            memory = shared_memory.SharedMemory(name=spec.block)
+            _ATTACHED[spec.block] = (memory, spec.view(memory.buf))
+        arrays[key] = _ATTACHED[spec.block][1]
+    return arrays
+
+
+def _run_slice(task, specs, start, stop, args):
+    return task(attach(specs), start, stop, *args)
+
+
+# --- Self-check tasks ---
+
+def _scale_columns(arrays, start, stop, factor):
+    np.multiply(arrays["data"][:, start:stop], factor, out=arrays["out"][:, start:stop])
+
+
+def _crash(arrays, start, stop):
+    if start == 0:
+        import os
+        os._exit(1)
+    return True
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    from concurrent.futures.process import BrokenProcessPool
+
+    def blocks_on_disk(names):
+        return [name for name in names if os.path.exists(f"/dev/shm/{name.lstrip('/')}")]
+
+    print("\n" + "="*70)
+    print("SHARED ARRAYS - zero-copy worker views and cleanup")
+    print("="*70)
+    data = np.random.default_rng(0).random((1_000, 20_000))
+    with SharedArrays() as shared:
+        shared.put("data", data)
+        shared.create("out", data.shape)
+        start = time.perf_counter()
+        shared.map(_scale_columns, data.shape[1], workers=4, args=(2.0,))
+        elapsed = time.perf_counter() - start
+        print(f"  {data.nbytes / 1e6:.0f} MB in, {data.nbytes / 1e6:.0f} MB out, 4 workers: {elapsed:.2f}s")
+        print(f"  workers filled disjoint slices correctly: {np.array_equal(shared['out'], data * 2.0)}")
+        names = [spec.block for spec in shared.specs.values()]
+    print(f"  blocks left after close: {blocks_on_disk(names)}")
+
+    try:
+        with SharedArrays() as shared:
+            shared.create("data", (4, 1_000))
+            names = [spec.block for spec in shared.specs.values()]
+            shared.map(_crash, 1_000, workers=2)
+    except BrokenProcessPool as error:
+        print(f"  worker crash surfaced as {type(error).__name__}")
+    print(f"  blocks left after crash: {blocks_on_disk(names)}")
+    print("="*70 + "\n")
@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulation Service - asyncio Server for the Simulators
+Long-lived process with a resident IntelligenceFramework and a warm worker pool
+
+    python simulation_service.py [--host 127.0.0.1 --port 8765 | --unix /tmp/resonance.sock]
+                                 [--workers N] [--max-pending 64]
+    python simulation_service.py --selftest
+
+HTTP/1.1 over TCP (localhost) or a Unix socket, JSON bodies:
+
+    GET  /health                   Service state, load and counters
+    GET  /framework                The five dimensions (resident IntelligenceFramework)
+    POST /assess                   {"systems": ["name", ["name", {context}], ...]}
+    POST /simulate/<kind>          Streams NDJSON events (chunked) as they are produced:
+                                   accepted -> started -> progress ... -> result | error
+
+Kinds and parameters (see JOB_KINDS): feedback, game, ai_human, alien.
+
+Back-pressure: at most `workers` jobs run in the process pool at a time; further
+requests wait for a slot, and beyond max_pending admitted requests the service
+answers 429. Alien requests arriving within batch_window are coalesced into one
+pool task. Seeded requests are answered from the result cache when possible
+(event "result" with "cached": true). Streaming waits on the socket (drain), progress events are coalesced
+for slow clients, and a disconnected client never frees its slot before its job
+has finished.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from core_dimensions import IntelligenceFramework, dimension_catalogue
+from result_cache import ResultCache
+from result_writers import to_builtin
+
+MAX_BODY = 1 << 20
+DEFAULT_PORT = 8765
+
+_ABSENT = object()
+
+
+@dataclass(frozen=True)
+class JobKind:
+    """A simulation type: parameter schema (type, default, low, high) and worker function"""
+    name: str
+    parameters: Dict[str, Tuple[type, Any, Any, Any]]
+    run: Callable[[Dict, Callable[[int, int], None]], Dict]
+    modules: Tuple[str, ...] = ()  # Source files that define the result (cache code version)
+    batched: bool = False
+
+    def parse(self, params: Dict) -> Dict:
+        """Validate and complete request parameters; raises ValueError"""
+        if not isinstance(params, dict):
+            raise ValueError("Request body must be a JSON object")
+        unknown = set(params) - set(self.parameters)
+        if unknown:
+            raise ValueError(f"Unknown parameters for {self.name}: {', '.join(sorted(unknown))}")
+        parsed = {}
+        for name, (kind, default, low, high) in self.parameters.items():
+            value = params.get(name, _ABSENT)
+            if value is _ABSENT or value is None:
+                parsed[name] = default
+                continue
+            if kind is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+                raise ValueError(f"{name} must be of type {kind.__name__}")
+            if low is not None and not low <= value <= high:
+                raise ValueError(f"{name} must be in [{low}, {high}]")
+            parsed[name] = value
+        return parsed
+
+
+def _run_feedback(params: Dict, progress) -> Dict:
+    from feedback_loop import SimulationRunner, analyze_results
+    runner = SimulationRunner(iterations=params["iterations"], seed=params["seed"])
+    results = runner.run(progress=progress, progress_every=max(1, params["iterations"] // 20))
+    return analyze_results(results)
+
+
+def _run_game(params: Dict, progress) -> Dict:
+    from evolutionary_game_theory import OpenSystemEnvironment, PlayerStrategy
+    env = OpenSystemEnvironment(params["players"], params["rounds"], seed=params["seed"])
+    defectors = round(params["defectors"] * env.num_players)
+    env.players = [PlayerStrategy.DEFECT] * defectors + [PlayerStrategy.COOPERATE] * (env.num_players - defectors)
+    env.run(params["resonance"], progress=progress, progress_every=max(1, params["rounds"] // 20),
+            event_driven=params["event_driven"])
+    greens = [h["green_count"] for h in env.history]
+    return {"final_green_ratio": greens[-1] / env.num_players, "green_count": greens}
+
+
+def _run_ai_human(params: Dict, progress) -> Dict:
+    from ai_human_interaction_test import HumanPopulationModel
+    model = HumanPopulationModel(params["scenario"], params["population"], params["spread"], params["seed"])
+    return model.run(params["iterations"], progress=progress,
+                     progress_every=max(1, params["population"] // 20))
+
+
+def _run_alien(params: Dict, progress) -> Dict:
+    from alien_intelligence_test import analyze_alien_population
+    return analyze_alien_population(params["aliens"], params["seed"])
+
+
+JOB_KINDS: Dict[str, JobKind] = {
+    kind.name: kind for kind in (
+        # A feedback run keeps every step in memory (~1 kB each) until analyze_results
+        JobKind("feedback", {"iterations": (int, 100, 1, 100_000), "seed": (int, None, None, None)},
+                _run_feedback, ("feedback_loop", "resonance_formulas")),
+        JobKind("game", {"players": (int, 50, 2, 2_000), "rounds": (int, 100, 1, 100_000),
+                         "resonance": (bool, True, None, None), "defectors": (float, 0.0, 0.0, 1.0),
+                         "event_driven": (bool, False, None, None), "seed": (int, None, None, None)},
+                _run_game, ("evolutionary_game_theory", "payoff_engine")),
+        JobKind("ai_human", {"scenario": (str, "transparent_aligned", None, None),
+                             "population": (int, 1000, 1, 1_000_000), "iterations": (int, 20, 1, 1_000),
+                             "spread": (float, 0.15, 0.0, 1.0), "seed": (int, None, None, None)},
+                _run_ai_human, ("ai_human_interaction_test", "resonance_formulas")),
+        JobKind("alien", {"aliens": (int, 1000, 1, 10_000_000), "seed": (int, None, None, None)},
+                _run_alien, ("alien_intelligence_test", "resonance_formulas"), batched=True),
+    )
+}
+
+
+def run_simulation(kind: str, cache: Optional[ResultCache] = None, **params) -> Dict:
+    """Run one simulation in-process; seeded runs are served from / stored in the cache"""
+    job = JOB_KINDS[kind]
+    params = job.parse(params)
+    compute = lambda: json.loads(json.dumps(job.run(params, None), default=to_builtin))
+    if cache is None or params.get("seed") is None:
+        return compute()
+    return cache.get_or_compute(cache.key(kind, params, params["seed"], job.modules), compute)
+
+
+# --- Worker side (forked pool processes) ---
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue) -> None:
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _run_job(job_id: int, kind: str, params: Dict) -> Dict:
+    """Runs one job; progress events and a final None go through the shared queue"""
+    def progress(done: int, total: int) -> None:
+        _progress_queue.put((job_id, {"event": "progress", "job": job_id, "done": done, "total": total}))
+    try:
+        return json.loads(json.dumps(JOB_KINDS[kind].run(params, progress), default=to_builtin))
+    finally:
+        _progress_queue.put((job_id, None))
+
+
+def _run_batch(kind: str, batch: List[Dict]) -> List[Dict]:
+    """Several small requests of one kind in a single pool task"""
+    return [json.loads(json.dumps(JOB_KINDS[kind].run(params, None), default=to_builtin)) for params in batch]
+
+
+def _warm_up() -> int:
+    """Import the simulators (and NumPy) once per worker, before the first request"""
+    import ai_human_interaction_test, alien_intelligence_test, evolutionary_game_theory, feedback_loop  # noqa: F401
+    import numpy
+    numpy.zeros(1)
+    return os.getpid()
+
+
+# --- Service ---
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class _EventStream:
+    """Chunked NDJSON response; swallows errors once the client has gone away"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.connected = True
+
+    async def start(self) -> None:
+        self.writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                          b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        await self.send(None)
+
+    async def send(self, event: Optional[Dict]) -> None:
+        if not self.connected:
+            return
+        try:
+            if event is not None:
+                data = json.dumps(event, default=to_builtin).encode() + b"\n"
+                self.writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await self.writer.drain()
+        except (ConnectionError, RuntimeError):
+            self.connected = False
+
+    async def end(self) -> None:
+        if self.connected:
+            self.writer.write(b"0\r\n\r\n")
+            await self.send(None)
+
+
+class SimulationService:
+    """Resident framework + warm process pool behind an asyncio HTTP server"""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 64,
+                 batch_window: float = 0.005, max_batch: int = 64, cache: Optional[ResultCache] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.cache = cache
+        self.max_pending = max_pending
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.framework = IntelligenceFramework()
+        self.stats: Counter = Counter()
+        self.pending = 0
+        self.running = 0
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self._progress_queue = context.SimpleQueue()
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                        initargs=(self._progress_queue,))
+        self._jobs: Dict[int, asyncio.Queue] = {}
+        self._ids = itertools.count(1)
+        self._batches: Dict[str, List[Tuple[Dict, asyncio.Future]]] = {}
+        self._batch_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._reader: Optional[threading.Thread] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Warm the pool and start listening on TCP (host, port) or a Unix socket path"""
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._reader = threading.Thread(target=self._read_progress, name="progress-reader", daemon=True)
+        self._reader.start()
+        await asyncio.gather(*(self._loop.run_in_executor(self.pool, _warm_up) for _ in range(self.workers)))
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.pool.shutdown(wait=True)
+        self._progress_queue.put(None)
+        if self._reader is not None:
+            self._reader.join()
+
+    # Progress events from the workers -> per-job asyncio queues
+    def _read_progress(self) -> None:
+        while True:
+            item = self._progress_queue.get()
+            if item is None:
+                return
+            self._loop.call_soon_threadsafe(self._deliver, *item)
+
+    def _deliver(self, job_id: int, event: Optional[Dict]) -> None:
+        events = self._jobs.get(job_id)
+        if events is not None:
+            events.put_nowait(event)
+
+    # --- HTTP ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, target, body = await self._read_request(reader)
+            await self._route(method, target, body, writer)
+        except HTTPError as exc:
+            await self._respond(writer, exc.status, {"error": str(exc)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as exc:  # Keep the server alive; report to the client
+            self.stats["errors"] += 1
+            await self._respond(writer, 500, {"error": f"{type(exc).__name__}: {exc}"})
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, Any]:
+        parts = (await reader.readline()).decode("latin-1").split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+        method, target, _ = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0) or 0)
+        if length > MAX_BODY:
+            raise HTTPError(413, f"Body larger than {MAX_BODY} bytes")
+        raw = await reader.readexactly(length) if length else b""
+        try:
+            body = json.loads(raw) if raw.strip() else {}
+        except ValueError as exc:
+            raise HTTPError(400, f"Invalid JSON: {exc}")
+        return method, target, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+        data = json.dumps(payload, default=to_builtin, ensure_ascii=False).encode()
+        writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _route(self, method: str, target: str, body: Any, writer: asyncio.StreamWriter) -> None:
+        path = target.split("?", 1)[0].rstrip("/")
+        self.stats[f"requests {path}"] += 1
+        if path == "/health":
+            await self._respond(writer, 200, self.health())
+        elif path == "/framework":
+            await self._respond(writer, 200, {
+                dim_id.value: {"name": dim.name, "description": dim.description.strip(),
+                               "core_factors": dim.core_factors, "risk_factors": dim.risk_factors}
+                for dim_id, dim in dimension_catalogue().items()})
+        elif path == "/assess":
+            if method != "POST":
+                raise HTTPError(405, "Use POST")
+            systems = body.get("systems") if isinstance(body, dict) else None
+            if not isinstance(systems, list):
+                raise HTTPError(400, 'Expected {"systems": [...]}')
+            specs = [tuple(system) if isinstance(system, list) else system for system in systems]
+            await self._respond(writer, 200, self.framework.assess_many(specs))
+        elif path.startswith("/simulate/"):
+            if method != "POST":
+                raise HTTPError(405, "Use POST")
+            kind = JOB_KINDS.get(path[len("/simulate/"):])
+            if kind is None:
+                raise HTTPError(404, f"Unknown simulation (available: {', '.join(JOB_KINDS)})")
+            try:
+                params = kind.parse(body)
+            except ValueError as exc:
+                raise HTTPError(400, str(exc))
+            if self.pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise HTTPError(429, f"{self.pending} requests pending; retry later")
+            self.pending += 1
+            try:
+                stream = _EventStream(writer)
+                await stream.start()
+                try:
+                    await self._simulate(kind, params, stream)
+                except Exception as exc:  # Status line already sent: report in the stream, not as a 500
+                    self.stats["errors"] += 1
+                    await stream.send({"event": "error", "message": f"{type(exc).__name__}: {exc}"})
+                await stream.end()
+            finally:
+                self.pending -= 1
+        else:
+            raise HTTPError(404, f"No route for {path}")
+
+    def health(self) -> Dict:
+        return {"status": "ok", "workers": self.workers, "running": self.running,
+                "pending": self.pending, "max_pending": self.max_pending, "stats": dict(self.stats)}
+
+    # --- Jobs ---
+
+    async def _simulate(self, kind: JobKind, params: Dict, stream: _EventStream) -> None:
+        job_id = next(self._ids)
+        await stream.send({"event": "accepted", "job": job_id, "kind": kind.name, "params": params})
+        key = None
+        if self.cache is not None and params.get("seed") is not None:
+            key = self.cache.key(kind.name, params, params["seed"], kind.modules)
+            result = self.cache.get(key)
+            if result is not None:
+                self.stats["cached"] += 1
+                await stream.send({"event": "result", "job": job_id, "cached": True, "result": result})
+                return
+        try:
+            if kind.batched:
+                result = await self._batched(kind, params)
+            else:
+                result = await self._run_in_pool(job_id, kind, params, stream)
+        except Exception as exc:
+            self.stats["failed"] += 1
+            await stream.send({"event": "error", "job": job_id, "message": f"{type(exc).__name__}: {exc}"})
+            return
+        self.stats[f"completed {kind.name}"] += 1
+        if key is not None:
+            self.cache.put(key, result)
+        await stream.send({"event": "result", "job": job_id, "cached": False, "result": result})
+
+    async def _run_in_pool(self, job_id: int, kind: JobKind, params: Dict, stream: _EventStream) -> Dict:
+        events: asyncio.Queue = asyncio.Queue()
+        self._jobs[job_id] = events
+        try:
+            async with self._slots:
+                self.running += 1
+                try:
+                    await stream.send({"event": "started", "job": job_id})
+                    future = self._loop.run_in_executor(self.pool, _run_job, job_id, kind.name, params)
+                    await self._forward_progress(events, future, stream)
+                    return await future
+                finally:
+                    self.running -= 1
+        finally:
+            del self._jobs[job_id]
+
+    async def _forward_progress(self, events: asyncio.Queue, future: asyncio.Future,
+                                stream: _EventStream) -> None:
+        """Send progress until the worker's end marker (or the worker died)"""
+        getter = None
+        try:
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(events.get())
+                waiting = {getter} if future.done() else {getter, future}
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    event, getter = getter.result(), None
+                    while event is not None and not events.empty():
+                        event = events.get_nowait()  # Coalesce: only the latest progress matters
+                    if event is None:
+                        return
+                    await stream.send(event)
+                elif future.exception() is not None:
+                    return  # No end marker will come; the exception is raised by the caller
+        finally:
+            if getter is not None:
+                getter.cancel()
+
+    async def _batched(self, kind: JobKind, params: Dict) -> Dict:
+        future = self._loop.create_future()
+        batch = self._batches.setdefault(kind.name, [])
+        batch.append((params, future))
+        if len(batch) >= self.max_batch:
+            self._flush(kind.name)
+        elif kind.name not in self._batch_timers:
+            self._batch_timers[kind.name] = self._loop.call_later(self.batch_window, self._flush, kind.name)
+        return await future
+
+    def _flush(self, name: str) -> None:
+        timer = self._batch_timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._batches.pop(name, [])
+        if batch:
+            asyncio.ensure_future(self._run_batch(name, batch))
+
+    async def _run_batch(self, name: str, batch: List[Tuple[Dict, asyncio.Future]]) -> None:
+        self.stats[f"batches {name}"] += 1
+        try:
+            async with self._slots:
+                self.running += 1
+                try:
+                    results = await self._loop.run_in_executor(
+                        self.pool, _run_batch, name, [params for params, _ in batch])
+                finally:
+                    self.running -= 1
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class SimulationClient:
+    """Minimal asyncio client for the service (TCP or Unix socket)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: Optional[str] = None):
+        self.host, self.port, self.path = host, port, path
+
+    async def _open(self, method: str, target: str, body: Any = None):
+        if self.path:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return reader, writer, status, headers
+
+    async def request(self, method: str, target: str, body: Any = None) -> Tuple[int, Any]:
+        reader, writer, status, headers = await self._open(method, target, body)
+        try:
+            payload = await reader.readexactly(int(headers.get("content-length", 0)))
+            return status, json.loads(payload) if payload else None
+        finally:
+            writer.close()
+
+    async def simulate(self, kind: str, **params) -> AsyncIterator[Dict]:
+        """Yield the event stream of one simulation request"""
+        reader, writer, status, headers = await self._open("POST", f"/simulate/{kind}", params)
+        try:
+            if status != 200:
+                payload = await reader.readexactly(int(headers.get("content-length", 0)))
+                yield {"event": "error", "status": status, **json.loads(payload)}
+                return
+            while True:
+                size = int((await reader.readline()).strip(), 16)
+                if size == 0:
+                    return
+                chunk = await reader.readexactly(size + 2)
+                for line in chunk[:-2].splitlines():
+                    yield json.loads(line)
+        finally:
+            writer.close()
+
+
+async def _selftest() -> None:
+    """Start the service on an ephemeral port and exercise it with concurrent clients"""
+    import time
+
+    import tempfile
+
+    cache_dir = tempfile.TemporaryDirectory()
+    service = SimulationService(max_pending=16, cache=ResultCache(cache_dir.name))
+    server = await service.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    client = SimulationClient(port=port)
+    print(f"Service listening on 127.0.0.1:{port} with {service.workers} worker(s)")
+
+    async def collect(kind, **params):
+        events = [event async for event in client.simulate(kind, **params)]
+        progress = sum(1 for event in events if event["event"] == "progress")
+        return kind, events[-1], progress
+
+    try:
+        status, health = await client.request("GET", "/health")
+        print(f"  GET /health -> {status} {health['status']}")
+        status, framework = await client.request("GET", "/framework")
+        print(f"  GET /framework -> {status} {list(framework)}")
+        status, assessed = await client.request("POST", "/assess", {"systems": ["Demo", ["Team", {"transparency": 0.9}]]})
+        print(f"  POST /assess -> {status} {len(assessed)} systems")
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            collect("feedback", iterations=5000, seed=1),
+            collect("game", players=60, rounds=100, defectors=0.5, seed=2),
+            collect("ai_human", scenario="learning", population=200, seed=3),
+            *(collect("alien", aliens=10_000, seed=i) for i in range(10)),
+        )
+        for kind, last, progress in results[:4]:
+            summary = {key: value.get("ratio", value) if isinstance(value, dict) else value
+                       for key, value in last.get("result", last).items()
+                       if isinstance(value, (int, float, str)) or "ratio" in value}
+            print(f"  {kind:<9} {last['event']:<6} progress events: {progress:>2}  {summary}")
+        print(f"  {len(results)} concurrent simulations in {time.perf_counter() - start:.2f}s; "
+              f"alien batches: {service.stats['batches alien']}")
+        start = time.perf_counter()
+        _, last, _ = await collect("feedback", iterations=5000, seed=1)
+        print(f"  repeated feedback request: cached={last['cached']} in {(time.perf_counter() - start)*1e3:.1f} ms")
+        _, last, _ = await collect("feedback", iterations=0)
+        print(f"  invalid request -> {last['status']} {last['error']}")
+    finally:
+        await service.close()
+        cache_dir.cleanup()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulation service for the Resonanzformel simulators")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, help="Pool processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=64, help="Admitted requests before answering 429")
+    parser.add_argument("--cache-dir", help="Result cache directory (default: ~/.cache/resonance)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not cache seeded results")
+    parser.add_argument("--selftest", action="store_true", help="Run against a local client and exit")
+    args = parser.parse_args(argv)
+
+    if args.selftest:
+        asyncio.run(_selftest())
+        return 0
+
+    async def serve():
+        cache = None if args.no_cache else ResultCache(args.cache_dir)
+        service = SimulationService(args.workers, args.max_pending, cache=cache)
+        server = await service.start(args.host, args.port, args.unix)
+        where = args.unix or f"{args.host}:{args.port}"
+        print(f"Simulation service on {where} ({service.workers} workers). Ctrl+C to stop.")
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    # Pool workers unpickle job functions by module name
+    import simulation_service
+    sys.exit(simulation_service.main())